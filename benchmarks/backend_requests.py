@@ -0,0 +1,50 @@
+"""
+Measure how many requests per second the backend request loop reads, for small and large messages.
+
+Run with ``python benchmarks/backend_requests.py [--requests N]``; reads the requests with ``read_line`` from a file,
+the way a reused backend reads them from its standard input.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from common import parser, run
+
+from pyproject_api._backend import read_line  # ruff:ignore[import-private-name]
+
+
+def measure(folder: Path, requests: int, size: int) -> float:
+    request = {"cmd": "build_wheel", "kwargs": {"config_settings": {"--opt": "x" * size}}, "result": "r.json"}
+    path = folder / f"requests-{size}"
+    path.write_bytes(f"{json.dumps(request)}\n".encode() * requests)
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        start = perf_counter()
+        for _ in range(requests):
+            json.loads(read_line(fd))
+        return perf_counter() - start
+    finally:
+        os.close(fd)
+
+
+def main(argv: list[str]) -> None:
+    cli = parser("Measure how many requests per second the backend request loop reads, for small and large messages.")
+    cli.add_argument("--requests", "-n", type=int, default=2000, help="requests to read per message size")
+    args = cli.parse_args(argv)
+
+    with TemporaryDirectory() as folder:
+        for size in (100, 10_000, 100_000):
+            duration = measure(Path(folder), args.requests, size)
+            print(  # ruff:ignore[print]
+                f"config_settings of {size:>7} bytes  {args.requests / duration:10.0f} requests/s"
+                f"  {args.requests * size / duration / 1e6:8.1f} MB/s"
+            )
+
+
+if __name__ == "__main__":
+    run(main)
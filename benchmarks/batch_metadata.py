@@ -0,0 +1,53 @@
+"""
+Compare the per-package metadata pass sent as one request per hook against the same hooks sent as a single batch.
+
+Run with ``python benchmarks/batch_metadata.py [--rounds N] [project]`` (defaults to ``tests/demo_pkg_inline``); uses
+fresh subprocess frontends, so every request pays for an interpreter start and the backend import.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING, Any
+
+from common import DEMO, Comparison, parser, run, timed
+
+from pyproject_api import SubprocessFrontend
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def separate(frontend: SubprocessFrontend, metadata: Path) -> None:
+    frontend.get_requires_for_build_wheel()  # also asks for the optional hooks
+    frontend.prepare_metadata_for_build_wheel(metadata)
+
+
+def batched(frontend: SubprocessFrontend, metadata: Path) -> None:
+    frontend.batch([
+        ("_optional_hooks", {}),
+        ("get_requires_for_build_wheel", {}),
+        ("prepare_metadata_for_build_wheel", {"metadata_directory": metadata}),
+    ])
+
+
+def package(metadata_pass: Callable[[SubprocessFrontend, Path], None], frontend_args: tuple[Any, ...]) -> None:
+    with TemporaryDirectory() as folder:
+        metadata_pass(SubprocessFrontend(*frontend_args), Path(folder))
+
+
+def main(argv: list[str]) -> None:
+    cli = parser("Compare the metadata pass of a package sent as one request per hook against a single batch.")
+    cli.add_argument("project", type=Path, nargs="?", default=DEMO, help="project to query")
+    cli.add_argument("--rounds", "-r", type=int, default=10, help="metadata passes per mode")
+    args = cli.parse_args(argv)
+
+    frontend_args = SubprocessFrontend.create_args_from_folder(args.project)[:-1]
+    comparison = Comparison(10, "/package")
+    for name, metadata_pass in (("separate", separate), ("batched", batched)):
+        comparison.report(name, timed(lambda p=metadata_pass: package(p, frontend_args), args.rounds))
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,90 @@
+"""The command line, projects and timing shared by the benchmarks; not a benchmark itself."""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, NoReturn
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+#: the project of the tests, with an in-tree backend
+DEMO = Path(__file__).absolute().parents[1] / "tests" / "demo_pkg_inline"
+_STUB = """
+def get_requires_for_build_wheel(config_settings=None):
+    return []
+"""
+
+
+def parser(description: str) -> argparse.ArgumentParser:
+    """
+    Create the command line parser of a benchmark.
+
+    :param description: what the benchmark measures, shown by ``--help``
+    :return: the parser, to add the options of the benchmark to
+    """
+    return argparse.ArgumentParser(description=description)
+
+
+def run(main: Callable[[list[str]], int | None]) -> NoReturn:
+    """Run the main function of a benchmark with the command line arguments, and exit with what it returns."""
+    sys.exit(main(sys.argv[1:]))
+
+
+def stub_project(folder: Path) -> Path:
+    """
+    Create a project whose in-tree backend does nothing, isolating the cost of the protocol.
+
+    :param folder: the folder to create the project in
+    :return: the project root
+    """
+    toml = '[build-system]\nrequires=[]\nbuild-backend = "stub"\nbackend-path=["."]'
+    (folder / "pyproject.toml").write_text(toml)
+    (folder / "stub.py").write_text(_STUB)
+    return folder
+
+
+def timed(action: Callable[[], object], rounds: int) -> list[float]:
+    """:return: how long each of the rounds calling the action took, in seconds"""
+    durations = []
+    for _ in range(rounds):
+        start = perf_counter()
+        action()
+        durations.append(perf_counter() - start)
+    return durations
+
+
+class Comparison:
+    """Prints the median duration of each mode measured, and its speedup over the first one."""
+
+    def __init__(self, width: int, unit: str = "") -> None:
+        """
+        Create a comparison.
+
+        :param width: the width of the mode name column
+        :param unit: what a duration is measured for, e.g. ``/package``
+        """
+        self.width = width
+        self.unit = unit
+        self._baseline: float | None = None
+
+    def report(self, name: str, durations: list[float], details: str = "") -> float:
+        """
+        Print the result of a mode.
+
+        :param name: the mode
+        :param durations: the duration of each round, in seconds
+        :param details: further values to print before the speedup
+        :return: the median duration
+        """
+        median = statistics.median(durations)
+        self._baseline = self._baseline or median
+        print(  # ruff:ignore[print]
+            f"{name:<{self.width}} median {median * 1000:8.1f} ms{self.unit}{details}"
+            f"  speedup x{self._baseline / median:.2f}"
+        )
+        return median
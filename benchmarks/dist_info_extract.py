@@ -0,0 +1,54 @@
+"""
+Compare extracting the ``.dist-info`` folder of a large wheel by walking all members against reading only those.
+
+Run with ``python benchmarks/dist_info_extract.py [--files N] [--rounds N]``; the synthetic wheel holds ``N`` small
+data files next to its metadata, like data heavy packages do.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from common import Comparison, parser, run, timed
+
+from pyproject_api._wheel import extract_dist_info  # ruff:ignore[import-private-name]
+
+
+def walk_members(wheel: Path, directory: Path) -> None:  # how metadata_from_built extracted the metadata before
+    with ZipFile(str(wheel), "r") as zip_file:
+        for name in zip_file.namelist():
+            if Path(name).parts[0].endswith(".dist-info"):
+                zip_file.extract(name, str(directory))
+
+
+def make_wheel(path: Path, files: int) -> Path:
+    with ZipFile(path, "w", ZIP_DEFLATED) as zip_file:
+        for at in range(files):
+            zip_file.writestr(f"demo/data/{at // 1000}/{at}.json", f'{{"at": {at}}}')
+        zip_file.writestr("demo-1.0.dist-info/METADATA", "Metadata-Version: 2.1\nName: demo\nVersion: 1.0\n")
+        zip_file.writestr("demo-1.0.dist-info/WHEEL", "Wheel-Version: 1.0\nRoot-Is-Purelib: true\n")
+        zip_file.writestr("demo-1.0.dist-info/RECORD", "\n".join(f"demo/data/{at}.json,," for at in range(files)))
+    return path
+
+
+def main(argv: list[str]) -> None:
+    cli = parser(
+        "Compare extracting the .dist-info of a large wheel by walking all members against reading just those."
+    )
+    cli.add_argument("--files", "-f", type=int, default=50_000, help="data files in the wheel")
+    cli.add_argument("--rounds", "-r", type=int, default=10, help="extractions per mode")
+    args = cli.parse_args(argv)
+
+    with TemporaryDirectory() as folder:
+        wheel = make_wheel(Path(folder) / "demo-1.0-py3-none-any.whl", args.files)
+        print(f"wheel with {args.files} files, {wheel.stat().st_size / 1024 / 1024:.1f} MiB")  # ruff:ignore[print]
+        comparison = Comparison(10)
+        for name, extract in (("walk", walk_members), ("dist-info", extract_dist_info)):
+            folders = iter([Path(folder) / f"{name}-{at}" for at in range(args.rounds)])  # a new one every round
+            comparison.report(name, timed(lambda e=extract, f=folders: e(wheel, next(f)), args.rounds))
+
+
+if __name__ == "__main__":
+    run(main)
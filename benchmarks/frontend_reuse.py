@@ -0,0 +1,52 @@
+"""
+Compare a fresh subprocess per hook against a persistent backend for a typical per-package hook sequence.
+
+Run with ``python benchmarks/frontend_reuse.py [--rounds N] [project]`` (defaults to ``tests/demo_pkg_inline``).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from common import DEMO, Comparison, parser, run, timed
+
+from pyproject_api import Frontend, PersistentSubprocessFrontend, SubprocessFrontend
+
+
+def one_package(frontend: Frontend, work: Path) -> None:
+    frontend.get_requires_for_build_wheel()
+    if frontend.prepare_metadata_for_build_wheel(work / "meta") is None:
+        frontend.metadata_from_built(work / "meta", "wheel")
+    frontend.build_wheel(work / "dist")
+
+
+def measure(
+    of_type: type[SubprocessFrontend | PersistentSubprocessFrontend], project: Path, rounds: int
+) -> list[float]:
+    args = of_type.create_args_from_folder(project)[:-1]
+
+    def package() -> None:
+        with TemporaryDirectory() as work:
+            frontend = of_type(*args)
+            one_package(frontend, Path(work))
+            if isinstance(frontend, PersistentSubprocessFrontend):
+                frontend.close()
+
+    return timed(package, rounds)
+
+
+def main(argv: list[str]) -> None:
+    cli = parser("Compare a fresh subprocess per hook against a persistent backend for a per-package hook sequence.")
+    cli.add_argument("project", type=Path, nargs="?", default=DEMO, help="project to build")
+    cli.add_argument("--rounds", "-r", type=int, default=10, help="packages to process per frontend")
+    args = cli.parse_args(argv)
+
+    comparison = Comparison(30, "/package")
+    for of_type in (SubprocessFrontend, PersistentSubprocessFrontend):
+        durations = measure(of_type, args.project, args.rounds)
+        comparison.report(of_type.__name__, durations, f"  min {min(durations) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    run(main)
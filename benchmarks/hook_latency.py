@@ -0,0 +1,198 @@
+"""
+Measure the per-hook latency (p50/p95/p99) and throughput of the frontends, per backend and result transport.
+
+Run with ``python benchmarks/hook_latency.py [--save] [--tolerance PCT] [case ...]`` (see ``--help`` for the number of
+calls and rounds); a case is named ``<backend>/<frontend>/<transport>`` and is selected when it starts with one of the
+arguments (e.g. ``stub`` or ``stub/persistent``). The backends are a stub whose hooks do nothing (isolating the
+protocol overhead), ``tests/demo_pkg_inline``, setuptools and hatchling (skipped when not installed); the frontends are
+a persistent one, reusing its backend, and a fresh subprocess per hook. Every case runs for several rounds, and the
+round with the lowest median is kept to filter out the noise of the machine.
+
+The results are compared against the baselines stored in ``benchmarks/baselines/hook_latency.json`` (written with
+``--save``), the run fails when a value regressed by more than the tolerance. Absolute durations depend on the machine,
+so the enforced values are ratios of medians measured in the same run: a fresh subprocess hook against starting a bare
+interpreter (the cost of the backend start), a persistent backend against a fresh subprocess per hook, and the pipe
+against the file transport. The medians themselves are enforced only against baselines of the same Python
+implementation and version, and shown otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess  # ruff:ignore[suspicious-subprocess-import]
+import sys
+from importlib.util import find_spec
+from operator import itemgetter
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import TYPE_CHECKING, Literal
+
+from common import DEMO, parser, run, stub_project, timed
+
+from pyproject_api import PersistentSubprocessFrontend, SubprocessFrontend
+
+if TYPE_CHECKING:
+    import argparse
+    from collections.abc import Callable
+
+_BASELINE = Path(__file__).absolute().parent / "baselines" / "hook_latency.json"
+
+
+def _demo(folder: Path) -> Path:  # ruff:ignore[unused-function-argument]
+    return DEMO
+
+
+def _setuptools(folder: Path) -> Path:
+    toml = '[build-system]\nrequires=["setuptools"]\nbuild-backend = "setuptools.build_meta"\n'
+    (folder / "pyproject.toml").write_text(f'{toml}[project]\nname = "bench"\nversion = "1.0"\n')
+    (folder / "bench.py").write_text("")
+    return folder
+
+
+def _hatchling(folder: Path) -> Path:
+    toml = '[build-system]\nrequires=["hatchling"]\nbuild-backend = "hatchling.build"\n'
+    (folder / "pyproject.toml").write_text(f'{toml}[project]\nname = "bench"\nversion = "1.0"\n')
+    (folder / "bench").mkdir()
+    (folder / "bench" / "__init__.py").write_text("")
+    return folder
+
+
+#: the projects to measure by backend name, with the distribution the backend needs (``None`` if it's in-tree)
+_BACKENDS: dict[str, tuple[Callable[[Path], Path], str | None]] = {
+    "stub": (stub_project, None),
+    "demo_pkg_inline": (_demo, None),
+    "setuptools": (_setuptools, "setuptools"),
+    "hatchling": (_hatchling, "hatchling"),
+}
+_FRONTENDS: dict[str, type[SubprocessFrontend | PersistentSubprocessFrontend]] = {
+    "persistent": PersistentSubprocessFrontend,
+    "fresh": SubprocessFrontend,
+}
+_TRANSPORTS: tuple[Literal["file", "pipe"], ...] = ("file", "pipe")
+
+
+def measure(
+    of_type: type[SubprocessFrontend | PersistentSubprocessFrontend],
+    project: Path,
+    transport: Literal["file", "pipe"],
+    calls: int,
+) -> tuple[list[float], float]:
+    """:return: the duration of each hook call, and the wall time of all of them"""
+    frontend = of_type(*of_type.create_args_from_folder(project)[:-1], result_transport=transport)
+    try:
+        frontend.get_requires_for_build_wheel()  # start the backend (or warm the file caches) outside the measurement
+        began = perf_counter()
+        durations = timed(frontend.get_requires_for_build_wheel, calls)
+        return durations, perf_counter() - began
+    finally:
+        if isinstance(frontend, PersistentSubprocessFrontend):
+            frontend.close()
+
+
+def summarize(durations: list[float], wall: float) -> dict[str, float]:
+    cuts = statistics.quantiles(durations, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98], "throughput": len(durations) / wall}
+
+
+def interpreter_start(calls: int, rounds: int) -> float:
+    """:return: the median duration of starting a bare interpreter (of the best round), the reference of fresh cases"""
+    start = [sys.executable, "-c", "pass"]
+    return min(statistics.median(timed(lambda: subprocess.run(start, check=True), calls)) for _ in range(rounds))  # ruff:ignore[subprocess-without-shell-equals-true]
+
+
+def ratios(results: dict[str, dict[str, float]], start: float) -> dict[str, float]:
+    """:return: ratios of the medians measured, comparable across machines, by what they compare"""
+    found = {}
+    for name, result in results.items():
+        backend, frontend, transport = name.split("/")
+        if frontend == "fresh":
+            found[f"{name} / interpreter start"] = result["p50"] / start
+        elif (fresh := results.get(f"{backend}/fresh/{transport}")) is not None:
+            found[f"{name} / fresh"] = result["p50"] / fresh["p50"]
+        if transport == "pipe" and (file := results.get(f"{backend}/{frontend}/file")) is not None:
+            found[f"{name} / file"] = result["p50"] / file["p50"]
+    return found
+
+
+def compare(value: float, baseline: float | None, tolerance: float) -> tuple[str, bool]:
+    """:return: the change against the baseline, and whether the value regressed beyond the tolerance"""
+    if baseline is None:
+        return "  (no baseline)", False
+    regressed = value > baseline * (1 + tolerance)
+    return f"  vs baseline {value / baseline - 1:+6.1%}{'  REGRESSED' if regressed else ''}", regressed
+
+
+def run_cases(
+    args: argparse.Namespace, baselines: dict[str, dict[str, float]], *, enforced: bool
+) -> tuple[dict[str, dict[str, float]], bool]:
+    """:return: the summary of every case selected by name, and whether a median regressed against an enforced one"""
+    results: dict[str, dict[str, float]] = {}
+    failed = False
+    for backend, (create, requires) in _BACKENDS.items():
+        if requires is not None and find_spec(requires) is None:
+            print(f"{backend:<36} skipped, {requires} is not installed")  # ruff:ignore[print]
+            continue
+        with TemporaryDirectory() as folder:
+            project = create(Path(folder))
+            for frontend, of_type in _FRONTENDS.items():
+                for transport in _TRANSPORTS:
+                    name = f"{backend}/{frontend}/{transport}"
+                    if args.cases and not any(name.startswith(case) for case in args.cases):
+                        continue
+                    calls = args.calls if frontend == "persistent" else args.fresh_calls
+                    rounds = (summarize(*measure(of_type, project, transport, calls)) for _ in range(args.rounds))
+                    result = results[name] = min(rounds, key=itemgetter("p50"))
+                    change, regressed = compare(result["p50"], baselines.get(name, {}).get("p50"), args.tolerance / 100)
+                    failed = failed or (regressed and enforced)
+                    print(  # ruff:ignore[print]
+                        f"{name:<36} p50 {result['p50'] * 1000:8.2f} ms  p95 {result['p95'] * 1000:8.2f} ms"
+                        f"  p99 {result['p99'] * 1000:8.2f} ms  {result['throughput']:8.1f} hooks/s{change}"
+                    )
+    return results, failed
+
+
+def _python() -> str:
+    return f"{platform.python_implementation()} {'.'.join(platform.python_version_tuple()[:2])}"
+
+
+def main(argv: list[str]) -> int:
+    cli = parser("Measure the per-hook latency (p50/p95/p99) and throughput of the frontends.")
+    cli.add_argument("cases", nargs="*", help="only run the cases whose name starts with one of these")
+    cli.add_argument("--calls", "-n", type=int, default=500, help="hooks to call per round on a persistent backend")
+    cli.add_argument("--fresh-calls", type=int, default=10, help="hooks to call per round on fresh subprocesses")
+    cli.add_argument("--rounds", "-r", type=int, default=3, help="rounds per case, the best one is kept")
+    cli.add_argument("--save", action="store_true", help="store the results as the new baselines")
+    cli.add_argument("--tolerance", type=float, default=50, help="allowed regression, in percent")
+    args = cli.parse_args(argv)
+
+    stored = json.loads(_BASELINE.read_text(encoding="utf-8")) if _BASELINE.exists() else {}
+    stored_results, stored_ratios = stored.get("results", {}), stored.get("ratios", {})
+    same_python = stored.get("python") == _python()
+    if stored_results and not same_python:
+        print(f"medians recorded with {stored.get('python')}, not enforced")  # ruff:ignore[print]
+    results, failed = run_cases(args, stored_results, enforced=same_python)
+    start = interpreter_start(args.fresh_calls, args.rounds)
+    print(f"{'interpreter start':<36} p50 {start * 1000:8.2f} ms")  # ruff:ignore[print]
+    measured = ratios(results, start)
+    for name, value in measured.items():
+        change, regressed = compare(value, stored_ratios.get(name), args.tolerance / 100)
+        failed = failed or regressed
+        print(f"{name:<52} x{value:8.3f}{change}")  # ruff:ignore[print]
+    if args.save:
+        kept = stored_results if same_python else {}  # medians of another interpreter do not compare with these
+        content = {
+            "python": _python(),
+            "results": dict(sorted({**kept, **results}.items())),
+            "ratios": dict(sorted({**stored_ratios, **measured}.items())),
+        }
+        _BASELINE.parent.mkdir(parents=True, exist_ok=True)
+        _BASELINE.write_text(f"{json.dumps(content, indent=2)}\n", encoding="utf-8")
+        print(f"baselines stored in {_BASELINE}")  # ruff:ignore[print]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    run(main)
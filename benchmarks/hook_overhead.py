@@ -0,0 +1,48 @@
+"""
+Measure the frontend overhead per hook: sleep-polling for completion versus waiting for a notification.
+
+Run with ``python benchmarks/hook_overhead.py [--calls N]``; uses a stub backend whose hooks do nothing, on a
+persistent backend, so the numbers are dominated by the protocol and the completion wait.
+"""
+
+from __future__ import annotations
+
+import statistics
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import process_time
+from unittest.mock import patch
+
+from common import parser, run, stub_project, timed
+
+from pyproject_api import CmdStatus, PersistentSubprocessFrontend
+from pyproject_api._via_persistent_subprocess import PersistentCmdStatus  # ruff:ignore[import-private-name]
+
+
+def measure(project: Path, calls: int) -> tuple[list[float], float]:
+    with PersistentSubprocessFrontend(*PersistentSubprocessFrontend.create_args_from_folder(project)[:-1]) as fe:
+        fe.get_requires_for_build_wheel()  # start the backend outside the measurement
+        cpu = process_time()
+        durations = timed(fe.get_requires_for_build_wheel, calls)
+        return durations, process_time() - cpu
+
+
+def main(argv: list[str]) -> None:
+    cli = parser("Measure the frontend overhead per hook: sleep-polling for completion versus waiting to be notified.")
+    cli.add_argument("--calls", "-n", type=int, default=500, help="hooks to call per mode")
+    args = cli.parse_args(argv)
+
+    with TemporaryDirectory() as folder:
+        project = stub_project(Path(folder))
+        for name, wait in (("sleep-poll", CmdStatus.wait), ("notify", PersistentCmdStatus.wait)):
+            with patch.object(PersistentCmdStatus, "wait", wait):
+                durations, cpu = measure(project, args.calls)
+            print(  # ruff:ignore[print]
+                f"{name:<12} median {statistics.median(durations) * 1e6:8.1f} us/hook"
+                f"  mean {statistics.mean(durations) * 1e6:8.1f} us/hook"
+                f"  frontend cpu {cpu / args.calls * 1e6:8.1f} us/hook"
+            )
+
+
+if __name__ == "__main__":
+    run(main)
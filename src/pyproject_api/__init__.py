@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+from ._cache import ArtifactCache, CachedArtifact, CachedMetadata, CacheStats, MetadataCache
 from ._frontend import (
     BackendFailed,
+    BackendInfo,
+    BatchResult,
     CmdStatus,
     EditableResult,
     Frontend,
+    HookTiming,
     MetadataForBuildEditableResult,
     MetadataForBuildWheelResult,
+    MetadataResult,
     OptionalHooks,
     RequiresBuildEditableResult,
     RequiresBuildSdistResult,
@@ -16,25 +21,55 @@ from ._frontend import (
     SdistResult,
     WheelResult,
 )
+from ._output import CapturedOutput, OutputLimit
+from ._place import Placement, place_artifact
+from ._pool import BackendPool, PoolKey, PoolStats
+from ._tracing import ChromeTraceTracer, JsonLinesTracer, Span, Tracer
 from ._version import version
+from ._via_async_subprocess import AsyncFrontend
+from ._via_fork_server import ForkServerFrontend
 from ._via_fresh_subprocess import SubprocessFrontend
+from ._via_persistent_subprocess import PersistentSubprocessFrontend
 
 #: semantic version of the project
 __version__ = version
 
 __all__ = [
+    "ArtifactCache",
+    "AsyncFrontend",
     "BackendFailed",
+    "BackendInfo",
+    "BackendPool",
+    "BatchResult",
+    "CacheStats",
+    "CachedArtifact",
+    "CachedMetadata",
+    "CapturedOutput",
+    "ChromeTraceTracer",
     "CmdStatus",
     "EditableResult",
+    "ForkServerFrontend",
     "Frontend",
+    "HookTiming",
+    "JsonLinesTracer",
+    "MetadataCache",
     "MetadataForBuildEditableResult",
     "MetadataForBuildWheelResult",
+    "MetadataResult",
     "OptionalHooks",
+    "OutputLimit",
+    "PersistentSubprocessFrontend",
+    "Placement",
+    "PoolKey",
+    "PoolStats",
     "RequiresBuildEditableResult",
     "RequiresBuildSdistResult",
     "RequiresBuildWheelResult",
     "SdistResult",
+    "Span",
     "SubprocessFrontend",
+    "Tracer",
     "WheelResult",
     "__version__",
+    "place_artifact",
 ]
@@ -1,16 +1,50 @@
 from __future__ import annotations  # ruff:ignore[undocumented-public-module]
 
 import argparse
+import io
+import json
 import os
 import pathlib
+import re
 import sys
-from typing import TYPE_CHECKING
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import TYPE_CHECKING, Literal, NamedTuple, TextIO
 
+from ._frontend import BackendFailed
 from ._via_fresh_subprocess import SubprocessFrontend
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
+
     from ._frontend import EditableResult, SdistResult, WheelResult
 
+    Result = SdistResult | WheelResult | EditableResult
+
+#: distribution type to the name shown for it and the hook building it, in build order
+_DISTRIBUTIONS = {
+    "sdist": ("sdist", "build_sdist"),
+    "wheel": ("wheel", "build_wheel"),
+    "editable": ("editable wheel", "build_editable"),
+}
+_GLOB = re.compile(r"[*?[]")
+
+
+class _Project(NamedTuple):
+    """The outcome of building the distributions of a source directory."""
+
+    srcdir: pathlib.Path
+    #: ``ok`` if all distributions were built, ``failed`` if one failed, ``skipped`` if stopped by ``--fail-fast``
+    status: Literal["ok", "failed", "skipped"]
+    #: the artifact built and how long it took, by distribution type
+    artifacts: dict[str, tuple[pathlib.Path, float]]
+    #: seconds spent on the project
+    duration: float
+    #: the failure, ``None`` if there was none
+    error: str | None
+
 
 def main_parser() -> argparse.ArgumentParser:  # ruff:ignore[undocumented-public-function]
     parser = argparse.ArgumentParser(
@@ -22,10 +56,14 @@ def main_parser() -> argparse.ArgumentParser:  # ruff:ignore[undocumented-public
     )
     parser.add_argument(
         "srcdir",
+        nargs="*",
+        help="source directories or glob patterns matching them (defaults to current directory)",
+    )
+    parser.add_argument(
+        "--manifest",
+        "-m",
         type=pathlib.Path,
-        nargs="?",
-        default=pathlib.Path.cwd(),
-        help="source directory (defaults to current directory)",
+        help="file listing source directories or glob patterns, one per line, relative to the file's folder",
     )
     parser.add_argument(
         "--sdist",
@@ -58,38 +96,231 @@ def main_parser() -> argparse.ArgumentParser:  # ruff:ignore[undocumented-public
         type=pathlib.Path,
         help=f"output directory (defaults to {{srcdir}}{os.sep}dist)",
     )
+    parser.add_argument(
+        "--parallel",
+        "-j",
+        action="store_true",
+        help="build the distributions concurrently, each in its own backend process",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of source directories built concurrently (defaults to 1)",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        "-x",
+        action="store_true",
+        help="do not start building more source directories once one failed",
+    )
+    parser.add_argument(
+        "--summary",
+        type=pathlib.Path,
+        help="write the outcome, durations and artifacts of every source directory to this JSON file",
+    )
     return parser
 
 
-def main(argv: list[str]) -> None:  # ruff:ignore[undocumented-public-function]
+def main(argv: list[str]) -> int:  # ruff:ignore[undocumented-public-function]
     parser = main_parser()
     args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    try:
+        sources = _source_dirs(args.srcdir, args.manifest)
+    except (OSError, ValueError) as exception:
+        parser.error(str(exception))
 
-    outdir = args.outdir or args.srcdir / "dist"
     # we intentionally do not build editable distributions by default
-    distributions = args.distributions or ["sdist", "wheel"]
+    distributions = [d for d in _DISTRIBUTIONS if d in (args.distributions or ["sdist", "wheel"])]
+    start = perf_counter()
+    if len(sources) == 1:  # report as the build goes
+        projects = [_build_project(sources[0], distributions, args, sys.stdout, sys.stderr)]
+    else:
+        projects = _build_projects(sources, distributions, args)
+    duration = perf_counter() - start
+
+    built = sum(len(project.artifacts) for project in projects)
+    failed = [project for project in projects if project.status != "ok"]
+    if len(projects) == 1:
+        print(f"Built {built} distribution(s) in {duration:.2f}s")  # ruff:ignore[print]
+    else:
+        print(  # ruff:ignore[print]
+            f"Built {built} distribution(s) of {len(projects) - len(failed)}/{len(projects)} project(s) in "
+            f"{duration:.2f}s"
+        )
+        for project in failed:
+            reason = "" if project.error is None else f": {project.error}"
+            print(f"{project.status.capitalize()} {project.srcdir}{reason}")  # ruff:ignore[print]
+    if args.summary is not None:
+        _write_summary(args.summary, projects, duration)
+    return 1 if failed else 0
+
+
+def _source_dirs(patterns: list[str], manifest: pathlib.Path | None) -> list[pathlib.Path]:
+    """:return: the source directories to build, in the order given and without duplicates"""
+    entries: list[tuple[str, pathlib.Path | None]] = [(pattern, None) for pattern in patterns]
+    if manifest is not None:
+        lines = (line.strip() for line in manifest.read_text(encoding="utf-8").splitlines())
+        entries.extend((line, manifest.parent) for line in lines if line and not line.startswith("#"))
+    if not entries:
+        return [pathlib.Path.cwd()]
+    found: dict[pathlib.Path, None] = {}
+    for pattern, base in entries:
+        path = pathlib.Path(pattern) if base is None else base / pattern
+        if _GLOB.search(pattern) is None:
+            found[path] = None
+            continue
+        anchor = pathlib.Path(path.anchor)  # glob only takes relative patterns, the anchor of those is empty
+        matches = anchor.glob(str(path.relative_to(anchor)))
+        if not (folders := sorted(match for match in matches if match.is_dir())):
+            msg = f"no source directory matches {pattern!r}"
+            raise ValueError(msg)
+        found.update(dict.fromkeys(folders))
+    return list(found)
+
+
+def _build_projects(sources: list[pathlib.Path], distributions: list[str], args: argparse.Namespace) -> list[_Project]:
+    """Build the source directories on a pool of workers, printing the output of each once it's done."""
+    projects: dict[pathlib.Path, _Project] = {}
+    remaining = deque(sources)
+    running: set[Future[tuple[_Project, str, str]]] = set()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        while remaining or running:
+            # submit no more than the workers run, so that a failure stops the rest from starting
+            while remaining and len(running) < args.workers:
+                running.add(executor.submit(_build_captured, remaining.popleft(), distributions, args))
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                project, out, err = future.result()
+                projects[project.srcdir] = project
+                print(f"Project {project.srcdir}...")  # ruff:ignore[print]
+                print(out, end="")  # ruff:ignore[print]
+                print(err, end="", file=sys.stderr)  # ruff:ignore[print]
+                if project.status == "failed" and args.fail_fast:
+                    remaining.clear()
+    skipped = (_Project(srcdir, "skipped", {}, 0.0, None) for srcdir in sources if srcdir not in projects)
+    projects.update((project.srcdir, project) for project in skipped)
+    return [projects[srcdir] for srcdir in sources]
+
+
+def _build_captured(
+    srcdir: pathlib.Path, distributions: list[str], args: argparse.Namespace
+) -> tuple[_Project, str, str]:
+    out, err = io.StringIO(), io.StringIO()
+    project = _build_project(srcdir, distributions, args, out, err)
+    return project, out.getvalue(), err.getvalue()
+
+
+def _build_project(
+    srcdir: pathlib.Path,
+    distributions: list[str],
+    args: argparse.Namespace,
+    out: TextIO,
+    err: TextIO,
+) -> _Project:
+    outdir = args.outdir or srcdir / "dist"
+    artifacts: dict[str, tuple[pathlib.Path, float]] = {}
+    start = perf_counter()
+    try:
+        _build_distributions(srcdir, distributions, outdir, args, artifacts, out, err)
+    except Exception as exception:  # ruff:ignore[blind-except] # a broken project must not stop the others
+        print(exception, file=err)
+        error = (
+            f"{exception.exc_type}: {exception.exc_msg}"
+            if isinstance(exception, BackendFailed)
+            else f"{type(exception).__name__}: {exception}"
+        )
+        return _Project(srcdir, "failed", artifacts, perf_counter() - start, error)
+    return _Project(srcdir, "ok", artifacts, perf_counter() - start, None)
+
+
+def _build_distributions(  # ruff:ignore[too-many-arguments, too-many-positional-arguments]
+    srcdir: pathlib.Path,
+    distributions: list[str],
+    outdir: pathlib.Path,
+    args: argparse.Namespace,
+    artifacts: dict[str, tuple[pathlib.Path, float]],
+    out: TextIO,
+    err: TextIO,
+) -> None:
+    """Build the distributions of a source directory, adding each artifact and its duration once built."""
+    frontend_args = SubprocessFrontend.create_args_from_folder(srcdir)[:-1]
+    # projects built concurrently may share the output directory, so stage their artifacts too
+    staged = args.parallel or args.workers > 1
+    if staged:
+        outdir.mkdir(parents=True, exist_ok=True)
+    if args.parallel:
+        with ThreadPoolExecutor(max_workers=len(distributions)) as executor:
+            futures = {
+                executor.submit(_build_staged, SubprocessFrontend(*frontend_args), distribution, outdir): distribution
+                for distribution in distributions
+            }
+            for future in as_completed(futures):  # the output of an artifact is printed together, once it's built
+                result, duration = future.result()
+                _report(futures[future], result, duration, out, err)
+                artifacts[futures[future]] = result[0], duration
+    else:
+        frontend = SubprocessFrontend(*frontend_args)
+        for distribution in distributions:
+            print(f"Building {_DISTRIBUTIONS[distribution][0]}...", file=out)
+            result, duration = (_build_staged if staged else _build)(frontend, distribution, outdir)
+            _report(distribution, result, duration, out, err, header=False)
+            artifacts[distribution] = result[0], duration
+
+
+def _build(frontend: SubprocessFrontend, distribution: str, outdir: pathlib.Path) -> tuple[Result, float]:
+    start = perf_counter()
+    result: Result = getattr(frontend, _DISTRIBUTIONS[distribution][1])(outdir)
+    return result, perf_counter() - start
+
+
+def _build_staged(frontend: SubprocessFrontend, distribution: str, outdir: pathlib.Path) -> tuple[Result, float]:
+    # build in a private folder, so concurrent builds do not see each other's partially written files
+    with TemporaryDirectory(dir=outdir, prefix=f".{distribution}-") as staging:
+        result, duration = _build(frontend, distribution, pathlib.Path(staging))
+        artifact = result[0].replace(outdir / result[0].name)
+    return type(result)(artifact, result.out, result.err), duration
 
-    frontend = SubprocessFrontend(*SubprocessFrontend.create_args_from_folder(args.srcdir)[:-1])
-    res: SdistResult | WheelResult | EditableResult
 
-    if "sdist" in distributions:
-        print("Building sdist...")  # ruff:ignore[print]
-        res = frontend.build_sdist(outdir)
-        print(res.out)  # ruff:ignore[print]
-        print(res.err, file=sys.stderr)  # ruff:ignore[print]
+def _report(  # ruff:ignore[too-many-arguments]
+    distribution: str,
+    result: Result,
+    duration: float,
+    out: TextIO,
+    err: TextIO,
+    *,
+    header: bool = True,
+) -> None:
+    name = _DISTRIBUTIONS[distribution][0]
+    if header:
+        print(f"Building {name}...", file=out)
+    print(result.out, file=out)
+    print(result.err, file=err)
+    print(f"Built {name} {result[0].name} in {duration:.2f}s", file=out)
 
-    if "wheel" in distributions:
-        print("Building wheel...")  # ruff:ignore[print]
-        res = frontend.build_wheel(outdir)
-        print(res.out)  # ruff:ignore[print]
-        print(res.err, file=sys.stderr)  # ruff:ignore[print]
 
-    if "editable" in distributions:
-        print("Building editable wheel...")  # ruff:ignore[print]
-        res = frontend.build_editable(outdir)
-        print(res.out)  # ruff:ignore[print]
-        print(res.err, file=sys.stderr)  # ruff:ignore[print]
+def _write_summary(path: pathlib.Path, projects: list[_Project], duration: float) -> None:
+    summary = {
+        "duration": duration,
+        "projects": [
+            {
+                "srcdir": str(project.srcdir),
+                "status": project.status,
+                "duration": project.duration,
+                "error": project.error,
+                "artifacts": {
+                    distribution: {"path": str(artifact), "duration": took}
+                    for distribution, (artifact, took) in project.artifacts.items()
+                },
+            }
+            for project in projects
+        ],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"{json.dumps(summary, indent=2)}\n", encoding="utf-8")
 
 
 if __name__ == "__main__":
-    main(sys.argv[1:])
+    sys.exit(main(sys.argv[1:]))
@@ -9,9 +9,26 @@ import importlib
 import json
 import locale
 import os
+import struct
 import sys
+import time
 import traceback
 
+#: environment variable holding the file descriptor on which to return the results (instead of a result file)
+RESULT_FD_ENV = "PYPROJECT_API_RESULT_FD"
+#: environment variable holding the file descriptor on which requests arrive (instead of lines on stdin)
+REQUEST_FD_ENV = "PYPROJECT_API_REQUEST_FD"
+#: version of the frames exchanged on the request and result file descriptors, the first byte of every frame
+PROTOCOL_VERSION = 1
+#: a frame is the protocol version and the length of the payload, followed by the payload (compact JSON)
+_FRAME_HEADER = struct.Struct(">BI")
+#: printed (followed by the marker of the request) on a new line of both stdout and stderr once a request was handled
+DONE_MARKER_PREFIX = "pyproject-api-done:"
+#: printed on stdout, followed by a JSON object describing the backend (see ``BackendProxy._handshake``), on start
+HANDSHAKE_PREFIX = "pyproject-api-handshake:"
+#: printed on stdout, followed by a JSON object of :func:`time.monotonic` values, once a request was handled
+TIMING_PREFIX = "pyproject-api-timing:"
+
 
 class MissingCommand(TypeError):  # ruff:ignore[error-suffix-on-exception-name]
     """Missing command."""
@@ -39,6 +56,47 @@ class BackendProxy:
     def _exit(self):  # ruff:ignore[no-self-use]
         return 0
 
+    def _batch(self, calls, separator):
+        """Run hooks one after the other, printing the separator on stdout and stderr after each of them."""
+        results = []
+        for call in calls:
+            print("Backend: run command {} with args {}".format(call["cmd"], call["kwargs"]))
+            try:
+                result = {"return": self(call["cmd"], **call["kwargs"])}
+            except BaseException as exception:  # ruff:ignore[blind-except]
+                result = failure(exception)
+            results.append(result)
+            flush()
+            print(separator)
+            print(separator, file=sys.stderr)
+            flush()
+        return results
+
+    def _handshake(self):
+        """:return: what the frontend learns about the backend when it starts, saving it a request"""
+        return {
+            "optional_hooks": self._optional_hooks(),
+            "backend_version": self._module_version(),
+            "python_version": sys.version.split()[0],
+        }
+
+    def _module_version(self):
+        """:return: the ``__version__`` of the backend package, cheap as it is imported already"""
+        version = getattr(sys.modules.get(self.backend_module.split(".")[0]), "__version__", None)
+        return version if isinstance(version, str) else None
+
+    def _backend_version(self):
+        """:return: the version of the backend, looked up from its distribution if the package does not tell it"""
+        version = self._module_version()
+        if version is not None:
+            return version
+        try:  # the distribution is usually named after the top level package, avoid scanning all distributions
+            from importlib.metadata import version as distribution_version  # ruff:ignore[import-outside-top-level]
+
+            return distribution_version(self.backend_module.split(".")[0])
+        except Exception:  # ruff:ignore[blind-except] # e.g. an in-tree backend
+            return None
+
     def _optional_hooks(self):
         return {
             k: hasattr(self.backend, k)
@@ -59,7 +117,18 @@ def flush():
 
 
 def run(argv):  # ruff:ignore[complex-structure, too-many-branches, too-many-statements]
-    reuse_process = argv[0].lower() == "true"
+    started = time.monotonic()
+    # ``fork`` reuses the process too, but handles every request in a child forked from it
+    fork = argv[0].lower() == "fork"
+    reuse_process = fork or argv[0].lower() == "true"
+    result_fd = os.environ.pop(RESULT_FD_ENV, None)  # do not leak it to processes started by the backend
+    if result_fd is not None:
+        result_fd = int(result_fd)
+        os.set_inheritable(result_fd, False)  # ruff:ignore[boolean-positional-value-in-call]
+    request_fd = os.environ.pop(REQUEST_FD_ENV, None)
+    if request_fd is not None:
+        request_fd = int(request_fd)
+        os.set_inheritable(request_fd, False)  # ruff:ignore[boolean-positional-value-in-call]
 
     try:
         backend_proxy = BackendProxy(argv[1], None if len(argv) == 2 else argv[2])  # ruff:ignore[magic-value-comparison]
@@ -67,69 +136,197 @@ def run(argv):  # ruff:ignore[complex-structure, too-many-branches, too-many-sta
         print("failed to start backend", file=sys.stderr)
         raise
     else:
+        ready = time.monotonic()
         print(f"started backend {backend_proxy}", file=sys.stdout)
+        try:
+            handshake = json.dumps(backend_proxy._handshake())  # ruff:ignore[private-member-access]
+        except Exception:  # ruff:ignore[blind-except] # the frontend asks for what it needs instead
+            handshake = None
+        if handshake is not None:
+            print(f"{HANDSHAKE_PREFIX}{handshake}", file=sys.stdout)
     finally:
         flush()  # pragma: no branch
     while True:
-        content = read_line()
-        if not content:
-            continue
+        if request_fd is None:
+            content = read_line()
+            if not content:
+                continue
+        else:
+            content = read_frame(request_fd)
+            if content is None:  # the frontend closed the channel, no more requests will arrive
+                break
         flush()  # flush any output generated before
         try:
             # python 2 does not support loading from bytearray
             if sys.version_info[0] == 2:  # pragma: no branch
                 content = content.decode()  # pragma: no cover
             parsed_message = json.loads(content)
-            result_file = parsed_message["result"]
+            parsed_message["result"]  # a request must name where its result goes
         except Exception:  # ruff:ignore[blind-except]
             # ignore messages that are not valid JSON and contain a valid result path
             print(f"Backend: incorrect request to backend: {content}", file=sys.stderr)
             flush()
         else:
-            result = {}
+            timing = {"backend_start": started, "backend_ready": ready}
             try:
-                cmd = parsed_message["cmd"]
-                print("Backend: run command {} with args {}".format(cmd, parsed_message["kwargs"]))
-                result["return"] = backend_proxy(cmd, **parsed_message["kwargs"])
-                if cmd == "_exit":
-                    break
-            except BaseException as exception:  # ruff:ignore[blind-except]
-                result["code"] = exception.code if isinstance(exception, SystemExit) else 1
-                result["exc_type"] = exception.__class__.__name__
-                result["exc_msg"] = str(exception)
-                if not isinstance(exception, MissingCommand):  # for missing command do not print stack
-                    traceback.print_exc()
+                if fork and parsed_message.get("cmd") != "_exit":
+                    stop = False
+                    respond_forked(backend_proxy, parsed_message, result_fd, timing)
+                else:
+                    stop = respond(backend_proxy, parsed_message, result_fd, timing)
             finally:
-                try:
-                    encoding = locale.getpreferredencoding(do_setlocale=False)
-                    with open(result_file, "w", encoding=encoding) as file_handler:  # ruff:ignore[builtin-open]
-                        json.dump(result, file_handler)
-                except Exception:  # ruff:ignore[blind-except]
-                    traceback.print_exc()
-                finally:
-                    # used as done marker by frontend
-                    print(f"Backend: Wrote response {result} to {result_file}")
-                    flush()  # pragma: no branch
+                marker = parsed_message.get("marker")
+                if marker is not None:  # lets a reused backend's frontend know all output of the request arrived
+                    # on a line of its own, even if the output of the request does not end with a newline
+                    print(f"\n{DONE_MARKER_PREFIX}{marker}")
+                    print(f"\n{DONE_MARKER_PREFIX}{marker}", file=sys.stderr)
+                flush()  # pragma: no branch
+            if stop:
+                break
         if reuse_process is False:  # pragma: no branch # no test for reuse process in root test env
             break
     return 0
 
 
+def respond(backend_proxy, parsed_message, result_fd, timing):
+    """:return: whether the backend should exit, after running the command of the request and writing its result"""
+    result = {}
+    cmd = None
+    try:
+        cmd = parsed_message["cmd"]
+        print("Backend: run command {} with args {}".format(cmd, parsed_message["kwargs"]))
+        result["return"] = timed(timing, backend_proxy, cmd, **parsed_message["kwargs"])
+    except BaseException as exception:  # ruff:ignore[blind-except]
+        result.update(failure(exception))
+    finally:
+        write_response(result, parsed_message, result_fd, timing)
+    return cmd == "_exit" and "return" in result
+
+
+def respond_forked(backend_proxy, parsed_message, result_fd, timing):
+    """Respond to the request from a forked child, so the command can't change the state later requests start from."""
+    flush()  # the child would write what is still buffered a second time
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover # the child of the backend process is not measured
+        try:
+            respond(backend_proxy, parsed_message, result_fd, timing)
+            flush()
+        finally:
+            os._exit(0)  # skip the cleanup of the process forked from
+    _, status = os.waitpid(pid, 0)
+    code = os.waitstatus_to_exitcode(status)
+    if code != 0:  # the child died before writing a result, respond on its behalf
+        msg = f"backend process {pid} handling the request exited with {code}"
+        result = {"code": code, "exc_type": "ChildProcessError", "exc_msg": msg}
+        print(msg, file=sys.stderr)
+        write_response(result, parsed_message, result_fd, timing)
+
+
+def write_response(result, parsed_message, result_fd, timing):
+    result_file = parsed_message["result"]
+    marker = parsed_message.get("marker")
+    try:
+        # a frame also carries the marker, so the frontend can tell which request it answers
+        frame = result if marker is None or result_fd is None else dict(result, marker=marker)
+        write_result(frame, result_file, result_fd)
+        timing["result_written"] = time.monotonic()
+    except Exception:  # ruff:ignore[blind-except]
+        traceback.print_exc()
+    finally:
+        # used as done marker by frontend
+        print(f"Backend: Wrote response {result} to {result_file}")
+        print(f"{TIMING_PREFIX}{json.dumps(timing)}")
+
+
+def timed(timing, backend_proxy, cmd, **kwargs):
+    """:return: what the command returned, recording when it started and ended in the timing"""
+    timing["hook_start"] = time.monotonic()
+    try:
+        return backend_proxy(cmd, **kwargs)
+    finally:
+        timing["hook_end"] = time.monotonic()
+
+
+def failure(exception):
+    """:return: the response reporting the exception raised by a command"""
+    if not isinstance(exception, MissingCommand):  # for missing command do not print stack
+        traceback.print_exc()
+    return {
+        "code": exception.code if isinstance(exception, SystemExit) else 1,
+        "exc_type": exception.__class__.__name__,
+        "exc_msg": str(exception),
+    }
+
+
+def write_result(result, result_file, result_fd):
+    if result_fd is None:
+        encoding = locale.getpreferredencoding(do_setlocale=False)
+        with open(result_file, "w", encoding=encoding) as file_handler:  # ruff:ignore[builtin-open]
+            json.dump(result, file_handler)
+    else:
+        write_frame(result_fd, encode(result))
+
+
+#: size of the chunks read from the request stream
+_READ_CHUNK = 64 * 1024
+#: bytes read past the end of the last returned line, per file descriptor
+_leftover = {}
+
+
 def read_line(fd=0):
-    # for some reason input() seems to break (hangs forever) so instead we read byte by byte the unbuffered stream
-    content = bytearray()
+    # for some reason input() seems to break (hangs forever) so instead we read the unbuffered stream in chunks, and
+    # keep what was read past the line for the next call
+    content = bytearray(_leftover.pop(fd, b""))
+    searched = 0
     while True:
-        char = os.read(fd, 1)
-        if not char:
+        end = content.find(b"\n", searched)
+        if end != -1:
+            if end + 1 < len(content):
+                _leftover[fd] = bytes(content[end + 1 :])
+            del content[end:]
+            break
+        searched = len(content)
+        chunk = os.read(fd, _READ_CHUNK)
+        if not chunk:
             if not content:
                 msg = "EOF without reading anything"
                 raise EOFError(msg)  # we didn't get a line at all, let the caller know
-            break  # pragma: no cover
-        if char == b"\n":
             break
-        if char != b"\r":
-            content += char
-    return content
+        content += chunk
+    return content.replace(b"\r", b"")
+
+
+def encode(message):
+    """:return: the payload of a frame carrying the message"""
+    return json.dumps(message, separators=(",", ":")).encode("utf-8")
+
+
+def write_frame(fd, payload):
+    data = _FRAME_HEADER.pack(PROTOCOL_VERSION, len(payload)) + payload
+    while data:
+        data = data[os.write(fd, data) :]
+
+
+def read_frame(fd):
+    """:return: the payload of the next frame, ``None`` if the stream ended before a complete frame arrived"""
+    header = _read_exactly(fd, _FRAME_HEADER.size)
+    if header is None:
+        return None
+    version, size = _FRAME_HEADER.unpack(header)
+    if version != PROTOCOL_VERSION:
+        msg = f"frame of protocol version {version}, expected {PROTOCOL_VERSION}"
+        raise ValueError(msg)
+    return _read_exactly(fd, size)
+
+
+def _read_exactly(fd, size):
+    content = bytearray()
+    while len(content) < size:
+        chunk = os.read(fd, size - len(content))
+        if not chunk:
+            return None
+        content += chunk
+    return bytes(content)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,13 @@
 from collections.abc import Sequence
 from typing import Any
 
+RESULT_FD_ENV: str
+REQUEST_FD_ENV: str
+PROTOCOL_VERSION: int
+DONE_MARKER_PREFIX: str
+HANDSHAKE_PREFIX: str
+TIMING_PREFIX: str
+
 class MissingCommand(TypeError): ...  # ruff:ignore[error-suffix-on-exception-name]
 
 class BackendProxy:
@@ -11,8 +18,27 @@ class BackendProxy:
     def __init__(self, backend_module: str, backend_obj: str | None) -> None: ...
     def __call__(self, name: str, *args: Any, **kwargs: Any) -> Any: ...
     def _exit(self) -> None: ...
-    def _optional_commands(self) -> dict[str, bool]: ...
+    def _batch(self, calls: list[dict[str, Any]], separator: str) -> list[dict[str, Any]]: ...
+    def _handshake(self) -> dict[str, Any]: ...
+    def _module_version(self) -> str | None: ...
+    def _backend_version(self) -> str | None: ...
+    def _optional_hooks(self) -> dict[str, bool]: ...
 
 def run(argv: Sequence[str]) -> int: ...
 def read_line(fd: int = 0) -> bytearray: ...
 def flush() -> None: ...
+def respond(
+    backend_proxy: BackendProxy, parsed_message: dict[str, Any], result_fd: int | None, timing: dict[str, float]
+) -> bool: ...
+def respond_forked(
+    backend_proxy: BackendProxy, parsed_message: dict[str, Any], result_fd: int | None, timing: dict[str, float]
+) -> None: ...
+def write_response(
+    result: dict[str, Any], parsed_message: dict[str, Any], result_fd: int | None, timing: dict[str, float]
+) -> None: ...
+def timed(timing: dict[str, float], backend_proxy: BackendProxy, cmd: str, **kwargs: Any) -> Any: ...
+def failure(exception: BaseException) -> dict[str, Any]: ...
+def write_result(result: dict[str, Any], result_file: str, result_fd: int | None) -> None: ...
+def encode(message: dict[str, Any]) -> bytes: ...
+def write_frame(fd: int, payload: bytes) -> None: ...
+def read_frame(fd: int) -> bytes | None: ...
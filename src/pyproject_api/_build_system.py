@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+from time import time_ns
+from typing import TYPE_CHECKING, NamedTuple
+from uuid import uuid4
+
+from packaging.requirements import Requirement
+
+from ._fingerprint import RACY_NS
+
+if sys.version_info >= (3, 11):  # pragma: no cover (py311+)
+    import tomllib
+else:  # pragma: no cover (py311+)
+    import tomli as tomllib
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class BuildSystem(NamedTuple):
+    """The ``build-system`` table of a ``pyproject.toml``, with ``None`` for the keys not set."""
+
+    requires: tuple[str, ...] | None
+    build_backend: str | None
+    backend_path: tuple[str, ...] | None
+
+
+#: the build-system tables read by this process, by file, with the modification time and size they were read at
+_READ: dict[Path, tuple[tuple[int, int], BuildSystem]] = {}
+
+
+def read_build_system(py_project_toml: Path, cache_directory: Path | None = None) -> BuildSystem | None:
+    """
+    Read the build-system table of a ``pyproject.toml``, parsing the file only when it changed since the last read.
+
+    :param py_project_toml: the file
+    :param cache_directory: folder persisting the tables across processes, ``None`` to only remember them in memory
+    :return: the table, ``None`` if the file does not exist
+    """
+    path = py_project_toml.absolute()
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    key = stat.st_mtime_ns, stat.st_size
+    known = _READ.get(path)
+    if known is not None and known[0] == key:
+        return known[1]
+    stored = None if cache_directory is None else cache_directory / f"{hashlib.sha256(bytes(path)).hexdigest()}.json"
+    build_system = None if stored is None else _load(stored, key)
+    if build_system is None:
+        with path.open("rb") as file_handler:
+            table = tomllib.load(file_handler).get("build-system", {})
+        build_system = BuildSystem(
+            tuple(table["requires"]) if "requires" in table else None,
+            table.get("build-backend"),
+            tuple(table["backend-path"]) if "backend-path" in table else None,
+        )
+    else:
+        stored = None  # already persisted
+    if stat.st_mtime_ns < time_ns() - RACY_NS:  # a recent file may change again without its timestamp changing
+        _READ[path] = key, build_system
+        if stored is not None:
+            _store(stored, key, build_system)
+    return build_system
+
+
+def requirements(requires: tuple[str, ...]) -> tuple[Requirement, ...]:
+    """:return: the parsed requirements, new objects on every call as callers may change them"""
+    return tuple(Requirement(r) for r in requires)
+
+
+def _load(stored: Path, key: tuple[int, int]) -> BuildSystem | None:
+    try:
+        content = json.loads(stored.read_text(encoding="utf-8"))
+        if tuple(content["key"]) != key:
+            return None
+        requires, build_backend, backend_path = content["build_system"]
+    except (OSError, ValueError, KeyError, TypeError):  # missing, damaged or written by another version
+        return None
+    return BuildSystem(
+        None if requires is None else tuple(requires),
+        build_backend,
+        None if backend_path is None else tuple(backend_path),
+    )
+
+
+def _store(stored: Path, key: tuple[int, int], build_system: BuildSystem) -> None:
+    stored.parent.mkdir(parents=True, exist_ok=True)
+    staging = stored.with_name(f".{stored.name}-{uuid4().hex}")
+    staging.write_text(json.dumps({"key": key, "build_system": build_system}), encoding="utf-8")
+    staging.replace(stored)  # concurrent processes each write a complete entry, the last one wins
+
+
+__all__ = [
+    "BuildSystem",
+    "read_build_system",
+    "requirements",
+]
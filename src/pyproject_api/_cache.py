@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from shutil import copytree, rmtree
+from threading import Lock
+from typing import TYPE_CHECKING, Any, NamedTuple
+from uuid import uuid4
+
+from ._place import place_artifact
+
+if sys.platform == "win32":  # pragma: win32 cover
+    import msvcrt
+else:  # pragma: win32 no cover
+    import fcntl
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from packaging.requirements import Requirement
+
+    from ._frontend import ConfigSettings
+
+
+class CacheStats(NamedTuple):
+    """Counters of a cache, for the lookups done by this process."""
+
+    #: number of lookups served from the cache
+    hits: int
+    #: number of lookups not found in the cache
+    misses: int
+    #: number of entries removed to stay within the size budget
+    evictions: int
+
+
+class CachedMetadata(NamedTuple):
+    """Metadata restored from a :class:`MetadataCache`."""
+
+    #: path to the restored metadata, ``None`` if the backend does not implement the hook
+    metadata: Path | None
+    #: backend standard output while the metadata was generated
+    out: str
+    #: backend standard error while the metadata was generated
+    err: str
+
+
+class CachedArtifact(NamedTuple):
+    """An artifact restored from an :class:`ArtifactCache`."""
+
+    #: path to the restored artifact
+    artifact: Path
+    #: backend standard output while the artifact was built
+    out: str
+    #: backend standard error while the artifact was built
+    err: str
+
+
+class _Store:
+    """
+    A folder of entries keyed by digest, shared by processes.
+
+    Entries are filled in a private folder and renamed into place, so readers never see a partial entry; a lock file
+    keeps the eviction from removing an entry that is being read. The least recently used entries are evicted first.
+    """
+
+    def __init__(self, directory: Path, max_size: int) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self._lock = Lock()
+        self._hits = self._misses = self._evictions = 0
+        directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions)
+
+    def index_for(self, root: Path) -> Path:
+        """:return: the file holding the stat index of a project's source fingerprint"""
+        return self.directory / ".index" / f"{hashlib.sha256(str(root).encode()).hexdigest()}.json"
+
+    def load(self, key: str, restore: Callable[[Path], Any]) -> Any:
+        """:return: the value ``restore`` returns for the entry, ``None`` if there is no entry for the key"""
+        entry = self.directory / key
+        with self._locked(shared=True):
+            found = entry.is_dir()
+            value = restore(entry) if found else None
+            if found:
+                os.utime(entry)  # the modification time of the entry tracks its last use
+        with self._lock:
+            if found:
+                self._hits += 1
+            else:
+                self._misses += 1
+        return value
+
+    def save(self, key: str, fill: Callable[[Path], None]) -> None:
+        """Add an entry, filled by ``fill``; an entry a concurrent process added first for the key is kept."""
+        staging = self.directory / f".tmp-{uuid4().hex}"
+        staging.mkdir()
+        try:
+            fill(staging)
+            with self._locked(shared=False):
+                entry = self.directory / key
+                if not entry.exists():
+                    staging.rename(entry)
+                evicted = self._evict(keep=key)
+        finally:
+            rmtree(staging, ignore_errors=True)
+        with self._lock:
+            self._evictions += evicted
+
+    def _evict(self, keep: str) -> int:
+        entries = [
+            (entry.stat().st_mtime, _size(entry), entry)
+            for entry in self.directory.iterdir()
+            if not entry.name.startswith(".") and entry.name != keep
+        ]
+        total = sum(size for _, size, __ in entries) + _size(self.directory / keep)
+        evicted = 0
+        for _, size, entry in sorted(entries):
+            if total <= self.max_size:
+                break
+            rmtree(entry, ignore_errors=True)
+            total -= size
+            evicted += 1
+        return evicted
+
+    @contextmanager
+    def _locked(self, *, shared: bool) -> Iterator[None]:
+        with (self.directory / ".lock").open("a+b") as handle:
+            if sys.platform == "win32":  # pragma: win32 cover
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)  # no shared locks on Windows, readers take turns
+                try:
+                    yield
+                finally:
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:  # pragma: win32 no cover
+                fcntl.flock(handle.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+                yield  # closing the file releases the lock
+
+
+class MetadataCache:
+    """
+    Keeps the metadata prepared by backends on disk, so that unchanged projects do not need to start a backend.
+
+    Entries are keyed by the content of the project, the backend (its key, version and build requirements), the
+    interpreter and the config settings. Assign it to :attr:`Frontend.metadata_cache` to use it; the cache folder may
+    be shared by processes running in parallel.
+    """
+
+    def __init__(self, directory: Path, max_size: int = 100 * 1024 * 1024) -> None:
+        """
+        Create a metadata cache.
+
+        :param directory: folder holding the cache, created if missing
+        :param max_size: size budget of the cache in bytes, least recently used entries are evicted first
+        """
+        self._store = _Store(directory, max_size)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Counters of the cache."""
+        return self._store.stats
+
+    def index_for(self, root: Path) -> Path:
+        """
+        Locate the stat index of a project's source fingerprint, kept so that unchanged files need not be hashed again.
+
+        :param root: the project root
+        :return: the index file
+        """
+        return self._store.index_for(root)
+
+    def restore(self, key: str, metadata_directory: Path) -> CachedMetadata | None:
+        """
+        Restore metadata into a folder.
+
+        :param key: the key of the metadata
+        :param metadata_directory: folder to restore the metadata into
+        :return: the restored metadata, ``None`` if the cache does not have it
+        """
+
+        def restore(entry: Path) -> CachedMetadata:
+            info = json.loads((entry / "result.json").read_text(encoding="utf-8"))
+            basename = info["basename"]
+            if basename is not None:
+                copytree(entry / basename, metadata_directory / basename, dirs_exist_ok=True)
+            return CachedMetadata(None if basename is None else metadata_directory / basename, info["out"], info["err"])
+
+        return self._store.load(key, restore)
+
+    def store(self, key: str, metadata: Path | None, out: str, err: str) -> None:
+        """
+        Store metadata.
+
+        :param key: the key of the metadata
+        :param metadata: the metadata folder, ``None`` if the backend does not implement the hook
+        :param out: backend standard output while the metadata was generated
+        :param err: backend standard error while the metadata was generated
+        """
+
+        def fill(entry: Path) -> None:
+            if metadata is not None:
+                copytree(metadata, entry / metadata.name)
+            info = {"basename": None if metadata is None else metadata.name, "out": out, "err": err}
+            (entry / "result.json").write_text(json.dumps(info), encoding="utf-8")
+
+        self._store.save(key, fill)
+
+
+class ArtifactCache:
+    """
+    A content addressed store of built source distributions and wheels, so unchanged projects are not rebuilt.
+
+    Entries are keyed by the content of the project, the backend (its key, version and build requirements), the
+    interpreter tag and the config settings. Assign it to :attr:`Frontend.artifact_cache` to use it; the cache folder
+    may be shared by processes running in parallel, e.g. tox workers.
+    """
+
+    def __init__(self, directory: Path, max_size: int = 1024 * 1024 * 1024) -> None:
+        """
+        Create an artifact cache.
+
+        :param directory: folder holding the cache, created if missing
+        :param max_size: size budget of the cache in bytes, least recently used entries are evicted first
+        """
+        self._store = _Store(directory, max_size)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Counters of the cache."""
+        return self._store.stats
+
+    def index_for(self, root: Path) -> Path:
+        """
+        Locate the stat index of a project's source fingerprint, kept so that unchanged files need not be hashed again.
+
+        :param root: the project root
+        :return: the index file
+        """
+        return self._store.index_for(root)
+
+    def restore(self, key: str, directory: Path) -> CachedArtifact | None:
+        """
+        Place a cached artifact into a folder.
+
+        :param key: the key of the artifact
+        :param directory: folder to place the artifact into
+        :return: the placed artifact, ``None`` if the cache does not have it
+        """
+
+        def restore(entry: Path) -> CachedArtifact:
+            info = json.loads((entry / "result.json").read_text(encoding="utf-8"))
+            # no hard links, modifying the restored file must not change the cache entry
+            placed = place_artifact(entry / info["basename"], directory, hardlink=False)
+            return CachedArtifact(placed.path, info["out"], info["err"])
+
+        return self._store.load(key, restore)
+
+    def store(self, key: str, artifact: Path, out: str, err: str) -> None:
+        """
+        Store a built artifact.
+
+        :param key: the key of the artifact
+        :param artifact: the artifact
+        :param out: backend standard output while the artifact was built
+        :param err: backend standard error while the artifact was built
+        """
+
+        def fill(entry: Path) -> None:
+            place_artifact(artifact, entry, hardlink=False)
+            info = {"basename": artifact.name, "out": out, "err": err}
+            (entry / "result.json").write_text(json.dumps(info), encoding="utf-8")
+
+        self._store.save(key, fill)
+
+
+def build_key(  # ruff:ignore[too-many-arguments]
+    cmd: str,
+    config_settings: ConfigSettings | None,
+    *,
+    source: str,
+    root: Path,
+    backend: str,
+    backend_version: str,
+    backend_paths: tuple[Path, ...],
+    requires: tuple[Requirement, ...],
+    extra: tuple[str, ...] = (),
+) -> str:
+    """
+    Compute the cache key of a hook call.
+
+    :param cmd: the hook
+    :param config_settings: config settings passed to the hook
+    :param source: the fingerprint of the project's source files
+    :param root: the project root
+    :param backend: the backend key
+    :param backend_version: version of the backend, as installed for the interpreter running it (empty if not known)
+    :param backend_paths: in-tree paths the backend is imported from
+    :param requires: build requirements of the backend
+    :param extra: further values the outcome of the hook depends on
+    :return: digest of everything that may change what the hook generates for the project
+    """
+    parts = {
+        "cmd": cmd,
+        "source": source,
+        "backend": backend,
+        "backend_version": backend_version,
+        "backend_paths": [os.path.relpath(p, root) for p in backend_paths],
+        "requires": sorted(str(r) for r in requires),
+        "config_settings": config_settings or {},
+        "extra": extra,
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _size(path: Path) -> int:
+    return sum((Path(folder) / name).stat().st_size for folder, _, names in os.walk(path) for name in names)
+
+
+__all__ = [
+    "ArtifactCache",
+    "CacheStats",
+    "CachedArtifact",
+    "CachedMetadata",
+    "MetadataCache",
+    "build_key",
+]
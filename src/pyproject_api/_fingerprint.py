@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess  # ruff:ignore[suspicious-subprocess-import]
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from time import time_ns
+from typing import TYPE_CHECKING, NamedTuple
+from uuid import uuid4
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+#: folders holding tool state or version control data rather than project sources, skipped wherever they are
+SKIP_DIRS = frozenset({
+    ".eggs",
+    ".git",
+    ".hg",
+    ".mypy_cache",
+    ".nox",
+    ".pytest_cache",
+    ".ruff_cache",
+    ".svn",
+    ".tox",
+    ".venv",
+    "__pycache__",
+})
+#: folders holding build output or environments, skipped only at the project root as packages may be named alike (a
+#: virtual environment, a folder with a ``pyvenv.cfg``, is skipped wherever it is)
+ROOT_SKIP_DIRS = frozenset({
+    "build",
+    "dist",
+    "venv",
+})
+#: files modified this close (in nanoseconds) to the index being written may change again within the same timestamp
+RACY_NS = 2_000_000_000
+_INDEX_VERSION = 1
+
+
+class SourceFingerprint(NamedTuple):
+    """The fingerprint of the source files of a project."""
+
+    #: digest of the file paths and contents, stable across runs and machines
+    digest: str
+    #: files added, removed or modified since the index was last written (all files when there was no index)
+    changed: tuple[str, ...]
+
+
+class _Stat(NamedTuple):
+    size: int
+    mtime_ns: int
+    inode: int
+
+
+def fingerprint(
+    root: Path,
+    index: Path | None = None,
+    use_git: bool = False,  # ruff:ignore[boolean-type-hint-positional-argument, boolean-default-value-positional-argument]
+    max_workers: int | None = None,
+) -> SourceFingerprint:
+    """
+    Fingerprint the source files of a project.
+
+    Only files whose size, modification time or inode changed since the index was written are hashed again; the
+    folders are scanned concurrently.
+
+    :param root: the project root
+    :param index: file holding the stat index of the previous run, updated with the result; ``None`` to hash everything
+    :param use_git: fingerprint the files ``git ls-files`` reports (tracked and not ignored), falling back to scanning
+        the folders when the project is not a git checkout
+    :param max_workers: number of threads scanning folders and hashing files
+    :return: the fingerprint
+    """
+    previous, written_ns = _read_index(index)
+    with ThreadPoolExecutor(max_workers) as executor:
+        stats = (_git_files(root) if use_git else None) or _scan_tree(root, executor)
+        digests: dict[str, str] = {}
+        to_hash = []
+        for relative, stat in stats.items():
+            known = previous.get(relative)
+            if known is not None and known[0] == stat and stat.mtime_ns < written_ns - RACY_NS:
+                digests[relative] = known[1]
+            else:
+                to_hash.append(relative)
+        digests.update(zip(to_hash, executor.map(lambda r: file_digest(root / r).hex(), to_hash), strict=True))
+
+    result = hashlib.sha256()
+    for relative in sorted(digests):
+        result.update(relative.encode("utf-8", "surrogateescape") + b"\0")
+        result.update(bytes.fromhex(digests[relative]))
+    changed = {r for r, d in digests.items() if r not in previous or previous[r][1] != d}
+    changed.update(r for r in previous if r not in digests)
+    if index is not None:
+        _write_index(index, {r: (stats[r], digests[r]) for r in digests})
+    return SourceFingerprint(result.hexdigest(), tuple(sorted(changed)))
+
+
+def file_digest(path: Path) -> bytes:
+    """:return: the SHA-256 digest of a file's content"""
+    digest = hashlib.sha256()
+    with path.open("rb") as file_handler:
+        for chunk in iter(lambda: file_handler.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def stat_tree(root: Path) -> dict[str, tuple[int, int, int]]:
+    """
+    Look up the source files of a project without reading them, a cheap way to notice that any of them changed.
+
+    :param root: the folder to scan, may be missing
+    :return: the size, modification time and inode of every file by its path relative to the folder
+    """
+    files: dict[str, tuple[int, int, int]] = {}
+    pending = [""] if root.is_dir() else []
+    while pending:
+        found, folders = _scan(root, pending.pop())
+        files.update(found)
+        pending.extend(folders)
+    return files
+
+
+def _scan_tree(root: Path, executor: ThreadPoolExecutor) -> dict[str, _Stat]:
+    files: dict[str, _Stat] = {}
+    pending: set[Future[tuple[dict[str, _Stat], list[str]]]] = {executor.submit(_scan, root, "")}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            found, folders = future.result()
+            files.update(found)
+            pending.update(executor.submit(_scan, root, folder) for folder in folders)
+    return files
+
+
+def _scan(root: Path, prefix: str) -> tuple[dict[str, _Stat], list[str]]:
+    files: dict[str, _Stat] = {}
+    folders: list[str] = []
+    with os.scandir(root / prefix if prefix else root) as found:
+        entries = list(found)
+    if prefix and any(entry.name == "pyvenv.cfg" for entry in entries):  # a virtual environment
+        return files, folders
+    skip = SKIP_DIRS if prefix else SKIP_DIRS | ROOT_SKIP_DIRS
+    for entry in entries:
+        relative = f"{prefix}{entry.name}"
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in skip and not entry.name.endswith(".egg-info"):
+                folders.append(f"{relative}/")
+        elif entry.is_file():
+            files[relative] = _stat(entry.stat())
+    return files, folders
+
+
+def _git_files(root: Path) -> dict[str, _Stat] | None:
+    try:
+        listed = subprocess.run(
+            ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],  # ruff:ignore[start-process-with-partial-path]
+            cwd=root,
+            capture_output=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    files: dict[str, _Stat] = {}
+    for name in listed.decode("utf-8", "surrogateescape").split("\0"):
+        path = root / name
+        if name and path.is_file():  # tracked files may be deleted in the work tree
+            files[name] = _stat(path.stat())
+    return files
+
+
+def _stat(stat: os.stat_result) -> _Stat:
+    return _Stat(stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+
+def _read_index(index: Path | None) -> tuple[dict[str, tuple[_Stat, str]], int]:
+    if index is None:
+        return {}, 0
+    try:
+        content = json.loads(index.read_text(encoding="utf-8"))
+    except (OSError, ValueError):  # missing or damaged, start over
+        return {}, 0
+    if content.get("version") != _INDEX_VERSION:
+        return {}, 0
+    files = {relative: (_Stat(*stat), digest) for relative, (stat, digest) in content["files"].items()}
+    return files, content["written_ns"]
+
+
+def _write_index(index: Path, files: dict[str, tuple[_Stat, str]]) -> None:
+    content = {"version": _INDEX_VERSION, "written_ns": time_ns(), "files": files}
+    index.parent.mkdir(parents=True, exist_ok=True)
+    staging = index.with_name(f".{index.name}-{uuid4().hex}")
+    staging.write_text(json.dumps(content), encoding="utf-8")
+    staging.replace(index)  # concurrent runs each write a complete index, the last one wins
+
+
+__all__ = [
+    "RACY_NS",
+    "ROOT_SKIP_DIRS",
+    "SKIP_DIRS",
+    "SourceFingerprint",
+    "file_digest",
+    "fingerprint",
+    "stat_tree",
+]
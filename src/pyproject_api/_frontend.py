@@ -2,30 +2,47 @@
 
 from __future__ import annotations
 
+import inspect
 import json
+import locale
 import sys
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
 from pathlib import Path
 from tempfile import NamedTemporaryFile, TemporaryDirectory
-from time import sleep
-from typing import TYPE_CHECKING, Any, Literal, NamedTuple, NoReturn, TypedDict, cast
-from zipfile import ZipFile
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, Any, Concatenate, Literal, NamedTuple, NoReturn, ParamSpec, TypedDict, TypeVar, cast
+from uuid import uuid4
 
 from packaging.requirements import Requirement
-
+from packaging.tags import sys_tags
+
+from pyproject_api._backend import HANDSHAKE_PREFIX, TIMING_PREFIX
+from pyproject_api._build_system import BuildSystem, read_build_system, requirements
+from pyproject_api._cache import build_key
+from pyproject_api._fingerprint import fingerprint
+from pyproject_api._output import CapturedOutput
+from pyproject_api._place import place_artifact
+from pyproject_api._sdist import static_metadata
+from pyproject_api._tracing import Tracer
 from pyproject_api._util import ensure_empty_dir
+from pyproject_api._wheel import extract_dist_info
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterator, Sequence
 
-if sys.version_info >= (3, 11):  # pragma: no cover (py311+)
-    import tomllib
-else:  # pragma: no cover (py311+)
-    import tomli as tomllib
+    from pyproject_api._cache import ArtifactCache, CachedArtifact, CachedMetadata, MetadataCache
+    from pyproject_api._output import OutputLimit
+    from pyproject_api._place import Placement
 
 _HERE = Path(__file__).parent
+#: whether the artifacts built are placed into the artifact targets, not while building them just for their metadata
+_PLACE_ARTIFACTS: ContextVar[bool] = ContextVar("pyproject_api_place_artifacts", default=True)
 ConfigSettings = dict[str, Any] | None
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
 
 
 class OptionalHooks(TypedDict, total=True):
@@ -39,7 +56,62 @@ class OptionalHooks(TypedDict, total=True):
     prepare_metadata_for_build_editable: bool
 
 
+class BackendInfo(NamedTuple):
+    """What a backend reports about itself when it starts."""
+
+    #: the optional hooks the backend supports
+    optional_hooks: OptionalHooks
+    #: the ``__version__`` of the backend package, ``None`` if it does not define one (the distribution providing the
+    #: backend is not looked up, as that would slow down the start of every backend)
+    backend_version: str | None
+    #: version of the Python interpreter running the backend
+    python_version: str
+
+
+class HookTiming(NamedTuple):
+    """
+    When the phases of a hook call happened, on both sides of the protocol.
+
+    The values are seconds of :func:`time.monotonic`, a clock the processes of a machine share. The backend side values
+    are ``None`` if the backend did not report them (e.g. it crashed), the backend start ones also when a backend that
+    was already running handled the hook.
+    """
+
+    #: the frontend started sending the hook
+    start: float
+    #: the frontend started the backend process, ``None`` when a backend that was already running handled the hook
+    spawn_start: float | None
+    #: the backend process started running, once its interpreter initialized
+    backend_start: float | None
+    #: the backend imported the build backend, and was ready to run hooks
+    backend_ready: float | None
+    #: the backend started running the hook
+    hook_start: float | None
+    #: the hook returned (or raised)
+    hook_end: float | None
+    #: the backend finished writing the result
+    result_written: float | None
+    #: the frontend finished reading the result
+    result_read: float
+
+    @property
+    def phases(self) -> dict[str, float]:
+        """Durations of the phases (``spawn``, ``import``, ``hook``, ``write``, ``read`` and ``total``) recorded."""
+        bounds = {
+            "spawn": (self.spawn_start, self.backend_start),
+            "import": (self.backend_start, self.backend_ready),
+            "hook": (self.hook_start, self.hook_end),
+            "write": (self.hook_end, self.result_written),
+            "read": (self.result_written, self.result_read),
+            "total": (self.start, self.result_read),
+        }
+        return {name: end - begin for name, (begin, end) in bounds.items() if begin is not None and end is not None}
+
+
 class CmdStatus(ABC):
+    #: when the frontend started the backend process for the command, ``None`` if a running backend handled it
+    spawn_start: float | None = None
+
     @property
     @abstractmethod
     def done(self) -> bool:
@@ -51,6 +123,42 @@ class CmdStatus(ABC):
         """:return: standard output and standard error text"""
         raise NotImplementedError
 
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Block until the command finished.
+
+        The default implementation polls :attr:`done`, subclasses should override it to wait for a notification.
+
+        :param timeout: give up after this many seconds, ``None`` to wait indefinitely
+        :return: truthful when the command finished
+        """
+        end = None if timeout is None else monotonic() + timeout
+        while not self.done:
+            if end is not None and monotonic() >= end:
+                return False
+            sleep(0.001)  # wait a bit for things to happen
+        return True
+
+    def result(self) -> dict[str, Any] | None:  # ruff:ignore[no-self-use]
+        """:return: the backend response if it was received in-band, ``None`` to read it from the result file"""
+        return None
+
+
+class OutputListener:
+    """Forwards the output lines of a backend to a callback, while the hook runs."""
+
+    def __init__(self, callback: Callable[[str], None]) -> None:
+        self._callback = callback
+        #: the first error the callback raised, it's not called after that
+        self.error: BaseException | None = None
+
+    def __call__(self, line: str) -> None:
+        if self.error is None and not line.startswith((HANDSHAKE_PREFIX, TIMING_PREFIX)):
+            try:
+                self._callback(line)
+            except BaseException as exception:  # ruff:ignore[blind-except] # the output must still be drained
+                self.error = exception
+
 
 class RequiresBuildSdistResult(NamedTuple):
     """Information collected while acquiring the source distribution build dependencies."""
@@ -107,6 +215,20 @@ class MetadataForBuildEditableResult(NamedTuple):
     err: str
 
 
+class MetadataResult(NamedTuple):
+    """Information collected while acquiring the metadata of a wheel with :meth:`Frontend.acquire_metadata`."""
+
+    #: path to the wheel metadata
+    metadata: Path
+    #: backend standard output while acquiring the metadata
+    out: str
+    #: backend standard error while acquiring the metadata
+    err: str
+    #: what produced the metadata: ``prepare_metadata`` the backend's prepare hook, ``sdist`` the ``PKG-INFO`` of a
+    #: source distribution, ``wheel`` building the wheel
+    strategy: Literal["prepare_metadata", "sdist", "wheel"]
+
+
 class SdistResult(NamedTuple):
     """Information collected while building a source distribution."""
 
@@ -170,6 +292,48 @@ class BackendFailed(RuntimeError):  # ruff:ignore[error-suffix-on-exception-name
         )
 
 
+class BatchResult(NamedTuple):
+    """Outcome of one hook run as part of :meth:`Frontend.batch`."""
+
+    #: the value returned by the hook, ``None`` if the hook failed
+    value: Any
+    #: backend standard output while running the hook
+    out: str
+    #: backend standard error while running the hook
+    err: str
+    #: the failure of the hook, ``None`` if it succeeded
+    error: BackendFailed | None
+
+
+#: the response when the backend exited without sending its result on the result pipe
+_NO_RESULT_FRAME: dict[str, Any] = {
+    "code": 1,
+    "exc_type": "RuntimeError",
+    "exc_msg": "backend exited without sending a result frame",
+}
+
+
+def _traced(method: Callable[Concatenate[Frontend, _P], _R]) -> Callable[Concatenate[Frontend, _P], _R]:
+    """:return: the method, running within a span of the frontend's tracer named after it"""
+    signature = inspect.signature(method)
+
+    @wraps(method)
+    def traced(self: Frontend, /, *args: _P.args, **kwargs: _P.kwargs) -> _R:
+        config_settings = signature.bind(self, *args, **kwargs).arguments.get("config_settings")
+        with self.tracer.span(
+            traced.__name__,  # the name of the method, set by wraps
+            backend=self.backend,
+            config_settings=sorted(config_settings or {}),
+        ) as attributes:
+            result = method(self, *args, **kwargs)
+            if isinstance(result, tuple):  # hook results hold the standard output and error second and third
+                out, err = cast("tuple[Any, str, str]", result)[1:3]
+                attributes["out_size"], attributes["err_size"] = len(out), len(err)
+            return result
+
+    return traced
+
+
 class Frontend(ABC):
     """Abstract base class for a pyproject frontend."""
 
@@ -204,16 +368,45 @@ class Frontend(ABC):
         self.requires: tuple[Requirement, ...] = requires
         self._reuse_backend = reuse_backend
         self._optional_hooks: OptionalHooks | None = None
+        #: what the backend reported about itself when it last started, ``None`` until a backend started
+        self.backend_info: BackendInfo | None = None
+        #: version of the backend as installed for the interpreter running it, ``None`` until the cache keys need it
+        self._backend_version: str | None = None
+        #: when the phases of the last hook sent happened, ``None`` until a hook was sent
+        self.last_timing: HookTiming | None = None
+        #: receives spans around the hooks and the requests sent to the backend, the default ignores them
+        self.tracer: Tracer = Tracer()
+        #: listeners of the standard output and standard error lines of the backend, see :meth:`stream_output`
+        self._listeners: tuple[OutputListener | None, OutputListener | None] = None, None
+        #: the backend returns results on a pipe (see :class:`CmdStatus.result`) instead of a temporary file
+        self._result_pipe = False
+        #: opt-in cache of the prepared metadata, consulted before asking the backend to prepare it
+        self.metadata_cache: MetadataCache | None = None
+        #: opt-in cache of the built source distributions and wheels, consulted before asking the backend to build them
+        self.artifact_cache: ArtifactCache | None = None
+        #: opt-in bound of the backend output held in memory per stream and hook, the rest is spilled to a file and the
+        #: results carry a :class:`CapturedOutput`; ``None`` keeps the whole output in memory
+        self.output_limit: OutputLimit | None = None
+        #: opt-in folders the built source distributions and wheels are placed into as well, by reflinks or hard links
+        #: where the file system supports them, see :func:`place_artifact`
+        self.artifact_targets: tuple[Path, ...] = ()
+        #: where and how the last artifact built (or restored from the cache) was placed into the artifact targets
+        self.last_placements: tuple[Placement, ...] = ()
 
     @classmethod
     def create_args_from_folder(
         cls,
         folder: Path,
+        cache_directory: Path | None = None,
     ) -> tuple[Path, tuple[Path, ...], str, str | None, tuple[Requirement, ...], bool]:
         """
         Frontend creation arguments from a python project folder (thould have a ``pypyproject.toml`` file per PEP-518).
 
+        The ``build-system`` table is remembered for the process, and only read again once the modification time or
+        size of ``pyproject.toml`` changes; the requirements are parsed on every call, as callers may change them.
+
         :param folder: the python project folder
+        :param cache_directory: folder persisting the ``build-system`` tables across processes
         :return: the frontend creation args
 
         E.g., to create a frontend from a python project folder:
@@ -222,24 +415,12 @@ class Frontend(ABC):
 
             frontend = Frontend(*Frontend.create_args_from_folder(project_folder))
         """
-        py_project_toml = folder / "pyproject.toml"
-        if py_project_toml.exists():
-            with py_project_toml.open("rb") as file_handler:
-                py_project = tomllib.load(file_handler)
-            build_system = py_project.get("build-system", {})
-            if "backend-path" in build_system:
-                backend_paths: tuple[Path, ...] = tuple(folder / p for p in build_system["backend-path"])
-            else:
-                backend_paths = ()
-            if "requires" in build_system:
-                requires: tuple[Requirement, ...] = tuple(Requirement(r) for r in build_system.get("requires"))
-            else:
-                requires = cls.LEGACY_REQUIRES
-            build_backend = build_system.get("build-backend", cls.LEGACY_BUILD_BACKEND)
-        else:
-            backend_paths = ()
-            requires = cls.LEGACY_REQUIRES
-            build_backend = cls.LEGACY_BUILD_BACKEND
+        build_system = read_build_system(folder / "pyproject.toml", cache_directory)
+        if build_system is None:
+            build_system = BuildSystem(None, None, None)
+        backend_paths = tuple(folder / p for p in build_system.backend_path or ())
+        requires = cls.LEGACY_REQUIRES if build_system.requires is None else requirements(build_system.requires)
+        build_backend = build_system.build_backend or cls.LEGACY_BUILD_BACKEND
         paths = build_backend.split(":")
         backend_module: str = paths[0]
         backend_obj: str | None = paths[1] if len(paths) > 1 else None
@@ -258,6 +439,14 @@ class Frontend(ABC):
             result.append(self._backend_obj)
         return result
 
+    def prewarm(self) -> None:  # ruff:ignore[empty-method-without-abstract-decorator] # nothing to do by default
+        """
+        Start the backend in the background, so that it is ready (imported) by the time the first hook is called.
+
+        Returns without waiting for the backend; the caller can prepare the build environment in the meantime. A no-op
+        for frontends that start a backend per hook, see :meth:`PersistentSubprocessFrontend.prewarm`.
+        """
+
     @property
     def optional_hooks(self) -> OptionalHooks:
         """A dictionary indicating if the optional hook is supported or not."""
@@ -266,6 +455,7 @@ class Frontend(ABC):
             self._optional_hooks = result
         return self._optional_hooks
 
+    @_traced
     def get_requires_for_build_sdist(self, config_settings: ConfigSettings | None = None) -> RequiresBuildSdistResult:
         """
         Get build requirements for a source distribution (per PEP-517).
@@ -273,14 +463,11 @@ class Frontend(ABC):
         :param config_settings: run arguments
         :return: outcome
         """
-        if self.optional_hooks["get_requires_for_build_sdist"]:
-            result, out, err = self._send(cmd="get_requires_for_build_sdist", config_settings=config_settings)
-        else:
-            result, out, err = [], "", ""
-        if not isinstance(result, list) or not all(isinstance(i, str) for i in result):
-            self._unexpected_response("get_requires_for_build_sdist", result, "list of string", out, err)
-        return RequiresBuildSdistResult(tuple(Requirement(r) for r in cast("list[str]", result)), out, err)
+        cmd = "get_requires_for_build_sdist"
+        result, out, err = self._send_optional(cmd, config_settings=config_settings) or ([], "", "")
+        return RequiresBuildSdistResult(hook_requirements(self.backend, cmd, result, out, err), out, err)
 
+    @_traced
     def get_requires_for_build_wheel(self, config_settings: ConfigSettings | None = None) -> RequiresBuildWheelResult:
         """
         Get build requirements for a wheel (per PEP-517).
@@ -288,14 +475,11 @@ class Frontend(ABC):
         :param config_settings: run arguments
         :return: outcome
         """
-        if self.optional_hooks["get_requires_for_build_wheel"]:
-            result, out, err = self._send(cmd="get_requires_for_build_wheel", config_settings=config_settings)
-        else:
-            result, out, err = [], "", ""
-        if not isinstance(result, list) or not all(isinstance(i, str) for i in result):
-            self._unexpected_response("get_requires_for_build_wheel", result, "list of string", out, err)
-        return RequiresBuildWheelResult(tuple(Requirement(r) for r in cast("list[str]", result)), out, err)
+        cmd = "get_requires_for_build_wheel"
+        result, out, err = self._send_optional(cmd, config_settings=config_settings) or ([], "", "")
+        return RequiresBuildWheelResult(hook_requirements(self.backend, cmd, result, out, err), out, err)
 
+    @_traced
     def get_requires_for_build_editable(
         self,
         config_settings: ConfigSettings | None = None,
@@ -306,14 +490,11 @@ class Frontend(ABC):
         :param config_settings: run arguments
         :return: outcome
         """
-        if self.optional_hooks["get_requires_for_build_editable"]:
-            result, out, err = self._send(cmd="get_requires_for_build_editable", config_settings=config_settings)
-        else:
-            result, out, err = [], "", ""
-        if not isinstance(result, list) or not all(isinstance(i, str) for i in result):
-            self._unexpected_response("get_requires_for_build_editable", result, "list of string", out, err)
-        return RequiresBuildEditableResult(tuple(Requirement(r) for r in cast("list[str]", result)), out, err)
+        cmd = "get_requires_for_build_editable"
+        result, out, err = self._send_optional(cmd, config_settings=config_settings) or ([], "", "")
+        return RequiresBuildEditableResult(hook_requirements(self.backend, cmd, result, out, err), out, err)
 
+    @_traced
     def prepare_metadata_for_build_wheel(
         self,
         metadata_directory: Path,
@@ -327,18 +508,21 @@ class Frontend(ABC):
         :return: metadata generation result
         """
         self._check_metadata_dir(metadata_directory)
-        basename: str | None = None
-        if self.optional_hooks["prepare_metadata_for_build_wheel"]:
-            basename, out, err = self._send(
-                cmd="prepare_metadata_for_build_wheel",
-                metadata_directory=metadata_directory,
-                config_settings=config_settings,
+        key = self._metadata_cache_key("prepare_metadata_for_build_wheel", config_settings)
+        cached = self._restore_metadata(key, metadata_directory)
+        if cached is not None:
+            return (
+                None
+                if cached.metadata is None
+                else MetadataForBuildWheelResult(cached.metadata, cached.out, cached.err)
             )
-        if basename is None:
-            return None
-        if not isinstance(basename, str):
-            self._unexpected_response("prepare_metadata_for_build_wheel", basename, str, out, err)
-        return MetadataForBuildWheelResult(metadata_directory / basename, out, err)
+        cmd = "prepare_metadata_for_build_wheel"
+        basename, out, err = self._send_optional(
+            cmd, metadata_directory=metadata_directory, config_settings=config_settings
+        ) or (None, "", "")
+        result = None if basename is None else metadata_directory / hook_basename(self.backend, cmd, basename, out, err)
+        self._store_metadata(key, result, out, err)
+        return None if result is None else MetadataForBuildWheelResult(result, out, err)
 
     def _check_metadata_dir(self, metadata_directory: Path) -> None:
         if metadata_directory == self._root:
@@ -348,6 +532,7 @@ class Frontend(ABC):
             ensure_empty_dir(metadata_directory)
         metadata_directory.mkdir(parents=True, exist_ok=True)
 
+    @_traced
     def prepare_metadata_for_build_editable(
         self,
         metadata_directory: Path,
@@ -361,20 +546,61 @@ class Frontend(ABC):
         :return: metadata generation result
         """
         self._check_metadata_dir(metadata_directory)
-        basename: str | None = None
-        if self.optional_hooks["prepare_metadata_for_build_editable"]:
-            basename, out, err = self._send(
-                cmd="prepare_metadata_for_build_editable",
-                metadata_directory=metadata_directory,
-                config_settings=config_settings,
+        key = self._metadata_cache_key("prepare_metadata_for_build_editable", config_settings)
+        cached = self._restore_metadata(key, metadata_directory)
+        if cached is not None:
+            return (
+                None
+                if cached.metadata is None
+                else MetadataForBuildEditableResult(cached.metadata, cached.out, cached.err)
             )
-        if basename is None:
+        cmd = "prepare_metadata_for_build_editable"
+        basename, out, err = self._send_optional(
+            cmd, metadata_directory=metadata_directory, config_settings=config_settings
+        ) or (None, "", "")
+        result = None if basename is None else metadata_directory / hook_basename(self.backend, cmd, basename, out, err)
+        self._store_metadata(key, result, out, err)
+        return None if result is None else MetadataForBuildEditableResult(result, out, err)
+
+    def _cache_key(
+        self, cache: MetadataCache | ArtifactCache, cmd: str, config_settings: ConfigSettings | None, *extra: str
+    ) -> str:
+        executable = getattr(self, "executable", sys.executable)
+        return build_key(
+            cmd,
+            config_settings,
+            source=fingerprint(self._root, cache.index_for(self._root)).digest,
+            root=self._root,
+            backend=self.backend,
+            backend_version=self._installed_backend_version(),
+            backend_paths=self._backend_paths,
+            requires=self.requires,
+            extra=(executable, *extra),
+        )
+
+    def _installed_backend_version(self) -> str:
+        """:return: version of the backend in the interpreter running it, empty if not known or in-tree"""
+        if self._backend_version is None:
+            top_level = self._backend_module.split(".")[0]
+            if any((p / top_level).is_dir() or (p / f"{top_level}.py").is_file() for p in self._backend_paths):
+                return ""  # the backend is part of the fingerprinted sources
+            # no backend reported the version of its package in the handshake, ask it to look up its distribution
+            self._backend_version = self._send("_backend_version")[0] or ""
+        return self._backend_version
+
+    def _metadata_cache_key(self, cmd: str, config_settings: ConfigSettings | None) -> str | None:
+        return None if self.metadata_cache is None else self._cache_key(self.metadata_cache, cmd, config_settings)
+
+    def _restore_metadata(self, key: str | None, metadata_directory: Path) -> CachedMetadata | None:
+        if key is None or self.metadata_cache is None:
             return None
-        if not isinstance(basename, str):
-            self._unexpected_response("prepare_metadata_for_build_wheel", basename, str, out, err)
-        result = metadata_directory / basename
-        return MetadataForBuildEditableResult(result, out, err)
+        return self.metadata_cache.restore(key, metadata_directory)
+
+    def _store_metadata(self, key: str | None, metadata: Path | None, out: str, err: str) -> None:
+        if key is not None and self.metadata_cache is not None:
+            self.metadata_cache.store(key, metadata, out, err)
 
+    @_traced
     def build_sdist(self, sdist_directory: Path, config_settings: ConfigSettings | None = None) -> SdistResult:
         """
         Build a source distribution (per PEP-517).
@@ -384,15 +610,20 @@ class Frontend(ABC):
         :return: source distribution build result
         """
         sdist_directory.mkdir(parents=True, exist_ok=True)
+        key = self._artifact_cache_key("build_sdist", config_settings)
+        cached = self._restore_artifact(key, sdist_directory)
+        if cached is not None:
+            return SdistResult(self._place_artifact(cached.artifact), cached.out, cached.err)
         basename, out, err = self._send(
             cmd="build_sdist",
             sdist_directory=sdist_directory,
             config_settings=config_settings,
         )
-        if not isinstance(basename, str):
-            self._unexpected_response("build_sdist", basename, str, out, err)
-        return SdistResult(sdist_directory / basename, out, err)
+        artifact = sdist_directory / hook_basename(self.backend, "build_sdist", basename, out, err)
+        self._store_artifact(key, artifact, out, err)
+        return SdistResult(self._place_artifact(artifact), out, err)
 
+    @_traced
     def build_wheel(
         self,
         wheel_directory: Path,
@@ -408,16 +639,21 @@ class Frontend(ABC):
         :return: wheel build result
         """
         wheel_directory.mkdir(parents=True, exist_ok=True)
+        key = self._artifact_cache_key("build_wheel", config_settings, metadata_directory)
+        cached = self._restore_artifact(key, wheel_directory)
+        if cached is not None:
+            return WheelResult(self._place_artifact(cached.artifact), cached.out, cached.err)
         basename, out, err = self._send(
             cmd="build_wheel",
             wheel_directory=wheel_directory,
             config_settings=config_settings,
             metadata_directory=metadata_directory,
         )
-        if not isinstance(basename, str):
-            self._unexpected_response("build_wheel", basename, str, out, err)
-        return WheelResult(wheel_directory / basename, out, err)
+        artifact = wheel_directory / hook_basename(self.backend, "build_wheel", basename, out, err)
+        self._store_artifact(key, artifact, out, err)
+        return WheelResult(self._place_artifact(artifact), out, err)
 
+    @_traced
     def build_editable(
         self,
         wheel_directory: Path,
@@ -433,27 +669,117 @@ class Frontend(ABC):
         :return: wheel build result
         """
         wheel_directory.mkdir(parents=True, exist_ok=True)
+        key = self._artifact_cache_key("build_editable", config_settings, metadata_directory)
+        cached = self._restore_artifact(key, wheel_directory)
+        if cached is not None:
+            return EditableResult(self._place_artifact(cached.artifact), cached.out, cached.err)
         basename, out, err = self._send(
             cmd="build_editable",
             wheel_directory=wheel_directory,
             config_settings=config_settings,
             metadata_directory=metadata_directory,
         )
-        if not isinstance(basename, str):
-            self._unexpected_response("build_editable", basename, str, out, err)
-        return EditableResult(wheel_directory / basename, out, err)
+        artifact = wheel_directory / hook_basename(self.backend, "build_editable", basename, out, err)
+        self._store_artifact(key, artifact, out, err)
+        return EditableResult(self._place_artifact(artifact), out, err)
+
+    def _artifact_cache_key(
+        self, cmd: str, config_settings: ConfigSettings | None, metadata_directory: Path | None = None
+    ) -> str | None:
+        if self.artifact_cache is None:
+            return None
+        # editable wheels point to the project, and wheels built for a metadata folder depend on its content
+        root = str(self._root) if cmd == "build_editable" else ""
+        metadata = "" if metadata_directory is None else fingerprint(metadata_directory).digest
+        tag = str(next(iter(sys_tags())))
+        return self._cache_key(self.artifact_cache, cmd, config_settings, tag, root, metadata)
+
+    def _restore_artifact(self, key: str | None, directory: Path) -> CachedArtifact | None:
+        if key is None or self.artifact_cache is None:
+            return None
+        return self.artifact_cache.restore(key, directory)
+
+    def _store_artifact(self, key: str | None, artifact: Path, out: str, err: str) -> None:
+        if key is not None and self.artifact_cache is not None:
+            self.artifact_cache.store(key, artifact, out, err)
+
+    def _place_artifact(self, artifact: Path) -> Path:
+        """:return: the artifact, once placed into the artifact targets (other than the folder it was built in)"""
+        if not _PLACE_ARTIFACTS.get():
+            return artifact
+        targets = [target for target in self.artifact_targets if target.resolve() != artifact.parent.resolve()]
+        self.last_placements = tuple(place_artifact(artifact, target) for target in targets)
+        return artifact
+
+    @_traced
+    def batch(self, calls: Sequence[tuple[str, dict[str, Any]]]) -> list[BatchResult]:
+        """
+        Run several hooks with a single request, one after the other in the same backend process.
+
+        A failing hook does not stop the hooks after it; optional hooks the backend lacks fail with ``MissingCommand``.
+
+        :param calls: the hooks to run, as pairs of the hook name and its keyword arguments
+        :return: the outcome of every hook, in the order of the calls
+        """
+        separator = f"pyproject-api-batch:{uuid4().hex}"
+        requests = [
+            {"cmd": cmd, "kwargs": {k: (str(v) if isinstance(v, Path) else v) for k, v in kwargs.items()}}
+            for cmd, kwargs in calls
+        ]
+        results, out, err = self._send("_batch", calls=requests, separator=separator)
+        # the backend prints the separator after each hook, anything after the last one is not output of a hook
+        outs, errs = ((text.split(f"{separator}\n") + [""] * len(results))[: len(results)] for text in (out, err))
+        outcome = []
+        for (cmd, _), result, hook_out, hook_err in zip(calls, results, outs, errs, strict=True):
+            if "return" in result:
+                if cmd == "_optional_hooks":
+                    self._optional_hooks = result["return"]
+                outcome.append(BatchResult(result["return"], hook_out, hook_err, None))
+            else:
+                outcome.append(BatchResult(None, hook_out, hook_err, BackendFailed(result, hook_out, hook_err)))
+        return outcome
 
-    def _unexpected_response(
+    @_traced
+    def acquire_metadata(
         self,
-        cmd: str,
-        got: Any,
-        expected_type: Any,
-        out: str,
-        err: str,
-    ) -> NoReturn:
-        msg = f"{cmd!r} on {self.backend!r} returned {got!r} but expected type {expected_type!r}"
-        raise BackendFailed({"code": None, "exc_type": TypeError.__name__, "exc_msg": msg}, out, err)
+        metadata_directory: Path,
+        target: Literal["wheel", "editable"] = "wheel",
+        config_settings: ConfigSettings | None = None,
+    ) -> MetadataResult:
+        """
+        Acquire wheel metadata with the cheapest strategy the backend allows.
 
+        The strategies, in order: the backend's prepare metadata hook; the ``PKG-INFO`` of a freshly built source
+        distribution, used only when it's core metadata 2.2 or later with no field marked ``Dynamic`` (per PEP-643), in
+        which case the folder holds only the ``METADATA`` file; and finally building the wheel.
+
+        :param metadata_directory: directory where to put the metadata
+        :param target: the type of wheel metadata to acquire
+        :param config_settings: config settings to pass in to the backend
+        :return: the metadata and the strategy that produced it
+        """
+        prepare = getattr(self, f"prepare_metadata_for_build_{target}")
+        prepared: MetadataForBuildWheelResult | MetadataForBuildEditableResult | None = prepare(
+            metadata_directory, config_settings
+        )
+        if prepared is not None:
+            return MetadataResult(prepared.metadata, prepared.out, prepared.err, "prepare_metadata")
+        with TemporaryDirectory() as sdist_directory, _artifacts_not_placed():
+            try:
+                sdist = self.build_sdist(Path(sdist_directory), config_settings)
+            except BackendFailed as exception:
+                out, err, metadata = exception.out, exception.err, None
+            else:
+                out, err, metadata = sdist.out, sdist.err, static_metadata(sdist.sdist)
+        if metadata is not None:
+            basename, content = metadata
+            (metadata_directory / basename).mkdir()
+            (metadata_directory / basename / "METADATA").write_bytes(content)
+            return MetadataResult(metadata_directory / basename, out, err, "sdist")
+        path, wheel_out, wheel_err = self.metadata_from_built(metadata_directory, target, config_settings)
+        return MetadataResult(path, f"{out}{wheel_out}", f"{err}{wheel_err}", "wheel")
+
+    @_traced
     def metadata_from_built(
         self,
         metadata_directory: Path,
@@ -469,22 +795,15 @@ class Frontend(ABC):
         :return:
         """
         hook = getattr(self, f"build_{target}")
-        with self._wheel_directory() as wheel_directory:
+        with self._wheel_directory() as wheel_directory, _artifacts_not_placed():
             result: EditableResult | WheelResult = hook(wheel_directory, config_settings)
             wheel = result.wheel
             if not wheel.exists():
                 msg = f"missing wheel file return by backed {wheel!r}"
                 raise RuntimeError(msg)
             out, err = result.out, result.err
-            extract_to = str(metadata_directory)
-            basename = None
-            with ZipFile(str(wheel), "r") as zip_file:
-                for name in zip_file.namelist():  # pragma: no branch
-                    root = Path(name).parts[0]
-                    if root.endswith(".dist-info"):
-                        basename = root
-                        zip_file.extract(name, extract_to)
-        if basename is None:  # pragma: no branch
+            basename = extract_dist_info(wheel, metadata_directory)
+        if basename is None:
             msg = f"no .dist-info found inside generated wheel {wheel}"
             raise RuntimeError(msg)
         return metadata_directory / basename, out, err
@@ -494,37 +813,207 @@ class Frontend(ABC):
         with TemporaryDirectory() as wheel_directory:
             yield Path(wheel_directory)
 
-    def _send(self, cmd: str, **kwargs: Any) -> tuple[Any, str, str]:
+    @contextmanager
+    def _result_file(self, cmd: str) -> Iterator[Path]:
+        if self._result_pipe:  # only used to identify the response, nothing is written to the file system
+            yield Path(f"pep517_{cmd}-{uuid4().hex}.json")
+            return
         with NamedTemporaryFile(prefix=f"pep517_{cmd}-") as result_file_marker:
-            result_file = Path(result_file_marker.name).with_suffix(".json")
-            msg = json.dumps(
-                {
-                    "cmd": cmd,
-                    "kwargs": {k: (str(v) if isinstance(v, Path) else v) for k, v in kwargs.items()},
-                    "result": str(result_file),
-                },
-            )
-            with self._send_msg(cmd, result_file, msg) as status:
-                while not status.done:  # pragma: no branch
-                    sleep(0.001)  # wait a bit for things to happen
-            if result_file.exists():
-                try:
-                    with result_file.open("rt") as result_handler:
-                        result = json.load(result_handler)
-                finally:
-                    result_file.unlink()
-            else:
-                result = {
-                    "code": 1,
-                    "exc_type": "RuntimeError",
-                    "exc_msg": f"Backend response file {result_file} is missing",
-                }
-        out, err = status.out_err()
-        if "return" in result:
-            return result["return"], out, err
-        raise BackendFailed(result, out, err)
+            yield Path(result_file_marker.name).with_suffix(".json")
+
+    def _send(self, cmd: str, **kwargs: Any) -> tuple[Any, str, str]:
+        config_settings = sorted(kwargs.get("config_settings") or {})
+        with self.tracer.span("send", cmd=cmd, backend=self.backend, config_settings=config_settings) as attributes:
+            start = monotonic()
+            with self._result_file(cmd) as result_file:
+                with self._send_msg(cmd, result_file, hook_request(cmd, result_file, kwargs)) as status:
+                    status.wait()
+                result = status.result()
+                if result is None:
+                    result = dict(_NO_RESULT_FRAME) if self._result_pipe else read_result_file(result_file)
+            result_read = monotonic()
+            out, err = status.out_err()
+            for listener in self._listeners:
+                if listener is not None and listener.error is not None:
+                    error, listener.error = listener.error, None
+                    raise error
+            out, info, self.last_timing = split_reports(out, start, status.spawn_start, result_read)
+            attributes.update(out_size=len(out), err_size=len(err), phases=self.last_timing.phases)
+            if info is not None:
+                self.backend_info = info
+                self._optional_hooks = self._optional_hooks or info.optional_hooks
+                if info.backend_version is not None:  # e.g. a backend restarted after an upgrade
+                    self._backend_version = info.backend_version
+            if "return" in result:
+                return result["return"], out, err
+            attributes["exc_type"] = result.get("exc_type")
+            raise BackendFailed(result, out, err)
+
+    @contextmanager
+    def stream_output(
+        self,
+        out: Callable[[str], None] | None = None,
+        err: Callable[[str], None] | None = None,
+    ) -> Iterator[None]:
+        """
+        Deliver the backend output line by line while the hooks called within the context run.
+
+        The results of the hooks still carry the output (within :attr:`output_limit`). The callbacks are called from the
+        threads collecting the output, so they should return quickly; an exception they raise is re-raised once the hook
+        finished.
+
+        :param out: called with each standard output line
+        :param err: called with each standard error line
+        """
+        previous = self._listeners
+        self._listeners = None if out is None else OutputListener(out), None if err is None else OutputListener(err)
+        try:
+            yield
+        finally:
+            self._listeners = previous
+
+    def _send_optional(self, cmd: str, **kwargs: Any) -> tuple[Any, str, str] | None:
+        """:return: the outcome of an optional hook, ``None`` if the backend does not implement it"""
+        if self._optional_hooks is not None:
+            return self._send(cmd, **kwargs) if supports(self._optional_hooks, cmd) else None
+        # the hooks are not known yet, send the hook and learn them from the handshake of the backend answering it
+        try:
+            return self._send(cmd, **kwargs)
+        except BackendFailed as exception:
+            if exception.exc_type == "MissingCommand" and not supports(self.optional_hooks, cmd):
+                return None
+            raise
 
     @abstractmethod
     @contextmanager
     def _send_msg(self, cmd: str, result_file: Path, msg: str) -> Iterator[CmdStatus]:
         raise NotImplementedError
+
+
+@contextmanager
+def _artifacts_not_placed() -> Iterator[None]:
+    """Keep the artifacts built within from the artifact targets, e.g. as they were built just for their metadata."""
+    token = _PLACE_ARTIFACTS.set(False)
+    try:
+        yield
+    finally:
+        _PLACE_ARTIFACTS.reset(token)
+
+
+def hook_request(cmd: str, result_file: Path, kwargs: dict[str, Any]) -> str:
+    """:return: the message asking the backend to run a hook and write its outcome to the result file"""
+    kwargs = {k: (str(v) if isinstance(v, Path) else v) for k, v in kwargs.items()}
+    return json.dumps({"cmd": cmd, "kwargs": kwargs, "result": str(result_file)})
+
+
+def read_result_file(result_file: Path) -> dict[str, Any]:
+    """:return: the outcome of a hook the backend wrote to the result file, removing the file"""
+    if not result_file.exists():
+        return {
+            "code": 1,
+            "exc_type": "RuntimeError",
+            "exc_msg": f"Backend response file {result_file} is missing",
+        }
+    try:
+        with result_file.open("rt", encoding=locale.getpreferredencoding(do_setlocale=False)) as result_handler:
+            return cast("dict[str, Any]", json.load(result_handler))
+    finally:
+        result_file.unlink()
+
+
+def supports(optional_hooks: OptionalHooks, cmd: str) -> bool:
+    """:return: whether the backend implements an optional hook"""
+    return cast("dict[str, bool]", optional_hooks)[cmd]
+
+
+def hook_requirements(backend: str, cmd: str, result: Any, out: str, err: str) -> tuple[Requirement, ...]:
+    """:return: the requirements a ``get_requires_for_build_*`` hook returned, validated"""
+    if not isinstance(result, list) or not all(isinstance(i, str) for i in result):
+        unexpected_response(backend, cmd, result, "list of string", out, err)
+    return tuple(Requirement(r) for r in cast("list[str]", result))
+
+
+def hook_basename(backend: str, cmd: str, basename: Any, out: str, err: str) -> str:
+    """:return: the name of the file or folder a hook built, validated"""
+    if not isinstance(basename, str):
+        unexpected_response(backend, cmd, basename, str, out, err)
+    return basename
+
+
+def unexpected_response(  # ruff:ignore[too-many-arguments, too-many-positional-arguments]
+    backend: str,
+    cmd: str,
+    got: Any,
+    expected_type: Any,
+    out: str,
+    err: str,
+) -> NoReturn:
+    """Fail the hook, as the backend returned something else than the hook specifies."""
+    msg = f"{cmd!r} on {backend!r} returned {got!r} but expected type {expected_type!r}"
+    raise BackendFailed({"code": None, "exc_type": TypeError.__name__, "exc_msg": msg}, out, err)
+
+
+def split_reports(
+    out: str, start: float, spawn_start: float | None, result_read: float
+) -> tuple[str, BackendInfo | None, HookTiming]:
+    """
+    Take the handshake and the timing the backend reported out of its output.
+
+    :param out: the backend output
+    :param start: when the frontend started sending the hook
+    :param spawn_start: when the frontend started the backend process, ``None`` if it was already running
+    :param result_read: when the frontend finished reading the result
+    :return: the backend output without the reports, the last handshake found in it and the timing of the hook
+    """
+    out, info = split_handshake(out)
+    out, timing = split_timing(out, start, spawn_start, result_read)
+    return out, info, timing
+
+
+def split_handshake(out: str) -> tuple[str, BackendInfo | None]:
+    """:return: the backend output without the handshake lines, and the last handshake found in it"""
+    if HANDSHAKE_PREFIX not in out:
+        return out, None
+    info, kept = None, []
+    for line in out.splitlines(keepends=True):
+        if line.startswith(HANDSHAKE_PREFIX):
+            handshake = json.loads(line[len(HANDSHAKE_PREFIX) :])
+            info = BackendInfo(handshake["optional_hooks"], handshake["backend_version"], handshake["python_version"])
+        else:
+            kept.append(line)
+    text = "".join(kept)
+    return (out.derive(text) if isinstance(out, CapturedOutput) else text), info
+
+
+def split_timing(out: str, start: float, spawn_start: float | None, result_read: float) -> tuple[str, HookTiming]:
+    """
+    Take the timing the backend reported out of its output.
+
+    :param out: the backend output
+    :param start: when the frontend started sending the hook
+    :param spawn_start: when the frontend started the backend process, ``None`` if it was already running
+    :param result_read: when the frontend finished reading the result
+    :return: the backend output without the timing lines, and the timing of the hook
+    """
+    reported: dict[str, float] = {}
+    if TIMING_PREFIX in out:
+        kept = []
+        for line in out.splitlines(keepends=True):
+            if line.startswith(TIMING_PREFIX):
+                reported = json.loads(line[len(TIMING_PREFIX) :])
+            else:
+                kept.append(line)
+        text = "".join(kept)
+        out = out.derive(text) if isinstance(out, CapturedOutput) else text
+    started = {} if spawn_start is None else reported  # the backend start of a running backend predates the hook
+    timing = HookTiming(
+        start,
+        spawn_start,
+        started.get("backend_start"),
+        started.get("backend_ready"),
+        reported.get("hook_start"),
+        reported.get("hook_end"),
+        reported.get("result_written"),
+        result_read,
+    )
+    return out, timing
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import weakref
+from collections import deque
+from itertools import chain
+from pathlib import Path
+from typing import NamedTuple
+
+from ._backend import HANDSHAKE_PREFIX, TIMING_PREFIX
+
+
+class OutputLimit(NamedTuple):
+    """How much of a backend output stream the result of a hook holds in memory."""
+
+    #: number of characters kept from the start of the output
+    head: int = 64 * 1024
+    #: number of characters kept from the end of the output
+    tail: int = 64 * 1024
+    #: folder the whole output is spilled into once it exceeds the limit, ``None`` for the temporary folder
+    directory: Path | None = None
+
+
+class _Spill:
+    """A temporary file holding a whole output stream, removed once nothing refers to it."""
+
+    def __init__(self, directory: Path | None) -> None:
+        if directory is not None:
+            directory.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(prefix="pyproject-api-", suffix=".log", dir=directory)
+        self.path = Path(name)
+        self.file = os.fdopen(fd, "w", encoding="utf-8")
+        weakref.finalize(self, self.path.unlink, missing_ok=True)
+
+
+class CapturedOutput(str):  # ruff:ignore[no-slots-in-str-subclass, subclass-builtin] # results hold the output as str
+    """
+    Backend output that exceeded its :class:`OutputLimit`.
+
+    The text is the head and the tail of the output; the whole output is kept in a file, removed once no captured output
+    refers to it anymore.
+    """
+
+    _spill: _Spill
+
+    def __new__(cls, text: str, spill: _Spill) -> CapturedOutput:  # ruff:ignore[non-self-return-type]
+        value = super().__new__(cls, text)
+        value._spill = spill
+        return value
+
+    @property
+    def path(self) -> Path:
+        """The file holding the whole output."""
+        return self._spill.path
+
+    def read(self) -> str:
+        """:return: the whole output, loaded from the file"""
+        return self._spill.path.read_text(encoding="utf-8")
+
+    def derive(self, text: str) -> CapturedOutput:
+        """
+        Create another text for the same output, e.g. with lines removed.
+
+        :param text: the new text
+        :return: the text, backed by the same file
+        """
+        return CapturedOutput(text, self._spill)
+
+
+class OutputCapture:
+    """
+    Collects the lines of a backend output stream, within an optional :class:`OutputLimit`.
+
+    The handshake and timing lines of the backend are always kept whole, as the frontend parses them from the output.
+    """
+
+    def __init__(self, limit: OutputLimit | None = None) -> None:
+        #: the limit applied to the lines appended from now on, ``None`` to keep them all in memory
+        self.limit = limit
+        self._protocol: list[str] = []
+        self._head: list[str] = []
+        self._tail: deque[str] = deque()
+        self._head_size = self._tail_size = self._dropped = 0
+        self._spill: _Spill | None = None
+
+    def append(self, line: str) -> None:
+        if self._spill is not None:
+            self._spill.file.write(line)
+        if line.startswith((HANDSHAKE_PREFIX, TIMING_PREFIX)):
+            self._protocol.append(line)
+            return
+        limit = self.limit
+        if not self._tail and (limit is None or self._head_size < limit.head):
+            part = line if limit is None else line[: limit.head - self._head_size]
+            self._head.append(part)
+            self._head_size += len(part)
+            line = line[len(part) :]
+            if not line:
+                return
+        self._tail.append(line)
+        self._tail_size += len(line)
+        if limit is None or self._tail_size <= limit.tail:
+            return
+        excess = self._tail_size - limit.tail
+        if self._spill is None:  # the first time content is dropped, keep all of it in the file
+            self._spill = _Spill(limit.directory)
+            self._spill.file.writelines(chain(self._protocol, self._head, self._tail))
+        self._tail_size -= excess
+        self._dropped += excess
+        while excess:
+            first = self._tail.popleft()
+            if len(first) > excess:
+                self._tail.appendleft(first[excess:])
+                break
+            excess -= len(first)
+
+    def finish(self) -> str:
+        """:return: the output collected, a :class:`CapturedOutput` if it exceeded the limit; then start over"""
+        head, tail = "".join(chain(self._protocol, self._head)), "".join(self._tail)
+        spill, dropped = self._spill, self._dropped
+        self._protocol, self._head, self._tail, self._spill = [], [], deque(), None
+        self._head_size = self._tail_size = self._dropped = 0
+        if spill is None:
+            return head + tail
+        spill.file.close()
+        return CapturedOutput(f"{head}\n[{dropped} characters not shown, see {spill.path}]\n{tail}", spill)
+
+
+__all__ = [
+    "CapturedOutput",
+    "OutputCapture",
+    "OutputLimit",
+]
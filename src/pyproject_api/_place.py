@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import sys
+from typing import TYPE_CHECKING, Literal, NamedTuple
+from uuid import uuid4
+
+if sys.platform == "win32":  # pragma: win32 cover
+    fcntl = None
+else:  # pragma: win32 no cover
+    import fcntl
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+#: the ``ioctl`` cloning a file on Linux (``_IOW(0x94, 9, int)``), exposed by :mod:`fcntl` from Python 3.12 on
+_FICLONE = getattr(fcntl, "FICLONE", 0x40049409)
+
+PlacementMethod = Literal["reflink", "hardlink", "copy_file_range", "copy"]
+
+
+class Placement(NamedTuple):
+    """An artifact placed into a folder."""
+
+    #: the placed artifact
+    path: Path
+    #: how it was placed: ``reflink`` shares the data of the original until either is modified (copy-on-write file
+    #: systems, such as Btrfs and XFS), ``hardlink`` is the same file under another name, ``copy_file_range`` copies
+    #: within the kernel (on Linux), ``copy`` reads and writes the content
+    method: PlacementMethod
+
+
+def place_artifact(artifact: Path, directory: Path, *, hardlink: bool = True) -> Placement:
+    """
+    Place a built artifact into another folder, without copying its content when the file system allows it.
+
+    The methods are tried in the order of :attr:`Placement.method`, the first one the file system supports is used. A
+    file of the same name in the folder is replaced atomically: concurrent readers see either the old or the new file.
+
+    :param artifact: the artifact to place
+    :param directory: the folder to place it into, created if missing
+    :param hardlink: allow hard links; disable it if either file may be modified in place later, as that changes both
+    :return: where and how the artifact was placed
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    staging = directory / f".{artifact.name}-{uuid4().hex}"
+    try:
+        method = _create(artifact, staging, hardlink=hardlink)
+    except OSError:
+        staging.unlink(missing_ok=True)
+        raise
+    target = directory / artifact.name
+    staging.replace(target)
+    return Placement(target, method)
+
+
+def _create(artifact: Path, staging: Path, *, hardlink: bool) -> PlacementMethod:
+    methods: list[tuple[PlacementMethod, Callable[[Path, Path], None]]] = [
+        ("reflink", _reflink),
+        ("hardlink", _hardlink),
+        ("copy_file_range", _copy_file_range),
+    ]
+    for method, create in methods:
+        if method == "hardlink" and not hardlink:
+            continue
+        try:
+            create(artifact, staging)
+        except OSError:
+            staging.unlink(missing_ok=True)
+        else:
+            return method
+    shutil.copy2(artifact, staging)
+    return "copy"
+
+
+def _reflink(source: Path, target: Path) -> None:
+    if fcntl is None:  # pragma: win32 cover
+        raise OSError(errno.EOPNOTSUPP, "reflinks are not available on Windows")
+    with source.open("rb") as src, target.open("xb") as dst:  # pragma: win32 no cover
+        fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+    shutil.copystat(source, target)  # pragma: win32 no cover
+
+
+def _hardlink(source: Path, target: Path) -> None:
+    target.hardlink_to(source)
+
+
+def _copy_file_range(source: Path, target: Path) -> None:
+    if not hasattr(os, "copy_file_range"):  # pragma: linux no cover
+        raise OSError(errno.ENOSYS, "copy_file_range is not available")
+    with source.open("rb") as src, target.open("xb") as dst:  # pragma: linux cover
+        while os.copy_file_range(src.fileno(), dst.fileno(), 1024 * 1024 * 1024):
+            pass
+    shutil.copystat(source, target)  # pragma: linux cover
+
+
+__all__ = [
+    "Placement",
+    "PlacementMethod",
+    "place_artifact",
+]
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Condition, Thread
+from time import monotonic
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+    from types import TracebackType
+
+    from ._via_persistent_subprocess import _BackendProcess
+
+
+class PoolKey(NamedTuple):
+    """Identifies backend processes that are interchangeable."""
+
+    #: the python interpreter running the backend
+    executable: str
+    #: the project root (the working directory of the backend)
+    root: Path
+    #: module where the backend is located
+    backend_module: str
+    #: object within the backend module identifying the backend
+    backend_obj: str | None
+    #: paths that are available on the python path for the backend
+    backend_paths: tuple[Path, ...]
+    #: the backend returns results on a pipe rather than through files
+    result_pipe: bool
+
+
+class PoolStats(NamedTuple):
+    """Counters of a backend pool."""
+
+    #: number of checkouts served by an already started backend
+    hits: int
+    #: number of checkouts that had to start a backend
+    misses: int
+    #: number of idle backends stopped due to the pool size limit or the idle timeout
+    evictions: int
+
+
+class _Idle(NamedTuple):
+    backend: _BackendProcess
+    since: float
+
+
+class BackendPool:
+    """
+    A pool of started backend processes, shared by :class:`PersistentSubprocessFrontend` instances.
+
+    Every backend is handed out once; when a backend is checked out a replacement for it is started in the background,
+    so that the next frontend for the same project finds a backend that already imported the build backend.
+    """
+
+    def __init__(self, max_workers: int = 8, idle_timeout: float | None = 300) -> None:
+        """
+        Create a backend pool.
+
+        :param max_workers: the maximum number of backends alive at once: idle, checked out and starting ones; when the
+            limit is reached idle backends of the least recently used keys are evicted first
+        :param idle_timeout: stop backends that were idle for this many seconds, ``None`` to keep them indefinitely
+        """
+        if max_workers < 1:
+            msg = f"max_workers must be at least 1, got {max_workers}"
+            raise ValueError(msg)
+        self.max_workers = max_workers
+        self.idle_timeout = idle_timeout
+        self._changed = Condition()
+        self._idle: OrderedDict[PoolKey, list[_Idle]] = OrderedDict()
+        self._pending: dict[PoolKey, Thread] = {}
+        self._checked_out: list[_BackendProcess] = []
+        self._reaper: Thread | None = None
+        self._closed = False
+        self._hits = self._misses = self._evictions = 0
+
+    def __enter__(self) -> BackendPool:  # ruff:ignore[non-self-return-type]
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def stats(self) -> PoolStats:
+        """Counters of the pool."""
+        with self._changed:
+            return PoolStats(self._hits, self._misses, self._evictions)
+
+    @property
+    def idle(self) -> int:
+        """Number of started backends waiting to be checked out."""
+        with self._changed:
+            return sum(len(i) for i in self._idle.values())
+
+    def checkout(self, key: PoolKey, start: Callable[[], _BackendProcess]) -> _BackendProcess:
+        """
+        Take a backend out of the pool, starting one if none is available.
+
+        :param key: the key identifying the backend
+        :param start: starts a backend for this key
+        :return: the backend, now owned by the caller
+        """
+        evicted: list[_BackendProcess] = []
+        backend: _BackendProcess | None = None
+        with self._changed:
+            if self._closed:
+                msg = "backend pool is closed"
+                raise RuntimeError(msg)
+            idle = self._idle.get(key, [])
+            while idle and backend is None:
+                candidate = idle.pop(0).backend
+                if candidate.alive:
+                    backend = candidate
+                else:  # died while idle, e.g. killed from outside
+                    self._evictions += 1
+                    evicted.append(candidate)
+            if not idle:  # pragma: no branch
+                self._idle.pop(key, None)
+            if backend is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._checked_out.append(backend)
+            evicted.extend(self._start_replacement(key, start, starting=backend is None))
+        _stop(evicted)
+        if backend is None:
+            backend = start()
+            with self._changed:
+                self._checked_out.append(backend)
+        return backend
+
+    def prewarm(self, key: PoolKey, start: Callable[[], _BackendProcess]) -> None:
+        """
+        Start a backend for a key in the background, so that a later checkout finds it ready.
+
+        Nothing is started if a backend for the key is already idle or starting, or if the pool is full of backends
+        that are not idle.
+
+        :param key: the key identifying the backend
+        :param start: starts a backend for this key
+        """
+        with self._changed:
+            if self._closed:
+                msg = "backend pool is closed"
+                raise RuntimeError(msg)
+            evicted = [] if self._idle.get(key) else self._start_replacement(key, start)
+        _stop(evicted)
+
+    def close(self) -> None:
+        """Stop all idle backends and the background threads of the pool."""
+        with self._changed:
+            self._closed = True
+            pending = list(self._pending.values())
+            self._changed.notify_all()
+        for thread in pending:
+            thread.join()
+        with self._changed:
+            backends = [i.backend for idles in self._idle.values() for i in idles]
+            self._idle.clear()
+            reaper, self._reaper = self._reaper, None
+        _stop(backends)
+        if reaper is not None:
+            reaper.join()
+
+    def _live(self) -> int:
+        self._checked_out = [backend for backend in self._checked_out if backend.alive]
+        idle = sum(len(i) for i in self._idle.values())
+        return idle + len(self._checked_out) + len(self._pending)
+
+    def _evict_lru(self, limit: int) -> list[_BackendProcess]:
+        """Evict idle backends, least recently used keys first, until at most ``limit`` backends are alive."""
+        evicted: list[_BackendProcess] = []
+        for lru_key in list(self._idle):
+            idles = self._idle[lru_key]
+            while idles and self._live() > limit:
+                evicted.append(idles.pop(0).backend)
+                self._evictions += 1
+            if not idles:
+                del self._idle[lru_key]
+        return evicted
+
+    def _start_replacement(
+        self, key: PoolKey, start: Callable[[], _BackendProcess], *, starting: bool = False
+    ) -> list[_BackendProcess]:
+        if key in self._pending:  # a replacement is already on its way
+            return []
+        # the replacement needs a free slot, and so does the backend the caller starts for a miss
+        limit = self.max_workers - (2 if starting else 1)
+        evicted = self._evict_lru(limit)
+        if self._live() > limit:  # every slot is taken by backends in use
+            return evicted
+        thread = Thread(
+            target=self._replace, args=(key, start), name=f"pyproject-api-pool-{key.root.name}", daemon=True
+        )
+        self._pending[key] = thread
+        thread.start()
+        if self.idle_timeout is not None and self._reaper is None:
+            self._reaper = Thread(
+                target=self._reap, args=(self.idle_timeout,), name="pyproject-api-pool-reaper", daemon=True
+            )
+            self._reaper.start()
+        return evicted
+
+    def _replace(self, key: PoolKey, start: Callable[[], _BackendProcess]) -> None:
+        try:
+            backend = start()
+        except OSError:  # pragma: no cover # the checkout will start (and fail) on its own
+            with self._changed:
+                del self._pending[key]
+            return
+        evicted: list[_BackendProcess] = []
+        with self._changed:
+            del self._pending[key]
+            if self._closed:
+                evicted.append(backend)
+            else:
+                self._idle.setdefault(key, []).append(_Idle(backend, monotonic()))
+                self._idle.move_to_end(key)
+                evicted.extend(self._evict_lru(self.max_workers))
+            self._changed.notify_all()
+        _stop(evicted)
+
+    def _reap(self, timeout: float) -> None:
+        while True:
+            evicted: list[_BackendProcess] = []
+            with self._changed:
+                if self._closed:
+                    return
+                now = monotonic()
+                for key in list(self._idle):
+                    idles = self._idle[key]
+                    while idles and now - idles[0].since >= timeout:
+                        evicted.append(idles.pop(0).backend)
+                        self._evictions += 1
+                    if not idles:
+                        del self._idle[key]
+                oldest = min((i[0].since for i in self._idle.values()), default=now)
+                if not evicted:
+                    self._changed.wait(timeout - (now - oldest))
+            _stop(evicted)
+
+
+def _stop(backends: list[_BackendProcess]) -> None:
+    for backend in backends:
+        backend.close(timeout=10)
+
+
+__all__ = [
+    "BackendPool",
+    "PoolKey",
+    "PoolStats",
+]
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import tarfile
+from email.parser import BytesParser
+from typing import IO, TYPE_CHECKING, cast
+
+from packaging.utils import canonicalize_name
+from packaging.version import InvalidVersion, Version
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+#: the first core metadata version where fields not marked ``Dynamic`` must match in wheels built from the sdist
+_STATIC_SINCE = Version("2.2")
+
+
+def static_metadata(sdist: Path) -> tuple[str, bytes] | None:
+    """
+    Read the core metadata of a source distribution, if the wheels built from it are guaranteed to carry the same.
+
+    That's the case when the metadata version is 2.2 or later and no field is marked ``Dynamic`` (per PEP-643).
+
+    :param sdist: the source distribution
+    :return: name of the ``.dist-info`` folder and content of its ``METADATA`` file, ``None`` if the metadata may change
+    """
+    content = _pkg_info(sdist)
+    if content is None:
+        return None
+    headers = BytesParser().parsebytes(content, headersonly=True)
+    try:
+        metadata_version = Version(headers.get("Metadata-Version", ""))
+        version = Version(headers.get("Version", ""))
+    except InvalidVersion:
+        return None
+    name = headers.get("Name", "")
+    if metadata_version < _STATIC_SINCE or headers.get_all("Dynamic") or not name:
+        return None
+    return f"{canonicalize_name(name).replace('-', '_')}-{version}.dist-info", content
+
+
+def _pkg_info(sdist: Path) -> bytes | None:
+    try:
+        with tarfile.open(sdist) as tar:
+            for member in tar:  # stops reading the archive once found
+                top, _, name = member.name.partition("/")
+                if name == "PKG-INFO" and top and member.isfile():
+                    return cast("IO[bytes]", tar.extractfile(member)).read()
+    except tarfile.TarError:  # e.g. a legacy zip source distribution
+        return None
+    return None
+
+
+__all__ = [
+    "static_metadata",
+]
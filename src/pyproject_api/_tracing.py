@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import count
+from time import perf_counter, time
+from typing import IO, TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+    from types import TracebackType
+
+#: identifier of the span the current code runs within
+_CURRENT: ContextVar[int | None] = ContextVar("pyproject_api_span", default=None)
+_IDS = count(1)
+
+
+class Span(NamedTuple):
+    """An operation of a frontend, once it finished."""
+
+    #: name of the operation, the hook or ``send`` for a request to the backend
+    name: str
+    #: identifier of the span, unique within the process
+    span_id: int
+    #: identifier of the span this one ran within, ``None`` for a root span
+    parent_id: int | None
+    #: when the operation started, in seconds since the epoch
+    start: float
+    #: how long the operation took, in seconds
+    duration: float
+    #: identifier of the process running the operation
+    process_id: int
+    #: native identifier of the thread running the operation
+    thread_id: int
+    #: what the operation was about, with ``outcome`` (``ok`` or the class name of the exception raised) added
+    attributes: dict[str, Any]
+
+
+class Tracer:
+    """
+    Receives spans around the operations of a frontend, see :attr:`Frontend.tracer`.
+
+    This base class ignores them, and is the default of the frontends. Subclasses override :meth:`span`.
+    """
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[dict[str, Any]]:  # ruff:ignore[no-self-use, unused-method-argument]
+        """
+        Trace an operation.
+
+        :param name: name of the operation
+        :param attributes: what the operation is about
+        :return: the attributes, the operation may add to them while running
+        """
+        yield attributes
+
+    def close(self) -> None:
+        """Flush and release what the tracer holds; spans ending afterward are lost."""
+
+    def __enter__(self) -> Tracer:  # ruff:ignore[non-self-return-type]
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class _FileTracer(Tracer, ABC):
+    """Writes the finished spans to a file, one span per write so that concurrent spans don't interleave."""
+
+    def __init__(self, path: Path, mode: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._file: IO[str] | None = path.open(mode, encoding="utf-8")
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[dict[str, Any]]:
+        span_id = next(_IDS)
+        token = _CURRENT.set(span_id)
+        start, began = time(), perf_counter()
+        try:
+            yield attributes
+        except BaseException as exception:
+            attributes["outcome"] = type(exception).__name__
+            raise
+        else:
+            attributes["outcome"] = "ok"
+        finally:
+            duration = perf_counter() - began
+            _CURRENT.reset(token)
+            span = Span(
+                name,
+                span_id,
+                _CURRENT.get(),
+                start,
+                duration,
+                os.getpid(),
+                threading.get_native_id(),
+                attributes,
+            )
+            with self._lock:
+                if self._file is not None:
+                    self._file.write(self._format(span))
+                    self._file.flush()
+
+    @abstractmethod
+    def _format(self, span: Span) -> str:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.write(self._footer())
+                self._file.close()
+                self._file = None
+
+    def _footer(self) -> str:  # ruff:ignore[no-self-use]
+        return ""
+
+
+class JsonLinesTracer(_FileTracer):
+    """Appends every span as a JSON object on its own line, processes may share the file."""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Create a JSON lines tracer.
+
+        :param path: the file to append to, created if missing
+        """
+        super().__init__(path, "a")
+
+    def _format(self, span: Span) -> str:  # ruff:ignore[no-self-use]
+        return f"{json.dumps(span._asdict(), default=str)}\n"
+
+
+class ChromeTraceTracer(_FileTracer):
+    """
+    Writes the spans in the trace event format, to view them as a timeline with ``chrome://tracing`` or Perfetto.
+
+    Spans of the same thread nest by their time; share one tracer between the frontends of a build to see all its
+    packages on the same timeline. The file is valid JSON once the tracer was closed, the viewers load it before too.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Create a trace event tracer.
+
+        :param path: the file to write, replaced if it exists
+        """
+        super().__init__(path, "w")
+        self._separator = "[\n"
+
+    def _format(self, span: Span) -> str:
+        event = {
+            "name": span.name,
+            "cat": "pyproject-api",
+            "ph": "X",  # a complete event, with its duration
+            "ts": span.start * 1_000_000,
+            "dur": span.duration * 1_000_000,
+            "pid": span.process_id,
+            "tid": span.thread_id,
+            "args": span.attributes,
+        }
+        content, self._separator = f"{self._separator}{json.dumps(event, default=str)}", ",\n"
+        return content
+
+    def _footer(self) -> str:
+        return "[]" if self._separator == "[\n" else "\n]\n"
+
+
+__all__ = [
+    "ChromeTraceTracer",
+    "JsonLinesTracer",
+    "Span",
+    "Tracer",
+]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from shutil import rmtree
 from typing import TYPE_CHECKING
 
@@ -22,6 +23,15 @@ def ensure_empty_dir(path: Path) -> None:
         path.mkdir(parents=True)
 
 
+def backend_env(backend_paths: tuple[Path, ...]) -> dict[str, str]:
+    env = os.environ.copy()
+    backend = os.pathsep.join(str(i) for i in backend_paths).strip()
+    if backend:
+        env["PYTHONPATH"] = backend
+    return env
+
+
 __all__ = [
+    "backend_env",
     "ensure_empty_dir",
 ]
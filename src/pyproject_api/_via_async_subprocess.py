@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import asyncio
+import locale
+import sys
+from asyncio.subprocess import PIPE
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from time import monotonic
+from typing import TYPE_CHECKING, Any, cast
+
+from ._frontend import (
+    BackendFailed,
+    BackendInfo,
+    EditableResult,
+    Frontend,
+    HookTiming,
+    MetadataForBuildEditableResult,
+    MetadataForBuildWheelResult,
+    OptionalHooks,
+    RequiresBuildEditableResult,
+    RequiresBuildSdistResult,
+    RequiresBuildWheelResult,
+    SdistResult,
+    WheelResult,
+    hook_basename,
+    hook_request,
+    hook_requirements,
+    read_result_file,
+    split_reports,
+    supports,
+)
+from ._util import backend_env, ensure_empty_dir
+
+if TYPE_CHECKING:
+    from packaging.requirements import Requirement
+
+    from ._frontend import ConfigSettings
+
+
+class AsyncFrontend:
+    """
+    A frontend whose hooks are coroutines; every call runs in a fresh backend subprocess driven by the event loop.
+
+    Output and results are collected with asynchronous pipe reads, so a single event loop can have many backend
+    conversations in flight without dedicating a thread to each of them. Create it from a project folder with:
+
+    .. code:: python
+
+        frontend = AsyncFrontend(*AsyncFrontend.create_args_from_folder(project_folder)[:-1])
+        wheel = await frontend.build_wheel(wheel_directory)
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        backend_paths: tuple[Path, ...],
+        backend_module: str,
+        backend_obj: str | None,
+        requires: tuple[Requirement, ...],
+    ) -> None:
+        """
+        Create an asyncio subprocess frontend.
+
+        :param root: the root path to the built project
+        :param backend_paths: paths that are available on the python path for the backend
+        :param backend_module: module where the backend is located
+        :param backend_obj: object within the backend module identifying the backend
+        :param requires: seed requirements for the backend
+        """
+        self._root = root
+        self._backend_paths = backend_paths
+        self._backend_module = backend_module
+        self._backend_obj = backend_obj
+        self.requires: tuple[Requirement, ...] = requires
+        self.executable = sys.executable
+        self._optional_hooks: OptionalHooks | None = None
+        self._optional_hooks_lock = asyncio.Lock()
+        #: what the backend reported about itself when it last started, ``None`` until a backend started
+        self.backend_info: BackendInfo | None = None
+        #: when the phases of the last hook that finished happened, ``None`` until a hook finished
+        self.last_timing: HookTiming | None = None
+
+    @staticmethod
+    def create_args_from_folder(
+        folder: Path,
+        cache_directory: Path | None = None,
+    ) -> tuple[Path, tuple[Path, ...], str, str | None, tuple[Requirement, ...], bool]:
+        """
+        Frontend creation arguments from a python project folder, see :meth:`Frontend.create_args_from_folder`.
+
+        :param folder: the python project folder
+        :param cache_directory: folder persisting the ``build-system`` tables across processes
+        :return: the frontend creation args
+        """
+        return Frontend.create_args_from_folder(folder, cache_directory)
+
+    @property
+    def backend(self) -> str:
+        """Backend key."""
+        return f"{self._backend_module}{f':{self._backend_obj}' if self._backend_obj else ''}"
+
+    @property
+    def backend_args(self) -> list[str]:
+        """Startup arguments for a backend."""
+        result: list[str] = [str(Path(__file__).parent / "_backend.py"), str(False), self._backend_module]
+        if self._backend_obj:
+            result.append(self._backend_obj)
+        return result
+
+    async def optional_hooks(self) -> OptionalHooks:
+        """:return: a dictionary indicating if the optional hook is supported or not"""
+        async with self._optional_hooks_lock:  # concurrent first calls share one request
+            if self._optional_hooks is None:  # pragma: no branch
+                result, _, __ = await self._send("_optional_hooks")
+                self._optional_hooks = result
+        return cast("OptionalHooks", self._optional_hooks)
+
+    async def get_requires_for_build_sdist(
+        self, config_settings: ConfigSettings | None = None
+    ) -> RequiresBuildSdistResult:
+        """
+        Get build requirements for a source distribution (per PEP-517).
+
+        :param config_settings: run arguments
+        :return: outcome
+        """
+        return RequiresBuildSdistResult(*await self._requires("get_requires_for_build_sdist", config_settings))
+
+    async def get_requires_for_build_wheel(
+        self, config_settings: ConfigSettings | None = None
+    ) -> RequiresBuildWheelResult:
+        """
+        Get build requirements for a wheel (per PEP-517).
+
+        :param config_settings: run arguments
+        :return: outcome
+        """
+        return RequiresBuildWheelResult(*await self._requires("get_requires_for_build_wheel", config_settings))
+
+    async def get_requires_for_build_editable(
+        self, config_settings: ConfigSettings | None = None
+    ) -> RequiresBuildEditableResult:
+        """
+        Get build requirements for an editable wheel build (per PEP-660).
+
+        :param config_settings: run arguments
+        :return: outcome
+        """
+        return RequiresBuildEditableResult(*await self._requires("get_requires_for_build_editable", config_settings))
+
+    async def prepare_metadata_for_build_wheel(
+        self, metadata_directory: Path, config_settings: ConfigSettings | None = None
+    ) -> MetadataForBuildWheelResult | None:
+        """
+        Build wheel metadata (per PEP-517).
+
+        :param metadata_directory: where to generate the metadata
+        :param config_settings: build arguments
+        :return: metadata generation result
+        """
+        result = await self._prepare_metadata("prepare_metadata_for_build_wheel", metadata_directory, config_settings)
+        return None if result is None else MetadataForBuildWheelResult(*result)
+
+    async def prepare_metadata_for_build_editable(
+        self, metadata_directory: Path, config_settings: ConfigSettings | None = None
+    ) -> MetadataForBuildEditableResult | None:
+        """
+        Build editable wheel metadata (per PEP-660).
+
+        :param metadata_directory: where to generate the metadata
+        :param config_settings: build arguments
+        :return: metadata generation result
+        """
+        cmd = "prepare_metadata_for_build_editable"
+        result = await self._prepare_metadata(cmd, metadata_directory, config_settings)
+        return None if result is None else MetadataForBuildEditableResult(*result)
+
+    async def build_sdist(self, sdist_directory: Path, config_settings: ConfigSettings | None = None) -> SdistResult:
+        """
+        Build a source distribution (per PEP-517).
+
+        :param sdist_directory: the folder where to build the source distribution
+        :param config_settings: build arguments
+        :return: source distribution build result
+        """
+        return SdistResult(*await self._build("build_sdist", "sdist_directory", sdist_directory, config_settings))
+
+    async def build_wheel(
+        self,
+        wheel_directory: Path,
+        config_settings: ConfigSettings | None = None,
+        metadata_directory: Path | None = None,
+    ) -> WheelResult:
+        """
+        Build a wheel file (per PEP-517).
+
+        :param wheel_directory: the folder where to build the wheel
+        :param config_settings: build arguments
+        :param metadata_directory: wheel metadata folder
+        :return: wheel build result
+        """
+        result = await self._build(
+            "build_wheel", "wheel_directory", wheel_directory, config_settings, metadata_directory=metadata_directory
+        )
+        return WheelResult(*result)
+
+    async def build_editable(
+        self,
+        wheel_directory: Path,
+        config_settings: ConfigSettings | None = None,
+        metadata_directory: Path | None = None,
+    ) -> EditableResult:
+        """
+        Build an editable wheel file (per PEP-660).
+
+        :param wheel_directory: the folder where to build the editable wheel
+        :param config_settings: build arguments
+        :param metadata_directory: wheel metadata folder
+        :return: wheel build result
+        """
+        result = await self._build(
+            "build_editable", "wheel_directory", wheel_directory, config_settings, metadata_directory=metadata_directory
+        )
+        return EditableResult(*result)
+
+    async def _requires(
+        self, cmd: str, config_settings: ConfigSettings | None
+    ) -> tuple[tuple[Requirement, ...], str, str]:
+        result, out, err = await self._send_optional(cmd, config_settings=config_settings) or ([], "", "")
+        return hook_requirements(self.backend, cmd, result, out, err), out, err
+
+    async def _prepare_metadata(
+        self, cmd: str, metadata_directory: Path, config_settings: ConfigSettings | None
+    ) -> tuple[Path, str, str] | None:
+        if metadata_directory == self._root:
+            msg = f"the project root and the metadata directory can't be the same {self._root}"
+            raise RuntimeError(msg)
+        ensure_empty_dir(metadata_directory)  # start with fresh
+        sent = await self._send_optional(cmd, metadata_directory=metadata_directory, config_settings=config_settings)
+        basename, out, err = sent or (None, "", "")
+        if basename is None:
+            return None
+        return metadata_directory / hook_basename(self.backend, cmd, basename, out, err), out, err
+
+    async def _build(
+        self, cmd: str, directory_arg: str, directory: Path, config_settings: ConfigSettings | None, **kwargs: Any
+    ) -> tuple[Path, str, str]:
+        directory.mkdir(parents=True, exist_ok=True)  # ruff:ignore[blocking-path-method-in-async-function]
+        kwargs[directory_arg] = directory
+        basename, out, err = await self._send(cmd, config_settings=config_settings, **kwargs)
+        return directory / hook_basename(self.backend, cmd, basename, out, err), out, err
+
+    async def _send_optional(self, cmd: str, **kwargs: Any) -> tuple[Any, str, str] | None:
+        if self._optional_hooks is not None:
+            return await self._send(cmd, **kwargs) if supports(self._optional_hooks, cmd) else None
+        # the hooks are not known yet, send the hook and learn them from the handshake of the backend answering it
+        try:
+            return await self._send(cmd, **kwargs)
+        except BackendFailed as exception:
+            if exception.exc_type == "MissingCommand" and not supports(await self.optional_hooks(), cmd):
+                return None
+            raise
+
+    async def _send(self, cmd: str, **kwargs: Any) -> tuple[Any, str, str]:
+        start = monotonic()
+        with NamedTemporaryFile(prefix=f"pep517_{cmd}-") as result_file_marker:
+            result_file = Path(result_file_marker.name).with_suffix(".json")
+            msg = hook_request(cmd, result_file, kwargs)
+            spawn_start = monotonic()
+            process = await asyncio.create_subprocess_exec(
+                self.executable,
+                *self.backend_args,
+                stdin=PIPE,
+                stdout=PIPE,
+                stderr=PIPE,
+                cwd=self._root,
+                env=backend_env(self._backend_paths),
+            )
+            try:
+                stdout, stderr = await process.communicate(f"{msg}\n".encode())
+            finally:
+                if process.returncode is None:  # cancelled while the backend was running
+                    process.kill()
+                    await process.wait()
+            result = read_result_file(result_file)
+        result_read = monotonic()
+        encoding = locale.getpreferredencoding(do_setlocale=False)
+        out, err = (data.decode(encoding).replace("\r\n", "\n") for data in (stdout, stderr))
+        out, info, self.last_timing = split_reports(out, start, spawn_start, result_read)
+        if info is not None:
+            self.backend_info = info
+            self._optional_hooks = self._optional_hooks or info.optional_hooks
+        if "return" in result:
+            return result["return"], out, err
+        raise BackendFailed(result, out, err)
+
+
+__all__ = ("AsyncFrontend",)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, Literal
+
+from ._fingerprint import stat_tree
+from ._via_persistent_subprocess import PersistentSubprocessFrontend
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from packaging.requirements import Requirement
+
+    from ._via_persistent_subprocess import _BackendProcess
+
+
+class ForkServerFrontend(PersistentSubprocessFrontend):
+    """
+    A frontend that imports the backend once, and runs every call in a process forked from it (Linux only).
+
+    Every hook starts from the state the backend had right after its import, isolated from the hooks before it as if
+    it ran in a fresh subprocess, at the cost of a fork instead of starting an interpreter and importing the backend.
+    """
+
+    def __init__(  # ruff:ignore[too-many-arguments, too-many-positional-arguments]
+        self,
+        root: Path,
+        backend_paths: tuple[Path, ...],
+        backend_module: str,
+        backend_obj: str | None,
+        requires: tuple[Requirement, ...],
+        result_transport: Literal["file", "pipe"] = "file",
+        prewarm: bool = False,  # ruff:ignore[boolean-type-hint-positional-argument, boolean-default-value-positional-argument]
+    ) -> None:
+        """
+        Create a fork server frontend.
+
+        The backend (the fork server) is started on the first call, and stays alive until :meth:`close` is called. It
+        is restarted when any file within the backend paths changed since its start, so that in-tree backends run the
+        current code; the paths are scanned (without reading the files) before every call.
+
+        :param root: the root path to the built project
+        :param backend_paths: paths that are available on the python path for the backend
+        :param backend_module: module where the backend is located
+        :param backend_obj: object within the backend module identifying the backend
+        :param requires: seed requirements for the backend
+        :param result_transport: how the backend returns results, see :class:`PersistentSubprocessFrontend`
+        :param prewarm: start the fork server right away, see :meth:`prewarm`
+        :raises RuntimeError: when not running on Linux
+        """
+        if sys.platform != "linux":
+            msg = f"the fork server frontend is only available on Linux, not on {sys.platform}"
+            raise RuntimeError(msg)
+        self._sources: list[dict[str, tuple[int, int, int]]] | None = None
+        super().__init__(
+            root,
+            backend_paths,
+            backend_module,
+            backend_obj,
+            requires,
+            result_transport=result_transport,
+            prewarm=prewarm,
+        )
+
+    def __enter__(self) -> ForkServerFrontend:  # ruff:ignore[non-self-return-type]
+        return self
+
+    @property
+    def backend_args(self) -> list[str]:
+        script, _, *rest = super().backend_args
+        return [script, "fork", *rest]
+
+    def _sources_now(self) -> list[dict[str, tuple[int, int, int]]]:
+        return [stat_tree(path) for path in self._backend_paths]
+
+    def _spawn_backend(self) -> _BackendProcess:
+        self._sources = self._sources_now()
+        return super()._spawn_backend()
+
+    def _outdated(self) -> bool:
+        return self._sources is not None and self._sources_now() != self._sources
+
+
+__all__ = ("ForkServerFrontend",)
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import json
 import os
 import sys
-from contextlib import contextmanager
+from contextlib import contextmanager, suppress
 from subprocess import PIPE, Popen  # ruff:ignore[suspicious-subprocess-import]
-from threading import Thread
-from typing import IO, TYPE_CHECKING, Any, cast
+from threading import Condition, Event, Thread
+from time import monotonic
+from typing import IO, TYPE_CHECKING, Any, Literal, cast
 
-from ._frontend import CmdStatus, Frontend
+from ._backend import REQUEST_FD_ENV, RESULT_FD_ENV, encode, read_frame, write_frame
+from ._frontend import CmdStatus, Frontend, OutputListener
+from ._output import OutputCapture
+from ._util import backend_env
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
@@ -15,16 +20,124 @@ if TYPE_CHECKING:
 
     from packaging.requirements import Requirement
 
+    from ._output import OutputLimit
+
+
+class ControlChannel(Thread):
+    """
+    Exchanges requests and responses with a backend as versioned, length-prefixed frames on a pair of pipes.
+
+    The frames keep the protocol out of the output streams of the backend: requests do not share stdin with anything,
+    and every response carries the marker (the message id) of the request it answers.
+    """
+
+    def __init__(self, changed: Condition | None = None, limit: int | None = None) -> None:
+        """
+        Create the pipes (the backend ends are to be passed on to it via :meth:`env` and :attr:`pass_fds`).
+
+        :param changed: condition to notify when a response arrives
+        :param limit: stop reading after this many responses, ``None`` to read until the backend closes the pipe
+        """
+        super().__init__(daemon=True)
+        self.read_fd, self.write_fd = os.pipe()
+        self.request_read_fd, self.request_write_fd = os.pipe()
+        self.changed = changed or Condition()
+        self.results: list[dict[str, Any]] = []
+        #: set (while holding ``changed``) once no more responses will arrive
+        self.finished = False
+        self._limit = limit
+
+    @property
+    def env(self) -> dict[str, str]:
+        return {RESULT_FD_ENV: str(self.write_fd), REQUEST_FD_ENV: str(self.request_read_fd)}
+
+    @property
+    def pass_fds(self) -> tuple[int, int]:
+        """The file descriptors the backend inherits."""
+        return self.write_fd, self.request_read_fd
+
+    def started(self) -> None:
+        """Mark the backend started: close our copy of its ends, and start reading responses."""
+        os.close(self.write_fd)
+        os.close(self.request_read_fd)
+        self.start()
+
+    def send(self, message: dict[str, Any]) -> None:
+        """
+        Send a request to the backend.
+
+        :param message: the request, with the marker identifying it
+        :raises OSError: if the backend closed the channel
+        """
+        write_frame(self.request_write_fd, encode(message))
+
+    def close_requests(self) -> None:
+        """Signal the backend that no more requests will arrive, it exits once it handled the ones sent."""
+        with suppress(OSError):
+            os.close(self.request_write_fd)
+
+    def run(self) -> None:
+        try:
+            while self._limit is None or len(self.results) < self._limit:
+                try:
+                    payload = read_frame(self.read_fd)
+                except ValueError:  # a frame this frontend can't read, treat it as the backend not responding
+                    payload = None
+                if payload is None:
+                    break
+                with self.changed:
+                    self.results.append(json.loads(payload))
+                    self.changed.notify_all()
+        finally:
+            os.close(self.read_fd)
+            with self.changed:
+                self.finished = True
+                self.changed.notify_all()
+
 
 class SubprocessCmdStatus(CmdStatus, Thread):
-    def __init__(self, process: Popen[str]) -> None:
+    def __init__(
+        self,
+        process: Popen[str],
+        channel: ControlChannel | None = None,
+        listeners: tuple[OutputListener | None, OutputListener | None] = (None, None),
+        output_limit: OutputLimit | None = None,
+    ) -> None:
         super().__init__()
         self.process = process
+        self._channel = channel
+        self._listeners = listeners
+        self._output_limit = output_limit
         self._out_err: tuple[str, str] | None = None
+        self._finished = Event()
         self.start()
 
     def run(self) -> None:
-        self._out_err = self.process.communicate()
+        try:
+            streamed = self._listeners != (None, None) or self._output_limit is not None
+            out_err = self._stream() if streamed else self.process.communicate()
+            if self._channel is not None:
+                self._channel.join()
+            self._out_err = out_err
+        finally:
+            self._finished.set()
+
+    def _stream(self) -> tuple[str, str]:
+        with suppress(OSError):  # the backend may have exited already
+            cast("IO[str]", self.process.stdin).close()
+        collected = OutputCapture(self._output_limit), OutputCapture(self._output_limit)
+        readers = [
+            Thread(target=_pump, args=(stream, into, listener), daemon=True)
+            for stream, into, listener in zip(
+                (self.process.stdout, self.process.stderr), collected, self._listeners, strict=True
+            )
+        ]
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join()
+        self.process.wait()
+        return collected[0].finish(), collected[1].finish()
 
     @property
     def done(self) -> bool:
@@ -33,20 +146,29 @@ class SubprocessCmdStatus(CmdStatus, Thread):
         # finished only once its output is actually there.
         return self._out_err is not None
 
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._finished.wait(timeout) and self.done
+
     def out_err(self) -> tuple[str, str]:
         return cast("tuple[str, str]", self._out_err)
 
+    def result(self) -> dict[str, Any] | None:
+        if self._channel is None:
+            return super().result()
+        return self._channel.results[0] if self._channel.results else None
+
 
 class SubprocessFrontend(Frontend):
     """A frontend that creates fresh subprocess at every call to communicate with the backend."""
 
-    def __init__(
+    def __init__(  # ruff:ignore[too-many-arguments, too-many-positional-arguments]
         self,
         root: Path,
         backend_paths: tuple[Path, ...],
         backend_module: str,
         backend_obj: str | None,
         requires: tuple[Requirement, ...],
+        result_transport: Literal["file", "pipe"] = "file",
     ) -> None:
         """
         Create a subprocess frontend.
@@ -56,16 +178,22 @@ class SubprocessFrontend(Frontend):
         :param backend_module: module where the backend is located
         :param backend_obj: object within the backend module identifying the backend
         :param requires: seed requirements for the backend
+        :param result_transport: how the backend returns results: ``file`` writes them to a temporary file, ``pipe``
+            exchanges the requests and results as frames on pipes inherited by the backend (not available on Windows,
+            where ``file`` is used); ``file`` is the fallback for backends that close or replace inherited file
+            descriptors
         """
         super().__init__(root, backend_paths, backend_module, backend_obj, requires, reuse_backend=False)
         self.executable = sys.executable
+        self._result_pipe = use_result_pipe(result_transport)
 
     @contextmanager
     def _send_msg(self, cmd: str, result_file: Path, msg: str) -> Iterator[SubprocessCmdStatus]:  # ruff:ignore[unused-method-argument]
-        env = os.environ.copy()
-        backend = os.pathsep.join(str(i) for i in self._backend_paths).strip()
-        if backend:
-            env["PYTHONPATH"] = backend
+        env = backend_env(self._backend_paths)
+        channel = ControlChannel(limit=1) if self._result_pipe else None
+        if channel is not None:
+            env.update(channel.env)
+        spawn_start = monotonic()
         process = Popen(
             args=[self.executable, *self.backend_args],
             stdout=PIPE,
@@ -74,9 +202,18 @@ class SubprocessFrontend(Frontend):
             universal_newlines=True,
             cwd=self._root,
             env=env,
+            pass_fds=() if channel is None else channel.pass_fds,
         )
-        cast("IO[str]", process.stdin).write(f"{os.linesep}{msg}{os.linesep}")
-        yield SubprocessCmdStatus(process)
+        if channel is None:
+            cast("IO[str]", process.stdin).write(f"{os.linesep}{msg}{os.linesep}")
+        else:
+            channel.started()
+            with suppress(OSError):  # the backend died, the status reports the missing response
+                channel.send(json.loads(msg))
+            channel.close_requests()
+        status = SubprocessCmdStatus(process, channel, self._listeners, self.output_limit)
+        status.spawn_start = spawn_start
+        yield status
 
     def send_cmd(self, cmd: str, **kwargs: Any) -> tuple[Any, str, str]:
         """
@@ -89,4 +226,19 @@ class SubprocessFrontend(Frontend):
         return self._send(cmd, **kwargs)
 
 
+def _pump(stream: IO[str], into: OutputCapture, listener: OutputListener | None) -> None:
+    for line in iter(stream.readline, ""):
+        into.append(line)
+        if listener is not None:
+            listener(line)
+    stream.close()
+
+
+def use_result_pipe(result_transport: Literal["file", "pipe"]) -> bool:
+    if result_transport not in {"file", "pipe"}:
+        msg = f"result_transport must be file or pipe, got {result_transport!r}"
+        raise ValueError(msg)
+    return result_transport == "pipe" and sys.platform != "win32"
+
+
 __all__ = ("SubprocessFrontend",)
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import json
+import sys
+from contextlib import contextmanager, suppress
+from subprocess import PIPE, Popen, TimeoutExpired  # ruff:ignore[suspicious-subprocess-import]
+from threading import Condition, Lock, Thread
+from time import monotonic
+from typing import IO, TYPE_CHECKING, Any, Literal, cast
+from uuid import uuid4
+
+from ._backend import DONE_MARKER_PREFIX
+from ._frontend import BackendFailed, CmdStatus, Frontend, OutputListener
+from ._output import OutputCapture
+from ._pool import PoolKey
+from ._util import backend_env
+from ._via_fresh_subprocess import ControlChannel, use_result_pipe
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+    from types import TracebackType
+
+    from packaging.requirements import Requirement
+
+    from ._output import OutputLimit
+    from ._pool import BackendPool
+
+
+class _BackendProcess:
+    """A long-running backend process, with threads that continuously drain its output streams."""
+
+    def __init__(self, args: list[str], cwd: Path, env: dict[str, str], result_pipe: bool = False) -> None:  # ruff:ignore[boolean-type-hint-positional-argument, boolean-default-value-positional-argument]
+        self.changed = Condition()
+        self.channel = ControlChannel(self.changed) if result_pipe else None
+        if self.channel is not None:
+            env.update(self.channel.env)
+        #: when the process was started, until the first request handled by it takes it over
+        self.spawn_start: float | None = monotonic()
+        self.process = Popen(
+            args=args,
+            stdout=PIPE,
+            stderr=PIPE,
+            stdin=PIPE,
+            universal_newlines=True,
+            cwd=cwd,
+            env=env,
+            pass_fds=() if self.channel is None else self.channel.pass_fds,
+        )
+        if self.channel is not None:
+            self.channel.started()
+        self._out = OutputCapture()
+        self._err = OutputCapture()
+        self._out_markers: set[str] = set()
+        self._err_markers: set[str] = set()
+        #: listeners of the standard output and standard error lines of the request being handled
+        self.listeners: tuple[OutputListener | None, OutputListener | None] = None, None
+        self._open_streams = 2
+        self._readers = [
+            Thread(target=self._drain, args=(self.process.stdout, self._out, self._out_markers, 0), daemon=True),
+            Thread(target=self._drain, args=(self.process.stderr, self._err, self._err_markers, 1), daemon=True),
+        ]
+        for reader in self._readers:
+            reader.start()
+
+    def _drain(self, stream: IO[str], into: OutputCapture, markers: set[str], index: int) -> None:
+        # the backend starts the done marker on a new line, so the newline before a marker is not part of the output:
+        # the last line is held back until the next one shows whether a marker follows it (an empty line is only passed
+        # to the listener then, the newline ending the output of a request is always passed to it)
+        pending = ""
+        for line in iter(stream.readline, ""):
+            marker = line.startswith(DONE_MARKER_PREFIX) and line.endswith("\n")
+            listener = self.listeners[index]
+            if listener is not None and not marker:
+                if pending == "\n":
+                    listener(pending)
+                if line != "\n":
+                    listener(line)
+            with self.changed:
+                if marker:
+                    markers.add(line[len(DONE_MARKER_PREFIX) : -1])
+                    pending = pending.removesuffix("\n")
+                into.append(pending)
+                pending = "" if marker else line
+                self.changed.notify_all()
+        self.process.wait()  # the stream ends when the process exits, make sure it's reaped before notifying
+        with self.changed:
+            into.append(pending)
+            self._open_streams -= 1
+            self.changed.notify_all()
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    @property
+    def exited(self) -> bool:
+        """Truthful when the process is gone and all its output was collected."""
+        pipe_done = self.channel is None or self.channel.finished
+        return self._open_streams == 0 and pipe_done and self.process.poll() is not None
+
+    def responded(self, marker: str) -> bool:
+        """:return: truthful once both output streams reported the request done, and its response arrived"""
+        if marker not in self._out_markers or marker not in self._err_markers:
+            return False
+        return self.channel is None or any(r.get("marker") == marker for r in self.channel.results)
+
+    def prepare(
+        self,
+        listeners: tuple[OutputListener | None, OutputListener | None],
+        output_limit: OutputLimit | None,
+    ) -> None:
+        """Set how the output of the next request is handled."""
+        with self.changed:
+            self.listeners = listeners
+            self._out.limit = self._err.limit = output_limit
+
+    def send(self, message: dict[str, Any]) -> None:
+        try:
+            if self.channel is not None:
+                self.channel.send(message)
+                return
+            stdin = cast("IO[str]", self.process.stdin)
+            stdin.write(f"{json.dumps(message)}\n")
+            stdin.flush()
+        except OSError:  # pragma: no cover # the backend died, the status will report it as finished
+            pass
+
+    def collect(self, marker: str) -> tuple[str, str, dict[str, Any] | None]:
+        """:return: the output and the in-band response of a request, clearing them"""
+        with self.changed:
+            out, err = self._out.finish(), self._err.finish()
+            self._out_markers.clear()
+            self._err_markers.clear()
+            self.listeners = None, None
+            result = None
+            if self.channel is not None:
+                results, self.channel.results[:] = list(self.channel.results), []
+                result = next((r for r in results if r.pop("marker", None) == marker), None)
+        return out, err, result
+
+    def close(self, timeout: float | None = None) -> None:
+        if self.channel is not None:
+            self.channel.close_requests()
+        with suppress(OSError):
+            cast("IO[str]", self.process.stdin).close()
+        try:
+            self.process.wait(timeout)
+        except TimeoutExpired:  # pragma: no cover # backend ignored the exit request
+            self.process.kill()
+            self.process.wait()
+        for reader in self._readers:
+            reader.join()
+        if self.channel is not None:
+            self.channel.join()
+        for stream in (self.process.stdout, self.process.stderr):
+            cast("IO[str]", stream).close()
+
+
+class PersistentCmdStatus(CmdStatus):
+    def __init__(self, backend: _BackendProcess, marker: str) -> None:
+        self._backend = backend
+        self._marker = marker
+        self._out_err: tuple[str, str] | None = None
+        self._result: dict[str, Any] | None = None
+
+    @property
+    def done(self) -> bool:
+        backend = self._backend
+        with backend.changed:
+            return backend.responded(self._marker) or backend.exited
+
+    def wait(self, timeout: float | None = None) -> bool:
+        backend = self._backend
+        with backend.changed:
+            return backend.changed.wait_for(lambda: backend.responded(self._marker) or backend.exited, timeout)
+
+    def collect(self) -> None:
+        out, err, self._result = self._backend.collect(self._marker)
+        self._out_err = out, err
+
+    def out_err(self) -> tuple[str, str]:
+        return cast("tuple[str, str]", self._out_err)
+
+    def result(self) -> dict[str, Any] | None:
+        return self._result
+
+
+class PersistentSubprocessFrontend(Frontend):
+    """A frontend that starts the backend once and sends every call to the same subprocess."""
+
+    def __init__(  # ruff:ignore[too-many-arguments, too-many-positional-arguments]
+        self,
+        root: Path,
+        backend_paths: tuple[Path, ...],
+        backend_module: str,
+        backend_obj: str | None,
+        requires: tuple[Requirement, ...],
+        pool: BackendPool | None = None,
+        result_transport: Literal["file", "pipe"] = "file",
+        prewarm: bool = False,  # ruff:ignore[boolean-type-hint-positional-argument, boolean-default-value-positional-argument]
+    ) -> None:
+        """
+        Create a persistent subprocess frontend.
+
+        The backend is started on the first call, and stays alive until :meth:`close` is called (or the frontend is
+        used as a context manager and exits). If the backend dies it will be restarted on the next call.
+
+        The backend handles one request at a time: hooks called concurrently on the frontend wait for each other, even
+        with the ``pipe`` transport matching results to requests. Hooks run one after the other in the single thread of
+        the backend, and their output is told apart only by the done marker ending it on the shared standard output and
+        error. To run hooks in parallel use a frontend per hook, sharing started backends through a ``pool``.
+
+        :param root: the root path to the built project
+        :param backend_paths: paths that are available on the python path for the backend
+        :param backend_module: module where the backend is located
+        :param backend_obj: object within the backend module identifying the backend
+        :param requires: seed requirements for the backend
+        :param pool: take already started backends from this pool instead of starting them on demand
+        :param result_transport: how the backend returns results: ``file`` writes them to a temporary file, ``pipe``
+            exchanges the requests and results as frames on pipes inherited by the backend (not available on Windows,
+            where ``file`` is used); ``file`` is the fallback for backends that close or replace inherited file
+            descriptors
+        :param prewarm: start the backend right away, see :meth:`prewarm`
+        """
+        super().__init__(root, backend_paths, backend_module, backend_obj, requires, reuse_backend=True)
+        self.executable = sys.executable
+        self._pool = pool
+        self._result_pipe = use_result_pipe(result_transport)
+        self._backend_process: _BackendProcess | None = None
+        self._lock = Lock()
+        if prewarm:
+            self.prewarm()
+
+    def __enter__(self) -> PersistentSubprocessFrontend:  # ruff:ignore[non-self-return-type]
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def pid(self) -> int | None:
+        """Process id of the running backend, ``None`` if no backend is running."""
+        backend = self._backend_process
+        return None if backend is None or not backend.alive else backend.process.pid
+
+    @property
+    def pool_key(self) -> PoolKey:
+        """Backends with the same key are interchangeable for this frontend."""
+        return PoolKey(
+            self.executable,
+            self._root,
+            self._backend_module,
+            self._backend_obj,
+            self._backend_paths,
+            self._result_pipe,
+        )
+
+    def _start_backend(self) -> _BackendProcess:
+        if self._pool is not None:
+            return self._pool.checkout(self.pool_key, self._spawn_backend)
+        return self._spawn_backend()
+
+    def _spawn_backend(self) -> _BackendProcess:
+        args = [self.executable, *self.backend_args]
+        return _BackendProcess(args, self._root, backend_env(self._backend_paths), self._result_pipe)
+
+    def _outdated(self) -> bool:  # ruff:ignore[no-self-use]
+        """:return: whether the running backend must be replaced before it handles the next hook"""
+        return False
+
+    def _running_backend(self, *, replace_outdated: bool) -> _BackendProcess:
+        """:return: the backend to send the next request to, started if none is running; call with the lock held"""
+        backend = self._backend_process
+        if backend is None or not backend.alive or (replace_outdated and self._outdated()):
+            if backend is not None:
+                backend.close()
+            backend = self._backend_process = self._start_backend()
+        return backend
+
+    def prewarm(self) -> None:
+        """
+        Start the backend in the background, so that it is ready (imported) by the time the first hook is called.
+
+        Returns once the backend process was started, without waiting for it to import the backend; the caller can
+        prepare the build environment in the meantime. A no-op if a backend is already running.
+        """
+        with self._lock:
+            self._running_backend(replace_outdated=True)
+
+    @contextmanager
+    def _send_msg(self, cmd: str, result_file: Path, msg: str) -> Iterator[PersistentCmdStatus]:  # ruff:ignore[unused-method-argument]
+        with self._lock:  # one request at a time, its output is what the backend prints until it echoes the marker
+            backend = self._running_backend(replace_outdated=cmd != "_exit")
+            # a marker unique to this request, echoed by the backend on stdout and stderr once it handled the request
+            marker = uuid4().hex
+            status = PersistentCmdStatus(backend, marker)
+            status.spawn_start, backend.spawn_start = backend.spawn_start, None
+            backend.prepare(self._listeners, self.output_limit)
+            backend.send({**json.loads(msg), "marker": marker})
+            try:
+                yield status
+            finally:
+                status.collect()
+
+    def send_cmd(self, cmd: str, **kwargs: Any) -> tuple[Any, str, str]:
+        """
+        Send a command to the backend.
+
+        :param cmd: the command to send
+        :param kwargs: keyword arguments to the backend
+        :return: a tuple of: backend response, standard output text, standard error text
+        """
+        return self._send(cmd, **kwargs)
+
+    def close(self) -> None:
+        """Ask the backend to exit and wait for it to do so; a no-op if no backend is running."""
+        backend = self._backend_process
+        if backend is None:
+            return
+        if backend.alive:
+            with suppress(BackendFailed):
+                self._send("_exit")
+        with self._lock:
+            backend.close(timeout=10)
+            self._backend_process = None
+
+
+__all__ = ("PersistentSubprocessFrontend",)
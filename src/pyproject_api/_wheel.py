@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import mmap
+import struct
+import zlib
+from pathlib import PurePosixPath
+from typing import TYPE_CHECKING
+from zipfile import BadZipFile, ZipFile
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_END = struct.Struct("<4s4H2LH")  # end of central directory record
+_CENTRAL = struct.Struct("<4s6H3L5H2L")  # central directory file header
+_LOCAL = struct.Struct("<4s5H3L2H")  # local file header
+_END_SIGNATURE, _CENTRAL_SIGNATURE, _LOCAL_SIGNATURE = b"PK\x05\x06", b"PK\x01\x02", b"PK\x03\x04"
+_ZIP64, _ZIP64_ENTRIES = 0xFFFFFFFF, 0xFFFF
+_STORED, _DEFLATED = 0, 8
+_ENCRYPTED, _UTF8 = 0x1, 0x800
+
+
+def extract_dist_info(wheel: Path, directory: Path) -> str | None:
+    """
+    Extract the ``.dist-info`` folder of a wheel.
+
+    The folder is located from the central directory of the archive, and only its members are decompressed; archives
+    using features beyond what wheels need (zip64, other compressions, encryption) are handed to :mod:`zipfile`.
+
+    :param wheel: the wheel
+    :param directory: folder to extract into
+    :return: name of the extracted folder, ``None`` if the wheel has none
+    """
+    with wheel.open("rb") as file_handler:
+        try:
+            data = mmap.mmap(file_handler.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # e.g. an empty file can't be mapped
+            members = None
+        else:
+            with data:
+                members = _read_dist_info(data)
+    if members is None:
+        return _extract_with_zipfile(wheel, directory)
+    basename = None
+    for name, content in members:
+        basename = name.partition("/")[0]
+        target = directory / name
+        if name.endswith("/"):
+            target.mkdir(parents=True, exist_ok=True)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(content)
+    return basename
+
+
+def _read_dist_info(data: mmap.mmap) -> list[tuple[str, bytes]] | None:
+    """:return: the name and content of the ``.dist-info`` members, ``None`` if the archive needs :mod:`zipfile`"""
+    end = data.rfind(_END_SIGNATURE, max(0, len(data) - _END.size - 0xFFFF))
+    if end == -1 or len(data) - end < _END.size:
+        return None
+    *_, entries, size, offset, __ = _END.unpack_from(data, end)
+    if entries == _ZIP64_ENTRIES or offset == _ZIP64:
+        return None
+    central = data[offset : offset + size]
+    members: list[tuple[str, bytes]] = []
+    at = 0
+    for _ in range(entries):
+        if central[at : at + 4] != _CENTRAL_SIGNATURE:  # e.g. the archive is prefixed by other content
+            return None
+        name_size, extra_size, comment_size = struct.unpack_from("<3H", central, at + 28)
+        raw_name = central[at + _CENTRAL.size : at + _CENTRAL.size + name_size]
+        if raw_name.partition(b"/")[0].endswith(b".dist-info"):
+            header = _CENTRAL.unpack_from(central, at)
+            content = _read_member(data, header, raw_name)
+            if content is None:
+                return None
+            members.append(content)
+        at += _CENTRAL.size + name_size + extra_size + comment_size
+    return members
+
+
+def _read_member(data: mmap.mmap, header: tuple[int, ...], raw_name: bytes) -> tuple[str, bytes] | None:
+    flags, method, crc, compressed_size, size, offset = *header[3:5], *header[7:10], header[16]
+    name = raw_name.decode("utf-8" if flags & _UTF8 else "cp437")
+    if (
+        flags & _ENCRYPTED
+        or method not in {_STORED, _DEFLATED}
+        or _ZIP64 in {compressed_size, size, offset}
+        or not _safe(name)
+        or data[offset : offset + 4] != _LOCAL_SIGNATURE
+    ):
+        return None
+    name_size, extra_size = _LOCAL.unpack_from(data, offset)[-2:]
+    start = offset + _LOCAL.size + name_size + extra_size
+    raw = data[start : start + compressed_size]
+    content = raw if method == _STORED else zlib.decompress(raw, -zlib.MAX_WBITS)
+    if zlib.crc32(content) != crc:
+        msg = f"Bad CRC-32 for file {name!r}"
+        raise BadZipFile(msg)
+    return name, content
+
+
+def _safe(name: str) -> bool:
+    """:return: truthful if the member stays within the folder it's extracted into"""
+    path = PurePosixPath(name)
+    return not path.is_absolute() and ".." not in path.parts and "\\" not in name
+
+
+def _extract_with_zipfile(wheel: Path, directory: Path) -> str | None:
+    basename = None
+    with ZipFile(wheel, "r") as zip_file:
+        for name in zip_file.namelist():
+            root = name.partition("/")[0]
+            if root.endswith(".dist-info"):
+                basename = root
+                zip_file.extract(name, directory)
+    return basename
+
+
+__all__ = [
+    "extract_dist_info",
+]
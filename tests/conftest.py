@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from pathlib import Path
+from textwrap import dedent
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+@pytest.fixture(scope="session")
+def demo_pkg_inline() -> Path:
+    return Path(__file__).absolute().parent / "demo_pkg_inline"
+
+
+@pytest.fixture
+def local_builder(tmp_path: Path) -> Callable[[str], Path]:
+    def _f(content: str) -> Path:
+        toml = '[build-system]\nrequires=[]\nbuild-backend = "build_tester"\nbackend-path=["."]'
+        (tmp_path / "pyproject.toml").write_text(toml)
+        (tmp_path / "build_tester.py").write_text(dedent(content))
+        return tmp_path
+
+    return _f
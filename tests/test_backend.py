@@ -2,11 +2,25 @@ from __future__ import annotations
 
 import json
 import os
+import platform
+from importlib.metadata import version
 from typing import TYPE_CHECKING, Any
 
+import pluggy
 import pytest
 
-from pyproject_api._backend import BackendProxy, read_line, run
+from pyproject_api._backend import (
+    HANDSHAKE_PREFIX,
+    REQUEST_FD_ENV,
+    RESULT_FD_ENV,
+    TIMING_PREFIX,
+    BackendProxy,
+    encode,
+    read_frame,
+    read_line,
+    run,
+    write_frame,
+)
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -60,6 +74,8 @@ def test_exception(mocker: pytest_mock.MockerFixture, capsys: pytest.CaptureFixt
     assert "Backend: run command dummy_command with args {'foo': 'bar'}" in captured.out
     assert "Backend: Wrote response " in captured.out
     assert "SystemExit: 1" in captured.err
+    timing = json.loads(captured.out.split(TIMING_PREFIX)[1].splitlines()[0])
+    assert timing["hook_start"] <= timing["hook_end"] <= timing["result_written"]  # a raising hook is timed too
 
 
 def test_valid_request(mocker: pytest_mock.MockerFixture, capsys: pytest.CaptureFixture[str], tmp_path: Path) -> None:
@@ -162,3 +178,250 @@ def test_read_line_eof_at_the_beginning() -> None:
             read_line(fd=r)
     finally:
         os.close(r)
+
+
+def test_read_line_keeps_leftover_between_calls() -> None:
+    r, w = os.pipe()
+    try:
+        os.write(w, b"first\r\nsecond\nthi")
+        assert read_line(fd=r) == bytearray(b"first")
+        os.write(w, b"rd\n")
+        os.close(w)
+        assert read_line(fd=r) == bytearray(b"second")
+        assert read_line(fd=r) == bytearray(b"third")
+        with pytest.raises(EOFError):
+            read_line(fd=r)
+    finally:
+        os.close(r)
+
+
+def test_run_large_messages_throughput(mocker: pytest_mock.MockerFixture, tmp_path: Path) -> None:
+    settings = {"--opt": "x" * 100_000}
+    messages = [
+        {"cmd": "build_wheel", "kwargs": {"config_settings": settings}, "result": str(tmp_path / f"r{at}")}
+        for at in range(200)
+    ]
+    messages.append({"cmd": "_exit", "kwargs": {}, "result": str(tmp_path / "exit")})
+    requests = tmp_path / "requests"
+    requests.write_bytes(b"".join(f"{json.dumps(m)}\r\n".encode() for m in messages))
+    backend_proxy = mocker.MagicMock(spec=BackendProxy)
+    backend_proxy.return_value = "dummy-result"
+    mocker.patch("pyproject_api._backend.BackendProxy", return_value=backend_proxy)
+    fd = os.open(requests, os.O_RDONLY)
+    try:
+        mocker.patch("pyproject_api._backend.read_line", side_effect=lambda: read_line(fd))
+        read = mocker.spy(os, "read")
+        assert run([str(True), "a.dummy.module"]) == 0
+    finally:
+        os.close(fd)
+
+    assert backend_proxy.call_count == len(messages)
+    assert backend_proxy.call_args_list[0].kwargs == {"config_settings": settings}
+    assert json.loads((tmp_path / "r199").read_text()) == {"return": "dummy-result"}
+    # read in chunks, not byte by byte
+    assert read.call_count <= requests.stat().st_size // (64 * 1024) + 2
+
+
+def test_frame_round_trip() -> None:
+    r, w = os.pipe()
+    try:
+        write_frame(w, b'{"return": 1}')
+        write_frame(w, b"")
+        os.close(w)
+        assert read_frame(r) == b'{"return": 1}'
+        assert read_frame(r) == b""
+        assert read_frame(r) is None
+    finally:
+        os.close(r)
+
+
+def test_frame_truncated() -> None:
+    r, w = os.pipe()
+    try:
+        os.write(w, b"\x01\x00\x00\x00\x05ab")
+        os.close(w)
+        assert read_frame(r) is None
+    finally:
+        os.close(r)
+
+
+def test_frame_other_version() -> None:
+    r, w = os.pipe()
+    try:
+        os.write(w, b"\x02\x00\x00\x00\x02{}")
+        with pytest.raises(ValueError, match="frame of protocol version 2, expected 1"):
+            read_frame(r)
+    finally:
+        os.close(r)
+        os.close(w)
+
+
+def test_requests_on_fd(mocker: pytest_mock.MockerFixture, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    backend_proxy = mocker.MagicMock(spec=BackendProxy)
+    backend_proxy.return_value = "dummy-result"
+    mocker.patch("pyproject_api._backend.BackendProxy", return_value=backend_proxy)
+    read_line = mocker.patch("pyproject_api._backend.read_line", side_effect=AssertionError)
+    request_r, request_w = os.pipe()
+    result_r, result_w = os.pipe()
+    monkeypatch.setenv(REQUEST_FD_ENV, str(request_r))
+    monkeypatch.setenv(RESULT_FD_ENV, str(result_w))
+    try:
+        for marker in ("first", "second"):
+            request = {"cmd": "dummy_command", "kwargs": {}, "result": str(tmp_path / marker), "marker": marker}
+            write_frame(request_w, encode(request))
+        os.close(request_w)
+
+        assert run([str(True), "a.dummy.module"]) == 0  # exits once the frontend closed the channel
+
+        os.close(result_w)
+        results = [json.loads(read_frame(result_r) or b"") for _ in range(2)]
+        assert read_frame(result_r) is None
+    finally:
+        os.close(request_r)
+        os.close(result_r)
+    assert results == [{"return": "dummy-result", "marker": "first"}, {"return": "dummy-result", "marker": "second"}]
+    assert backend_proxy.call_count == 2
+    assert not read_line.called
+    assert REQUEST_FD_ENV not in os.environ
+
+
+def test_frame_compact() -> None:
+    assert encode({"a": [1, 2]}) == b'{"a":[1,2]}'
+
+
+def test_result_on_fd(
+    mocker: pytest_mock.MockerFixture,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    tmp_path: Path,
+) -> None:
+    result_file = tmp_path / "result"
+    command = json.dumps({"cmd": "dummy_command", "kwargs": {}, "result": str(result_file)})
+    backend_proxy = mocker.MagicMock(spec=BackendProxy)
+    backend_proxy.return_value = "dummy-result"
+    mocker.patch("pyproject_api._backend.BackendProxy", return_value=backend_proxy)
+    mocker.patch("pyproject_api._backend.read_line", return_value=bytearray(command, "utf-8"))
+    r, w = os.pipe()
+    monkeypatch.setenv(RESULT_FD_ENV, str(w))
+    try:
+        assert run([str(False), "a.dummy.module"]) == 0
+        os.close(w)
+        assert json.loads(read_frame(r) or b"") == {"return": "dummy-result"}
+    finally:
+        os.close(r)
+    assert RESULT_FD_ENV not in os.environ
+    assert not result_file.exists()
+    assert f"Backend: Wrote response {{'return': 'dummy-result'}} to {result_file}" in capsys.readouterr().out
+
+
+def test_batch(capsys: pytest.CaptureFixture[str]) -> None:
+    class Backend:
+        @staticmethod
+        def get_requires_for_build_wheel(config_settings: Any = None) -> list[str]:
+            return ["a"] if config_settings is None else []
+
+    proxy = BackendProxy.__new__(BackendProxy)
+    proxy.backend = Backend()
+    calls = [
+        {"cmd": "get_requires_for_build_wheel", "kwargs": {}},
+        {"cmd": "prepare_metadata_for_build_wheel", "kwargs": {}},
+    ]
+
+    results = proxy("_batch", calls=calls, separator="--sep--")
+
+    assert results == [
+        {"return": ["a"]},
+        {"code": 1, "exc_type": "MissingCommand", "exc_msg": results[1]["exc_msg"]},
+    ]
+    captured = capsys.readouterr()
+    assert captured.out.count("--sep--\n") == 2
+    assert captured.err == "--sep--\n--sep--\n"
+
+
+@pytest.mark.parametrize(
+    ("module", "expected"),
+    [
+        pytest.param("pluggy", pluggy.__version__, id="module-version"),
+        pytest.param("iniconfig", version("iniconfig"), id="distribution-version"),
+        pytest.param("in_tree_backend", None, id="in-tree"),
+    ],
+)
+def test_backend_version(module: str, expected: str | None, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "in_tree_backend.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    assert BackendProxy(module, None)._backend_version() == expected  # ruff:ignore[private-member-access]
+
+
+@pytest.mark.parametrize(
+    ("module", "expected"),
+    [
+        pytest.param("pluggy", pluggy.__version__, id="module-version"),
+        pytest.param("iniconfig", None, id="distribution-not-looked-up"),
+    ],
+)
+def test_run_prints_handshake(
+    mocker: pytest_mock.MockerFixture,
+    capsys: pytest.CaptureFixture[str],
+    tmp_path: Path,
+    module: str,
+    expected: str | None,
+) -> None:
+    command = json.dumps({"cmd": "_exit", "kwargs": {}, "result": str(tmp_path / "result")})
+    mocker.patch("pyproject_api._backend.read_line", return_value=bytearray(command, "utf-8"))
+
+    assert run([str(False), module]) == 0
+
+    lines = [line for line in capsys.readouterr().out.splitlines() if line.startswith(HANDSHAKE_PREFIX)]
+    assert len(lines) == 1
+    handshake = json.loads(lines[0][len(HANDSHAKE_PREFIX) :])
+    assert handshake["backend_version"] == expected
+    assert handshake["python_version"] == platform.python_version()
+    assert handshake["optional_hooks"]["build_editable"] is False
+
+
+def test_run_prints_timing(
+    mocker: pytest_mock.MockerFixture, capsys: pytest.CaptureFixture[str], tmp_path: Path
+) -> None:
+    command = json.dumps({"cmd": "_exit", "kwargs": {}, "result": str(tmp_path / "result"), "marker": "m"})
+    mocker.patch("pyproject_api._backend.read_line", return_value=bytearray(command, "utf-8"))
+
+    assert run([str(False), "iniconfig"]) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    timing_line = next(i for i, line in enumerate(lines) if line.startswith(TIMING_PREFIX))
+    assert lines[timing_line + 1 :] == ["", "pyproject-api-done:m"]  # the marker starts on a new line
+    timing = json.loads(lines[timing_line][len(TIMING_PREFIX) :])
+    keys = ["backend_start", "backend_ready", "hook_start", "hook_end", "result_written"]
+    assert list(timing) == keys
+    assert [timing[k] for k in keys] == sorted(timing.values())
+
+
+@pytest.mark.parametrize("code", [0, 3])
+def test_run_fork(
+    mocker: pytest_mock.MockerFixture, capsys: pytest.CaptureFixture[str], tmp_path: Path, code: int
+) -> None:
+    result = tmp_path / "result"
+    requests = [
+        {"cmd": "get_requires_for_build_wheel", "kwargs": {}, "result": str(result), "marker": "hook"},
+        {"cmd": "_exit", "kwargs": {}, "result": str(tmp_path / "exit"), "marker": "exit"},
+    ]
+    mocker.patch(
+        "pyproject_api._backend.read_line",
+        side_effect=[bytearray(json.dumps(request), "utf-8") for request in requests],
+    )
+    fork = mocker.patch("pyproject_api._backend.os.fork", return_value=4321)  # the child is the code path not taken
+    waitpid = mocker.patch("pyproject_api._backend.os.waitpid", return_value=(4321, code << 8))
+
+    assert run(["fork", "iniconfig"]) == 0
+
+    fork.assert_called_once_with()  # the exit request is handled by the server itself
+    waitpid.assert_called_once_with(4321, 0)
+    captured = capsys.readouterr()
+    assert captured.out.splitlines()[-1] == "pyproject-api-done:exit"
+    assert json.loads((tmp_path / "exit").read_text()) == {"return": 0}
+    if code:  # the child died without responding, the server responds on its behalf
+        msg = "backend process 4321 handling the request exited with 3"
+        assert json.loads(result.read_text()) == {"code": 3, "exc_type": "ChildProcessError", "exc_msg": msg}
+        assert msg in captured.err
+    else:
+        assert not result.exists()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pyproject_api import Frontend
+from pyproject_api import _build_system as build_system_module
+from pyproject_api._build_system import BuildSystem, read_build_system, requirements
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from unittest.mock import MagicMock
+
+    import pytest_mock
+
+_TOML = '[build-system]\nrequires = ["setuptools>=61", "wheel"]\nbuild-backend = "setuptools.build_meta"\n'
+
+
+@pytest.fixture(autouse=True)
+def forget(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(build_system_module, "_READ", {})
+
+
+@pytest.fixture
+def load(mocker: pytest_mock.MockerFixture) -> MagicMock:
+    return mocker.spy(build_system_module.tomllib, "load")
+
+
+def _write(folder: Path, content: str, *, old: bool = True) -> Path:
+    py_project_toml = folder / "pyproject.toml"
+    py_project_toml.write_text(content)
+    if old:
+        os.utime(py_project_toml, ns=(1_000_000_000, 1_000_000_000))
+    return py_project_toml
+
+
+def test_read_build_system_memoized(tmp_path: Path, load: MagicMock) -> None:
+    py_project_toml = _write(tmp_path, _TOML)
+    expected = BuildSystem(("setuptools>=61", "wheel"), "setuptools.build_meta", None)
+    assert read_build_system(py_project_toml) == expected
+    assert read_build_system(py_project_toml) == expected
+    assert load.call_count == 1
+
+    _write(tmp_path, '[build-system]\nbackend-path = ["."]\n')
+    assert read_build_system(py_project_toml) == BuildSystem(None, None, (".",))
+    assert load.call_count == 2
+
+
+def test_read_build_system_recent_not_memoized(tmp_path: Path, load: MagicMock) -> None:
+    py_project_toml = _write(tmp_path, _TOML, old=False)
+    read_build_system(py_project_toml)
+    read_build_system(py_project_toml)
+    assert load.call_count == 2
+
+
+def test_read_build_system_missing(tmp_path: Path) -> None:
+    assert read_build_system(tmp_path / "pyproject.toml") is None
+
+
+def test_read_build_system_persisted(tmp_path: Path, load: MagicMock, monkeypatch: pytest.MonkeyPatch) -> None:
+    py_project_toml = _write(tmp_path, _TOML)
+    cache = tmp_path / "cache"
+    first = read_build_system(py_project_toml, cache)
+    monkeypatch.setattr(build_system_module, "_READ", {})  # a new process
+    assert read_build_system(py_project_toml, cache) == first
+    assert load.call_count == 1
+
+    (entry,) = cache.iterdir()
+    for damaged in ("not json", '{"key": [1, 2], "build_system": [null, null, null]}'):
+        entry.write_text(damaged)
+        monkeypatch.setattr(build_system_module, "_READ", {})
+        assert read_build_system(py_project_toml, cache) == first
+    assert load.call_count == 3
+
+
+def test_requirements_not_shared() -> None:
+    parsed = requirements(("a>1", "b"))
+    assert [str(r) for r in parsed] == ["a>1", "b"]
+    parsed[0].extras.add("x")
+    assert [str(r) for r in requirements(("a>1", "b"))] == ["a>1", "b"]
+
+
+def test_create_args_from_folder_cached(tmp_path: Path, load: MagicMock) -> None:
+    _write(tmp_path, '[build-system]\nrequires = ["a"]\nbuild-backend = "be:obj"\nbackend-path = ["src"]\n')
+    first = Frontend.create_args_from_folder(tmp_path, tmp_path / "cache")
+    second = Frontend.create_args_from_folder(tmp_path, tmp_path / "cache")
+    assert first == second
+    assert first[4][0] is not second[4][0]  # the table is remembered, the mutable requirements are parsed per call
+    assert first[1:4] == ((tmp_path / "src",), "be", "obj")
+    assert [str(r) for r in first[4]] == ["a"]
+    assert load.call_count == 1
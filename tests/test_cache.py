@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from textwrap import dedent
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pyproject_api import ArtifactCache, CachedArtifact, CacheStats, MetadataCache, SubprocessFrontend
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    import pytest_mock
+
+_BACKEND = """
+import os, sys
+def _prepare(metadata_directory):
+    with open("calls", "a") as file_handler:
+        file_handler.write("x")
+    print("preparing")
+    print("prepare warning", file=sys.stderr)
+    os.makedirs(os.path.join(metadata_directory, "demo-1.0.dist-info"))
+    with open(os.path.join(metadata_directory, "demo-1.0.dist-info", "METADATA"), "w") as file_handler:
+        file_handler.write("Name: demo")
+    return "demo-1.0.dist-info"
+def prepare_metadata_for_build_wheel(metadata_directory, config_settings=None):
+    return _prepare(metadata_directory)
+def prepare_metadata_for_build_editable(metadata_directory, config_settings=None):
+    return _prepare(metadata_directory)
+"""
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    root = tmp_path / "project"
+    root.mkdir()
+    toml = '[build-system]\nrequires=[]\nbuild-backend = "build_tester"\nbackend-path=["."]'
+    (root / "pyproject.toml").write_text(toml)
+    (root / "build_tester.py").write_text(dedent(_BACKEND))
+    return root
+
+
+@pytest.fixture
+def make_frontend(tmp_path: Path) -> Callable[[Path], SubprocessFrontend]:
+    cache = MetadataCache(tmp_path / "cache")
+
+    def _f(root: Path) -> SubprocessFrontend:
+        frontend = SubprocessFrontend(*SubprocessFrontend.create_args_from_folder(root)[:-1])
+        frontend.metadata_cache = cache
+        return frontend
+
+    return _f
+
+
+def calls(root: Path) -> int:
+    path = root / "calls"
+    return len(path.read_text()) if path.exists() else 0
+
+
+@pytest.mark.parametrize("target", ["wheel", "editable"])
+def test_metadata_cache_hit(
+    make_frontend: Callable[[Path], SubprocessFrontend], project: Path, tmp_path: Path, target: str
+) -> None:
+    first = getattr(make_frontend(project), f"prepare_metadata_for_build_{target}")(tmp_path / "meta")
+    assert calls(project) == 1
+    (project / "calls").unlink()  # not a source file, but keep the project content identical for the next run
+
+    frontend = make_frontend(project)
+    second = getattr(frontend, f"prepare_metadata_for_build_{target}")(tmp_path / "other")
+    assert calls(project) == 0
+    assert second.metadata == tmp_path / "other" / "demo-1.0.dist-info"
+    assert (second.metadata / "METADATA").read_text() == "Name: demo"
+    assert (second.out, second.err) == (first.out, first.err)
+    assert "preparing" in second.out
+    assert "prepare warning" in second.err
+    assert frontend.metadata_cache is not None
+    assert frontend.metadata_cache.stats == CacheStats(hits=1, misses=1, evictions=0)
+
+
+def test_metadata_cache_miss_on_change(
+    make_frontend: Callable[[Path], SubprocessFrontend], project: Path, tmp_path: Path
+) -> None:
+    make_frontend(project).prepare_metadata_for_build_wheel(tmp_path / "meta")
+    (project / "calls").unlink()
+    make_frontend(project).prepare_metadata_for_build_wheel(tmp_path / "meta", config_settings={"a": "b"})
+    assert calls(project) == 1
+    (project / "calls").unlink()
+    (project / "src.py").write_text("")
+    make_frontend(project).prepare_metadata_for_build_wheel(tmp_path / "meta")
+    assert calls(project) == 1
+
+
+def test_metadata_cache_miss_on_backend_upgrade(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, make_frontend: Callable[[Path], SubprocessFrontend]
+) -> None:
+    site = tmp_path / "site"  # the environment running the backend, not the one of the frontend
+    (site / "versioned_backend").mkdir(parents=True)
+    monkeypatch.setenv("PYTHONPATH", str(site))
+    root = tmp_path / "project"
+    root.mkdir()
+    toml = '[build-system]\nrequires=["versioned_backend"]\nbuild-backend = "versioned_backend"'
+    (root / "pyproject.toml").write_text(toml)
+    for backend_version, prepared in (("1.0", 1), ("1.0", 0), ("2.0", 1)):  # the backend upgraded in its environment
+        (site / "versioned_backend" / "__init__.py").write_text(f"__version__ = {backend_version!r}\n{_BACKEND}")
+        frontend = make_frontend(root)
+        frontend.prepare_metadata_for_build_wheel(tmp_path / f"meta-{backend_version}")
+        assert frontend._installed_backend_version() == backend_version  # ruff:ignore[private-member-access]
+        assert calls(root) == prepared
+        (root / "calls").unlink(missing_ok=True)
+
+    (site / "versioned_backend" / "__init__.py").write_text(_BACKEND)  # no version, nor a distribution to look it up
+    frontend = make_frontend(root)
+    frontend.prepare_metadata_for_build_wheel(tmp_path / "meta-unknown")
+    assert not frontend._installed_backend_version()  # ruff:ignore[private-member-access]
+    assert calls(root) == 1
+
+
+def test_metadata_cache_missing_hook(
+    make_frontend: Callable[[Path], SubprocessFrontend],
+    tmp_path: Path,
+    mocker: pytest_mock.MockerFixture,
+    demo_pkg_inline: Path,
+) -> None:
+    assert make_frontend(demo_pkg_inline).prepare_metadata_for_build_wheel(tmp_path / "meta") is None
+    frontend = make_frontend(demo_pkg_inline)
+    send = mocker.spy(frontend, "_send")
+    assert frontend.prepare_metadata_for_build_wheel(tmp_path / "meta") is None
+    assert not send.called  # an in-tree backend is part of the sources, its version is not needed
+
+
+def test_metadata_cache_eviction(tmp_path: Path) -> None:
+    cache = MetadataCache(tmp_path / "cache", max_size=150)
+    for at in range(3):
+        metadata = tmp_path / str(at) / "demo-1.0.dist-info"
+        metadata.mkdir(parents=True)
+        (metadata / "METADATA").write_text("x" * 100)
+        cache.store(f"key{at}", metadata, "", "")
+    assert cache.stats.evictions == 2
+    assert cache.restore("key0", tmp_path / "restored") is None
+    restored = cache.restore("key2", tmp_path / "restored")
+    assert restored is not None
+    assert restored.metadata == tmp_path / "restored" / "demo-1.0.dist-info"
+    assert cache.stats == CacheStats(hits=1, misses=1, evictions=2)
+
+
+def test_metadata_cache_keeps_first_entry(tmp_path: Path) -> None:
+    cache = MetadataCache(tmp_path / "cache")
+    cache.store("key", None, "first", "")
+    cache.store("key", None, "second", "")
+    restored = cache.restore("key", tmp_path)
+    assert restored is not None
+    assert restored.out == "first"
+    assert not [p for p in (tmp_path / "cache").iterdir() if p.name.startswith(".tmp-")]
+
+
+@pytest.mark.parametrize(("hook", "name"), [("build_sdist", "demo_pkg_inline-1.0.0.tar.gz"), ("build_wheel", None)])
+def test_artifact_cache_hit(
+    tmp_path: Path, mocker: pytest_mock.MockerFixture, demo_pkg_inline: Path, hook: str, name: str | None
+) -> None:
+    cache = ArtifactCache(tmp_path / "cache")
+    frontend = SubprocessFrontend(*SubprocessFrontend.create_args_from_folder(demo_pkg_inline)[:-1])
+    frontend.artifact_cache = cache
+    first = getattr(frontend, hook)(tmp_path / "first")
+
+    send = mocker.spy(frontend, "_send")
+    frontend.artifact_targets = (tmp_path / "pkg",)
+    second = getattr(frontend, hook)(tmp_path / "second")
+    assert not send.called
+    assert second[0] == tmp_path / "second" / first[0].name
+    assert second[0].read_bytes() == first[0].read_bytes()
+    entries = list((tmp_path / "cache").rglob(first[0].name))
+    assert entries
+    assert not any(
+        second[0].samefile(entry) for entry in entries
+    )  # modifying the restored file leaves the cache intact
+    assert [placement.path for placement in frontend.last_placements] == [tmp_path / "pkg" / first[0].name]
+    assert (second.out, second.err) == (first.out, first.err)
+    if name is not None:
+        assert second[0].name == name
+    assert cache.stats == CacheStats(hits=1, misses=1, evictions=0)
+
+    getattr(frontend, hook)(tmp_path / "third", config_settings={"a": "b"})
+    assert send.call_count == 1
+
+
+def test_artifact_cache_editable_keyed_by_root(tmp_path: Path, demo_pkg_inline: Path) -> None:
+    copy = tmp_path / "copy"
+    copy.mkdir()
+    for name in ("pyproject.toml", "build.py"):
+        (copy / name).write_bytes((demo_pkg_inline / name).read_bytes())
+    cache = ArtifactCache(tmp_path / "cache")
+    for root in (demo_pkg_inline, copy, copy):
+        frontend = SubprocessFrontend(*SubprocessFrontend.create_args_from_folder(root)[:-1])
+        frontend.artifact_cache = cache
+        frontend.build_editable(tmp_path / "dist")
+        frontend.build_wheel(tmp_path / "dist")
+    # wheels do not depend on the location of the project, editable wheels do
+    assert cache.stats == CacheStats(hits=3, misses=3, evictions=0)
+
+
+def test_artifact_cache_concurrent(tmp_path: Path) -> None:
+    artifact = tmp_path / "demo-1.0-py3-none-any.whl"
+    artifact.write_bytes(b"wheel")
+    cache = ArtifactCache(tmp_path / "cache")
+
+    def work(at: int) -> CachedArtifact | None:
+        cache.store("key", artifact, str(at), "")
+        return cache.restore("key", tmp_path / "out")
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(work, range(16)))
+    assert all(r is not None and r.artifact.read_bytes() == b"wheel" for r in results)
+    assert len({r.out for r in results if r is not None}) == 1
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == ["demo-1.0-py3-none-any.whl"]
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess  # ruff:ignore[suspicious-subprocess-import]
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pyproject_api import _fingerprint
+from pyproject_api._fingerprint import SourceFingerprint, fingerprint, stat_tree
+
+if TYPE_CHECKING:
+    import pytest_mock
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    root = tmp_path / "project"
+    (root / "pkg").mkdir(parents=True)
+    (root / "a.py").write_text("a")
+    (root / "pkg" / "b.py").write_text("b")
+    return root
+
+
+def _age(root: Path) -> None:  # step out of the window where a file may change without its timestamp changing
+    for folder, _, names in os.walk(root):
+        for name in names:
+            os.utime(Path(folder) / name, (1_000_000, 1_000_000))
+
+
+def test_fingerprint_skips_tool_folders(project: Path) -> None:
+    first = fingerprint(project)
+    assert first.changed == ("a.py", "pkg/b.py")
+    (project / "link").symlink_to(project / "pkg", target_is_directory=True)  # not followed
+    for ignored in (".tox", "build", "demo.egg-info"):
+        (project / ignored).mkdir()
+        (project / ignored / "c").write_text("c")
+    assert fingerprint(project).digest == first.digest
+    (project / "pkg" / "b.py").write_text("B")
+    assert fingerprint(project).digest != first.digest
+
+
+def test_fingerprint_nested_build_output_names(project: Path) -> None:
+    (project / "src" / "build").mkdir(parents=True)  # a package named like a build output folder
+    (project / "src" / "build" / "__init__.py").write_text("a")
+    (project / "src" / "env" / "lib").mkdir(parents=True)
+    (project / "src" / "env" / "pyvenv.cfg").write_text("")
+    (project / "src" / "env" / "lib" / "c.py").write_text("c")
+    first = fingerprint(project)
+    assert first.changed == ("a.py", "pkg/b.py", "src/build/__init__.py")
+
+    (project / "src" / "env" / "lib" / "c.py").write_text("C")
+    assert fingerprint(project).digest == first.digest
+    (project / "src" / "build" / "__init__.py").write_text("b")
+    assert fingerprint(project).digest != first.digest
+
+
+def test_fingerprint_index_skips_unchanged(project: Path, tmp_path: Path, mocker: pytest_mock.MockerFixture) -> None:
+    index = tmp_path / "index" / "project.json"
+    _age(project)
+    first = fingerprint(project, index)
+    assert index.exists()
+
+    file_digest = mocker.spy(_fingerprint, "file_digest")
+    assert fingerprint(project, index) == SourceFingerprint(first.digest, ())
+    assert not file_digest.called
+
+    (project / "a.py").write_text("A")
+    (project / "c.py").write_text("c")
+    (project / "pkg" / "b.py").unlink()
+    third = fingerprint(project, index)
+    assert third.changed == ("a.py", "c.py", "pkg/b.py")
+    assert sorted(call.args[0].name for call in file_digest.call_args_list) == ["a.py", "c.py"]
+    assert third.digest == fingerprint(project).digest
+
+
+def test_fingerprint_rehashes_racy_files(project: Path, tmp_path: Path, mocker: pytest_mock.MockerFixture) -> None:
+    index = tmp_path / "index.json"
+    fingerprint(project, index)
+    file_digest = mocker.spy(_fingerprint, "file_digest")
+    assert fingerprint(project, index).changed == ()
+    assert file_digest.call_count == 2  # modified too close to the index being written to trust the timestamps
+
+
+@pytest.mark.parametrize("content", ["not json", '{"version": 0, "files": {}}'])
+def test_fingerprint_bad_index(project: Path, tmp_path: Path, content: str) -> None:
+    index = tmp_path / "index.json"
+    index.write_text(content)
+    assert fingerprint(project, index).changed == ("a.py", "pkg/b.py")
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+def test_fingerprint_git(project: Path) -> None:
+    git = ["git", "-c", "user.name=a", "-c", "user.email=a@b.c"]
+    subprocess.run([*git, "init", "-q"], cwd=project, check=True)
+    (project / ".gitignore").write_text("*.log\n")
+    (project / "debug.log").write_text("x")
+    (project / "gone.py").write_text("x")
+    subprocess.run([*git, "add", "."], cwd=project, check=True)
+    (project / "gone.py").unlink()
+    (project / "untracked.py").write_text("x")
+    (project / "build").mkdir()
+    (project / "build" / "ignored.py").write_text("x")
+
+    result = fingerprint(project, use_git=True)
+    assert result.changed == (".gitignore", "a.py", "build/ignored.py", "pkg/b.py", "untracked.py")
+    assert result.digest != fingerprint(project).digest
+
+
+def test_fingerprint_git_falls_back_to_scan(project: Path, mocker: pytest_mock.MockerFixture) -> None:
+    mocker.patch("pyproject_api._fingerprint.subprocess.run", side_effect=FileNotFoundError)
+    assert fingerprint(project, use_git=True) == fingerprint(project)
+
+
+def test_stat_tree(tmp_path: Path) -> None:
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("a")
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "__pycache__" / "a.pyc").write_text("")
+    before = stat_tree(tmp_path)
+    assert list(before) == ["pkg/a.py"]
+    assert stat_tree(tmp_path) == before
+
+    (tmp_path / "pkg" / "a.py").write_text("ab")
+    assert stat_tree(tmp_path) != before
+    assert stat_tree(tmp_path / "missing") == {}
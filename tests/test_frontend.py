@@ -1,28 +1,23 @@
 from __future__ import annotations
 
-from pathlib import Path
+import json
+import os
+import platform
 from textwrap import dedent
 from typing import TYPE_CHECKING, Literal
 
 import pytest
 from packaging.requirements import Requirement
 
-from pyproject_api._frontend import BackendFailed
-from pyproject_api._via_fresh_subprocess import SubprocessFrontend
+from pyproject_api import CapturedOutput, JsonLinesTracer, OutputLimit, PersistentSubprocessFrontend
+from pyproject_api._frontend import BackendFailed, BackendInfo, CmdStatus, Frontend, HookTiming, split_timing
+from pyproject_api._via_fresh_subprocess import ControlChannel, SubprocessFrontend
 
 if TYPE_CHECKING:
     from collections.abc import Callable
+    from pathlib import Path
 
-
-@pytest.fixture
-def local_builder(tmp_path: Path) -> Callable[[str], Path]:
-    def _f(content: str) -> Path:
-        toml = '[build-system]\nrequires=[]\nbuild-backend = "build_tester"\nbackend-path=["."]'
-        (tmp_path / "pyproject.toml").write_text(toml)
-        (tmp_path / "build_tester.py").write_text(dedent(content))
-        return tmp_path
-
-    return _f
+    import pytest_mock
 
 
 def test_missing_backend(local_builder: Callable[[str], Path]) -> None:
@@ -63,11 +58,6 @@ def test_empty_pyproject(tmp_path: Path) -> None:
         assert str(left) == str(right)
 
 
-@pytest.fixture(scope="session")
-def demo_pkg_inline() -> Path:
-    return Path(__file__).absolute().parent / "demo_pkg_inline"
-
-
 def test_backend_no_prepare_wheel(tmp_path: Path, demo_pkg_inline: Path) -> None:
     frontend = SubprocessFrontend(*SubprocessFrontend.create_args_from_folder(demo_pkg_inline)[:-1])
     result = frontend.prepare_metadata_for_build_wheel(tmp_path)
@@ -200,6 +190,75 @@ def test_metadata_from_built_wheel(
     assert not err
 
 
+_SDIST_BACKEND = """
+import io, os, sys, tarfile
+from zipfile import ZipFile
+
+def build_sdist(sdist_directory, config_settings=None):
+    if "fail" in (config_settings or {}):
+        raise RuntimeError("no sdist")
+    print("built sdist")
+    content = b"Metadata-Version: {version}\\nName: Demo.Pkg\\nVersion: 1.0\\n{extra}\\nA demo"
+    with tarfile.open(os.path.join(sdist_directory, "demo_pkg-1.0.tar.gz"), "w:gz") as tar:
+        info = tarfile.TarInfo("demo_pkg-1.0/PKG-INFO")
+        info.size = len(content)
+        tar.addfile(info, io.BytesIO(content))
+    return "demo_pkg-1.0.tar.gz"
+
+def build_wheel(wheel_directory, config_settings=None, metadata_directory=None):
+    print("built wheel")
+    with ZipFile(os.path.join(wheel_directory, "demo_pkg-1.0-py3-none-any.whl"), "w") as zip_file:
+        zip_file.writestr("demo_pkg-1.0.dist-info/METADATA", "Metadata-Version: 2.1\\nName: Demo.Pkg\\nVersion: 1.0")
+    return "demo_pkg-1.0-py3-none-any.whl"
+"""
+
+
+@pytest.mark.parametrize(
+    ("version", "extra", "config_settings", "strategy"),
+    [
+        pytest.param("2.2", "Summary: static", None, "sdist", id="static"),
+        pytest.param("2.2", "Dynamic: Requires-Dist", None, "wheel", id="dynamic"),
+        pytest.param("2.1", "Summary: static", None, "wheel", id="old"),
+        pytest.param("2.2", "Summary: static", {"fail": "1"}, "wheel", id="sdist-failed"),
+    ],
+)
+def test_acquire_metadata_from_sdist(
+    local_builder: Callable[[str], Path],
+    version: str,
+    extra: str,
+    config_settings: dict[str, str] | None,
+    strategy: str,
+) -> None:
+    tmp_path = local_builder(_SDIST_BACKEND.replace("{version}", version).replace("{extra}", extra))
+    frontend = SubprocessFrontend(*SubprocessFrontend.create_args_from_folder(tmp_path)[:-1])
+    result = frontend.acquire_metadata(tmp_path / "meta", config_settings=config_settings)
+    assert result.strategy == strategy
+    assert result.metadata == tmp_path / "meta" / "demo_pkg-1.0.dist-info"
+    assert (
+        (result.metadata / "METADATA")
+        .read_text()
+        .startswith(f"Metadata-Version: {version if strategy == 'sdist' else '2.1'}")
+    )
+    assert ("built sdist" in result.out) is (config_settings is None)
+    assert ("built wheel" in result.out) is (strategy == "wheel")
+    assert ("no sdist" in result.err) is (config_settings is not None)
+
+
+@pytest.mark.parametrize(("prepare", "strategy"), [(True, "prepare_metadata"), (False, "wheel")])
+def test_acquire_metadata_demo(
+    demo_pkg_inline: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, prepare: bool, strategy: str
+) -> None:
+    if prepare:
+        monkeypatch.setenv("HAS_PREPARE_EDITABLE", "1")
+    else:
+        monkeypatch.delenv("HAS_PREPARE_EDITABLE", raising=False)
+    frontend = SubprocessFrontend(*SubprocessFrontend.create_args_from_folder(demo_pkg_inline)[:-1])
+    result = frontend.acquire_metadata(tmp_path / "meta", "editable")
+    assert result.strategy == strategy  # the demo source distribution has no PKG-INFO
+    assert result.metadata == tmp_path / "meta" / "demo_pkg_inline-1.0.0.dist-info"
+    assert (result.metadata / "METADATA").exists()
+
+
 def test_bad_wheel_metadata_from_built_wheel(local_builder: Callable[[str], Path]) -> None:
     txt = """
     import sys
@@ -299,7 +358,7 @@ def test_backend_prepare_editable_bad(tmp_path: Path, demo_pkg_inline: Path, mon
     assert " prepare_metadata_for_build_editable " in exc.out
     assert not exc.args
     assert exc.exc_type == "TypeError"
-    assert exc.exc_msg == "'prepare_metadata_for_build_wheel' on 'build' returned 1 but expected type <class 'str'>"
+    assert exc.exc_msg == "'prepare_metadata_for_build_editable' on 'build' returned 1 but expected type <class 'str'>"
 
 
 def test_backend_build_editable(tmp_path: Path, demo_pkg_inline: Path, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -360,3 +419,322 @@ def test_backend_failed_str_repr() -> None:
 
     exc = BackendFailed({"code": 3, "exc_type": "Error", "exc_msg": "msg"}, "out\n", "err\n")
     assert str(exc) == "packaging backend failed (code=3), with Error: msg\nerr\nout"
+
+
+def test_result_pipe_transport(tmp_path: Path, demo_pkg_inline: Path, mocker: pytest_mock.MockerFixture) -> None:
+    temp_file = mocker.patch("pyproject_api._frontend.NamedTemporaryFile", side_effect=AssertionError)
+    args = SubprocessFrontend.create_args_from_folder(demo_pkg_inline)[:-1]
+    frontend = SubprocessFrontend(*args, result_transport="pipe")
+    result = frontend.build_wheel(tmp_path)
+    assert result.wheel.name == "demo_pkg_inline-1.0.0-py3-none-any.whl"
+    assert " build_wheel " in result.out
+    assert not result.err
+    assert not temp_file.called
+
+
+def test_result_pipe_transport_missing_result(local_builder: Callable[[str], Path]) -> None:
+    tmp_path = local_builder("import os\ndef build_sdist(sdist_directory, config_settings=None): os._exit(2)")
+    frontend = SubprocessFrontend(*SubprocessFrontend.create_args_from_folder(tmp_path)[:-1], result_transport="pipe")
+    with pytest.raises(BackendFailed, match="backend exited without sending a result frame"):
+        frontend.build_sdist(tmp_path)
+    assert not list(tmp_path.glob("pep517_*"))
+
+
+@pytest.mark.parametrize("hook", ["build_sdist", "build_wheel", "build_editable"])
+def test_artifact_targets(tmp_path: Path, demo_pkg_inline: Path, hook: str) -> None:
+    frontend = SubprocessFrontend(*SubprocessFrontend.create_args_from_folder(demo_pkg_inline)[:-1])
+    assert frontend.last_placements == ()
+    frontend.artifact_targets = (tmp_path / "cache", tmp_path / "dist", tmp_path / "env")
+
+    artifact = getattr(frontend, hook)(tmp_path / "dist")[0]
+
+    # the folder it was built in is skipped
+    assert [p.path for p in frontend.last_placements] == [
+        tmp_path / "cache" / artifact.name,
+        tmp_path / "env" / artifact.name,
+    ]
+    for placement in frontend.last_placements:
+        assert placement.method in {"reflink", "hardlink", "copy_file_range", "copy"}
+        assert placement.path.read_bytes() == artifact.read_bytes()
+
+
+def test_artifact_targets_skip_metadata_builds(tmp_path: Path, demo_pkg_inline: Path) -> None:
+    frontend = SubprocessFrontend(*SubprocessFrontend.create_args_from_folder(demo_pkg_inline)[:-1])
+    frontend.artifact_targets = (tmp_path / "target",)
+
+    # the wheel and the sdist built just for their metadata are thrown away, so not placed
+    frontend.metadata_from_built(tmp_path / "wheel", "wheel")
+    frontend.acquire_metadata(tmp_path / "sdist")
+    assert frontend.last_placements == ()
+    assert not (tmp_path / "target").exists()
+
+    frontend.build_sdist(tmp_path / "dist")
+    assert [p.path.name for p in frontend.last_placements] == ["demo_pkg_inline-1.0.0.tar.gz"]
+
+
+def test_control_channel_other_version() -> None:
+    channel = ControlChannel()
+    os.write(channel.write_fd, b"\x02\x00\x00\x00\x02{}")  # a frame of a later protocol version
+    channel.started()
+    channel.join()
+    channel.close_requests()
+    assert channel.finished
+    assert channel.results == []
+
+
+def test_result_transport_invalid(tmp_path: Path) -> None:
+    args = SubprocessFrontend.create_args_from_folder(tmp_path)[:-1]
+    with pytest.raises(ValueError, match="result_transport must be file or pipe, got 'socket'"):
+        SubprocessFrontend(*args, result_transport="socket")  # type: ignore[invalid-argument-type]
+
+
+def test_subprocess_cmd_status_wait(local_builder: Callable[[str], Path]) -> None:
+    tmp_path = local_builder("import time\ndef build_sdist(sdist_directory, config_settings=None): time.sleep(0.5)")
+    frontend = SubprocessFrontend(*SubprocessFrontend.create_args_from_folder(tmp_path)[:-1])
+    msg = json.dumps({"cmd": "build_sdist", "kwargs": {"sdist_directory": str(tmp_path)}, "result": "x"})
+    with frontend._send_msg("build_sdist", tmp_path / "x", msg) as status:  # ruff:ignore[private-member-access]
+        assert status.wait(0.01) is False
+        assert status.wait(10) is True
+        assert status.done
+
+
+def test_cmd_status_wait_polls() -> None:
+    class Status(CmdStatus):
+        def __init__(self) -> None:
+            self.polls = 0
+
+        @property
+        def done(self) -> bool:
+            self.polls += 1
+            return self.polls > 3
+
+        def out_err(self) -> tuple[str, str]:
+            raise NotImplementedError
+
+    status = Status()
+    assert status.wait(0) is False
+    assert status.wait(10) is True
+    assert status.polls == 4
+    assert status.result() is None
+
+
+def test_batch_metadata_pass(demo_pkg_inline: Path, tmp_path: Path) -> None:
+    frontend = SubprocessFrontend(*SubprocessFrontend.create_args_from_folder(demo_pkg_inline)[:-1])
+    hooks, requires, metadata = frontend.batch([
+        ("_optional_hooks", {}),
+        ("get_requires_for_build_wheel", {"config_settings": None}),
+        ("prepare_metadata_for_build_wheel", {"metadata_directory": tmp_path}),
+    ])
+    assert hooks.error is None
+    assert hooks.value["prepare_metadata_for_build_wheel"] is False
+    assert frontend._optional_hooks == hooks.value  # ruff:ignore[private-member-access]
+    assert requires.value == []
+    assert requires.error is None
+    assert " get_requires_for_build_wheel " in requires.out
+    assert " get_requires_for_build_wheel " not in metadata.out
+    assert metadata.value is None
+    assert metadata.error is not None
+    assert metadata.error.exc_type == "MissingCommand"
+
+
+def test_batch_output_per_hook(local_builder: Callable[[str], Path]) -> None:
+    tmp_path = local_builder(
+        """
+        import sys
+        def get_requires_for_build_sdist(config_settings=None):
+            print("sdist out")
+            print("sdist err", file=sys.stderr)
+            return ["a"]
+        def get_requires_for_build_wheel(config_settings=None):
+            print("wheel out")
+            print("wheel err", file=sys.stderr)
+            raise ValueError("bad")
+        """
+    )
+    frontend = SubprocessFrontend(*SubprocessFrontend.create_args_from_folder(tmp_path)[:-1])
+    sdist, wheel = frontend.batch([("get_requires_for_build_sdist", {}), ("get_requires_for_build_wheel", {})])
+    assert sdist.value == ["a"]
+    assert "sdist out" in sdist.out
+    assert sdist.err == "sdist err\n"
+    assert wheel.out == "Backend: run command get_requires_for_build_wheel with args {}\nwheel out\n"
+    assert wheel.err.startswith("wheel err\nTraceback")
+    assert wheel.error is not None
+    assert wheel.error.exc_type == "ValueError"
+    assert wheel.error.err == wheel.err
+    assert "pyproject-api-handshake:" not in sdist.out
+    assert frontend.backend_info is not None  # learnt from the handshake of the backend
+    assert frontend.backend_info.optional_hooks["get_requires_for_build_sdist"] is True
+
+
+@pytest.mark.parametrize("handshake", [True, False])
+def test_optional_hooks_from_handshake(
+    local_builder: Callable[[str], Path], mocker: pytest_mock.MockerFixture, handshake: bool
+) -> None:
+    tmp_path = local_builder("def get_requires_for_build_sdist(config_settings=None): return ['a']")
+    if not handshake:  # e.g. the backend failed to describe itself
+        mocker.patch("pyproject_api._frontend.split_handshake", side_effect=lambda out: (out, None))
+    frontend = SubprocessFrontend(*SubprocessFrontend.create_args_from_folder(tmp_path)[:-1])
+    send = mocker.spy(frontend, "_send")
+
+    result = frontend.get_requires_for_build_wheel()
+    assert result.requires == ()
+    assert not result.out
+    assert [c.args[0] for c in send.call_args_list] == ["get_requires_for_build_wheel"] + (
+        [] if handshake else ["_optional_hooks"]
+    )
+    assert [str(r) for r in frontend.get_requires_for_build_sdist().requires] == ["a"]
+    assert frontend.get_requires_for_build_editable().requires == ()
+    assert send.call_count == (2 if handshake else 3)
+    if handshake:
+        assert frontend.backend_info == BackendInfo(frontend.optional_hooks, None, platform.python_version())
+    else:
+        assert frontend.backend_info is None
+
+
+_STREAMING_BACKEND = """
+import os, sys, time
+def get_requires_for_build_wheel(config_settings=None):
+    print("compiling")
+    print("warning: unused", file=sys.stderr)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    for _ in range(1000):  # the frontend acknowledges the line while the hook still runs
+        if os.path.exists("seen") or not os.path.exists("streaming"):
+            break
+        time.sleep(0.01)
+    print("seen" if os.path.exists("seen") else "not seen")
+    return []
+"""
+
+
+@pytest.mark.parametrize("frontend_type", [SubprocessFrontend, PersistentSubprocessFrontend])
+def test_stream_output(local_builder: Callable[[str], Path], frontend_type: type[Frontend]) -> None:
+    tmp_path = local_builder(_STREAMING_BACKEND)
+    frontend = frontend_type(*frontend_type.create_args_from_folder(tmp_path)[:-1])
+    out_lines: list[str] = []
+    err_lines: list[str] = []
+
+    def on_out(line: str) -> None:
+        out_lines.append(line)
+        if line == "compiling\n":
+            (tmp_path / "seen").touch()
+
+    (tmp_path / "streaming").touch()
+    with frontend.stream_output(on_out, err_lines.append):
+        result = frontend.get_requires_for_build_wheel()
+    (tmp_path / "seen").unlink()
+    (tmp_path / "streaming").unlink()
+    assert "compiling\nseen\n" in result.out
+    assert result.err == "warning: unused\n"
+    assert "".join(out_lines) == result.out
+    assert err_lines == ["warning: unused\n"]
+    assert not any(line.startswith("pyproject-api-handshake:") for line in out_lines)
+
+    assert "not seen" in frontend.get_requires_for_build_wheel().out  # not streamed outside the context
+    assert "".join(out_lines) == result.out
+    if isinstance(frontend, PersistentSubprocessFrontend):
+        frontend.close()
+
+
+def test_stream_output_callback_error(local_builder: Callable[[str], Path]) -> None:
+    tmp_path = local_builder(
+        "import sys\ndef build_sdist(sdist_directory, config_settings=None):\n"
+        "    print('x', file=sys.stderr)\n    return 'a'"
+    )
+    frontend = SubprocessFrontend(*SubprocessFrontend.create_args_from_folder(tmp_path)[:-1])
+
+    def on_out(line: str) -> None:
+        raise ValueError(line)
+
+    with frontend.stream_output(out=on_out), pytest.raises(ValueError, match="started backend"):
+        frontend.build_sdist(tmp_path)
+    assert frontend.build_sdist(tmp_path).sdist == tmp_path / "a"
+
+
+@pytest.mark.parametrize("frontend_type", [SubprocessFrontend, PersistentSubprocessFrontend])
+def test_output_limit(local_builder: Callable[[str], Path], frontend_type: type[Frontend]) -> None:
+    tmp_path = local_builder(
+        "import sys\ndef build_sdist(sdist_directory, config_settings=None):\n"
+        "    for i in range(2000):\n        print(f'line {i}')\n    print('done', file=sys.stderr)\n    return 'a'"
+    )
+    frontend = frontend_type(*frontend_type.create_args_from_folder(tmp_path)[:-1])
+    frontend.output_limit = OutputLimit(head=30, tail=20, directory=tmp_path / "logs")
+    result = frontend.build_sdist(tmp_path)
+    out = result.out
+    assert isinstance(out, CapturedOutput)
+    assert out.path.parent == tmp_path / "logs"
+    assert out.startswith("started backend")
+    assert len(out) < 30 + 20 + len(str(out.path)) + 50
+    assert "line 1000\n" not in out
+    assert "line 1000\n" in out.read()
+    assert result.err == "done\n"
+    assert frontend.backend_info is not None  # the handshake is parsed despite the limit
+    if isinstance(frontend, PersistentSubprocessFrontend):
+        frontend.close()
+
+
+@pytest.mark.parametrize("frontend_type", [SubprocessFrontend, PersistentSubprocessFrontend])
+def test_hook_timing(local_builder: Callable[[str], Path], frontend_type: type[Frontend]) -> None:
+    tmp_path = local_builder("def build_sdist(sdist_directory, config_settings=None):\n    return 'a'")
+    frontend = frontend_type(*frontend_type.create_args_from_folder(tmp_path)[:-1])
+    assert frontend.last_timing is None
+
+    result = frontend.build_sdist(tmp_path)
+    assert "pyproject-api-timing:" not in result.out
+    first = frontend.last_timing
+    assert first is not None
+    assert None not in first
+    assert list(first) == sorted(first)
+    assert set(first.phases) == {"spawn", "import", "hook", "write", "read", "total"}
+
+    frontend.build_sdist(tmp_path)
+    second = frontend.last_timing
+    assert second is not None
+    if isinstance(frontend, PersistentSubprocessFrontend):  # the running backend handled it
+        assert (second.spawn_start, second.backend_start, second.backend_ready) == (None, None, None)
+        assert set(second.phases) == {"hook", "write", "read", "total"}
+        frontend.close()
+    else:
+        assert second.spawn_start is not None
+        assert second.spawn_start > first.result_read
+
+
+def test_split_timing_not_reported() -> None:
+    assert split_timing("crashed\n", 1.0, 0.5, 2.0) == (
+        "crashed\n",
+        HookTiming(1.0, 0.5, None, None, None, None, None, 2.0),
+    )
+
+
+def test_tracer(local_builder: Callable[[str], Path], tmp_path: Path) -> None:
+    tmp_path = local_builder(
+        "import sys\ndef build_sdist(sdist_directory, config_settings=None):\n"
+        "    print('err', file=sys.stderr)\n    return 'a'\n"
+        "def build_wheel(wheel_directory, config_settings=None, metadata_directory=None):\n    raise ValueError('bad')"
+    )
+    frontend = SubprocessFrontend(*SubprocessFrontend.create_args_from_folder(tmp_path)[:-1])
+    with JsonLinesTracer(tmp_path / "spans.jsonl") as frontend.tracer:
+        frontend.build_sdist(tmp_path, {"b": "1", "a": "2"})
+        with pytest.raises(BackendFailed):
+            frontend.metadata_from_built(tmp_path / "meta", "wheel")
+
+    spans = [json.loads(line) for line in (tmp_path / "spans.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [s["name"] for s in spans] == ["send", "build_sdist", "send", "build_wheel", "metadata_from_built"]
+    send, build_sdist, failed_send, build_wheel, metadata_from_built = spans
+    assert send["parent_id"] == build_sdist["span_id"]
+    assert build_sdist["parent_id"] is None
+    assert build_sdist["attributes"] == {
+        "backend": "build_tester",
+        "config_settings": ["a", "b"],
+        "out_size": send["attributes"]["out_size"],
+        "err_size": 4,
+        "outcome": "ok",
+    }
+    assert send["attributes"]["cmd"] == "build_sdist"
+    assert set(send["attributes"]["phases"]) >= {"hook", "total"}
+    assert (failed_send["attributes"]["outcome"], failed_send["attributes"]["exc_type"]) == (
+        "BackendFailed",
+        "ValueError",
+    )
+    assert build_wheel["parent_id"] == metadata_from_built["span_id"]
+    assert metadata_from_built["attributes"]["outcome"] == "BackendFailed"
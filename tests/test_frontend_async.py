@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pyproject_api import AsyncFrontend, BackendFailed
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    import pytest_mock
+
+
+def test_async_demo_pkg_inline(demo_pkg_inline: Path, tmp_path: Path) -> None:
+    frontend = AsyncFrontend(*AsyncFrontend.create_args_from_folder(demo_pkg_inline)[:-1])
+    assert frontend.backend == "build"
+
+    async def run() -> None:
+        requires = await frontend.get_requires_for_build_wheel()
+        assert requires.requires == ()
+        assert (await frontend.get_requires_for_build_editable()).requires == ()
+        assert (await frontend.get_requires_for_build_sdist()).requires == ()
+        assert await frontend.prepare_metadata_for_build_wheel(tmp_path / "meta") is None
+        assert await frontend.prepare_metadata_for_build_editable(tmp_path / "meta") is None
+        wheel = await frontend.build_wheel(tmp_path / "dist")
+        assert wheel.wheel.name == "demo_pkg_inline-1.0.0-py3-none-any.whl"
+        assert " build_wheel " in wheel.out
+        editable = await frontend.build_editable(tmp_path / "dist")
+        assert editable.wheel.name == "demo_pkg_inline-1.0.0-py3-none-any.whl"
+        sdist = await frontend.build_sdist(tmp_path / "dist")
+        assert sdist.sdist.name == "demo_pkg_inline-1.0.0.tar.gz"
+
+    asyncio.run(run())
+
+
+def test_async_concurrent_calls(demo_pkg_inline: Path, tmp_path: Path) -> None:
+    frontend = AsyncFrontend(*AsyncFrontend.create_args_from_folder(demo_pkg_inline)[:-1])
+
+    async def run() -> list[str]:
+        results = await asyncio.gather(*(frontend.build_wheel(tmp_path / str(at)) for at in range(8)))
+        return [r.wheel.name for r in results]
+
+    assert asyncio.run(run()) == ["demo_pkg_inline-1.0.0-py3-none-any.whl"] * 8
+
+
+def test_async_prepare_metadata(local_builder: Callable[[str], Path]) -> None:
+    tmp_path = local_builder(
+        """
+        import os
+        def prepare_metadata_for_build_wheel(metadata_directory, config_settings=None):
+            os.mkdir(os.path.join(metadata_directory, "a-1.dist-info"))
+            return "a-1.dist-info"
+        def prepare_metadata_for_build_editable(metadata_directory, config_settings=None):
+            return None
+        def build_sdist(sdist_directory, config_settings=None):
+            return 1
+        """
+    )
+    frontend = AsyncFrontend(*AsyncFrontend.create_args_from_folder(tmp_path)[:-1])
+    meta = tmp_path / "meta"
+
+    result = asyncio.run(frontend.prepare_metadata_for_build_wheel(meta))
+    assert result is not None
+    assert result.metadata == meta / "a-1.dist-info"
+    assert asyncio.run(frontend.prepare_metadata_for_build_editable(meta)) is None
+    with pytest.raises(
+        BackendFailed, match="'build_sdist' on 'build_tester' returned 1 but expected type <class 'str'>"
+    ):
+        asyncio.run(frontend.build_sdist(tmp_path / "dist"))
+    with pytest.raises(RuntimeError, match="the project root and the metadata directory can't be the same"):
+        asyncio.run(frontend.prepare_metadata_for_build_wheel(tmp_path))
+
+
+def test_async_bad_return(local_builder: Callable[[str], Path]) -> None:
+    tmp_path = local_builder(
+        """
+        def get_requires_for_build_wheel(config_settings=None):
+            return [1]
+        def prepare_metadata_for_build_wheel(metadata_directory, config_settings=None):
+            return 1
+        """
+    )
+    frontend = AsyncFrontend(*AsyncFrontend.create_args_from_folder(tmp_path)[:-1])
+    with pytest.raises(BackendFailed, match="expected type 'list of string'"):
+        asyncio.run(frontend.get_requires_for_build_wheel())
+    with pytest.raises(BackendFailed, match="expected type <class 'str'>"):
+        asyncio.run(frontend.prepare_metadata_for_build_wheel(tmp_path / "meta"))
+
+
+def test_async_backend_failure(local_builder: Callable[[str], Path]) -> None:
+    tmp_path = local_builder("def build_wheel(wheel_directory, config_settings=None, metadata_directory=None): 1/0")
+    frontend = AsyncFrontend(*AsyncFrontend.create_args_from_folder(tmp_path)[:-1])
+    with pytest.raises(BackendFailed) as context:
+        asyncio.run(frontend.build_wheel(tmp_path / "dist"))
+    assert context.value.exc_type == "ZeroDivisionError"
+    assert "Traceback" in context.value.err
+
+
+def test_async_cancel_kills_backend(local_builder: Callable[[str], Path]) -> None:
+    tmp_path = local_builder("import time\ndef build_sdist(sdist_directory, config_settings=None): time.sleep(60)")
+    frontend = AsyncFrontend(*AsyncFrontend.create_args_from_folder(tmp_path)[:-1])
+
+    async def run() -> None:
+        await asyncio.wait_for(frontend.build_sdist(tmp_path / "dist"), timeout=1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(run())
+
+
+def test_async_backend_obj(tmp_path: Path) -> None:
+    frontend = AsyncFrontend(tmp_path, (), "build_tester", "backend", ())
+    assert frontend.backend == "build_tester:backend"
+    assert frontend.backend_args[1:] == ["False", "build_tester", "backend"]
+
+
+@pytest.mark.parametrize("handshake", [True, False])
+def test_async_optional_hooks_from_handshake(
+    local_builder: Callable[[str], Path], tmp_path: Path, mocker: pytest_mock.MockerFixture, handshake: bool
+) -> None:
+    tmp_path = local_builder("def get_requires_for_build_sdist(config_settings=None): return ['a']")
+    if not handshake:
+        mocker.patch("pyproject_api._frontend.split_handshake", side_effect=lambda out: (out, None))
+    frontend = AsyncFrontend(*AsyncFrontend.create_args_from_folder(tmp_path)[:-1])
+    send = mocker.spy(frontend, "_send")
+
+    async def run() -> None:
+        assert (await frontend.get_requires_for_build_wheel()).requires == ()
+        assert await frontend.prepare_metadata_for_build_wheel(tmp_path / "meta") is None
+        assert [str(r) for r in (await frontend.get_requires_for_build_sdist()).requires] == ["a"]
+
+    asyncio.run(run())
+    assert [c.args[0] for c in send.call_args_list] == ["get_requires_for_build_wheel"] + (
+        ["get_requires_for_build_sdist"] if handshake else ["_optional_hooks", "get_requires_for_build_sdist"]
+    )
+    assert (frontend.backend_info is None) is not handshake
+    assert frontend.last_timing is not None
+    assert frontend.last_timing.hook_start is not None
+
+
+def test_async_backend_failure_without_hooks(local_builder: Callable[[str], Path]) -> None:
+    tmp_path = local_builder("def get_requires_for_build_wheel(config_settings=None): raise ValueError('bad')")
+    frontend = AsyncFrontend(*AsyncFrontend.create_args_from_folder(tmp_path)[:-1])
+    with pytest.raises(BackendFailed) as context:
+        asyncio.run(frontend.get_requires_for_build_wheel())
+    assert context.value.exc_type == "ValueError"
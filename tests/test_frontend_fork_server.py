@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import os
+import sys
+from textwrap import dedent
+from typing import TYPE_CHECKING, Literal
+
+import pytest
+
+from pyproject_api import BackendFailed, ForkServerFrontend
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+pytestmark = pytest.mark.skipif(sys.platform != "linux", reason="the fork server is only available on Linux")
+
+_COUNTER = """
+import os
+
+calls = []
+
+
+def get_requires_for_build_wheel(config_settings=None):
+    calls.append(None)
+    return [str(len(calls)), str(os.getpid()), {version!r}]
+
+
+def get_requires_for_build_sdist(config_settings=None):
+    os._exit(3)
+"""
+
+
+def _report(frontend: ForkServerFrontend) -> tuple[str, ...]:
+    """:return: the number of calls the backend saw, the process id it ran in and the version of the backend"""
+    return tuple(requirement.name for requirement in frontend.get_requires_for_build_wheel().requires)
+
+
+@pytest.mark.parametrize("transport", ["file", "pipe"])
+def test_fork_server_isolates_calls(local_builder: Callable[[str], Path], transport: Literal["file", "pipe"]) -> None:
+    folder = local_builder(_COUNTER.format(version="v1"))
+    with ForkServerFrontend(*ForkServerFrontend.create_args_from_folder(folder)[:-1], result_transport=transport) as fe:
+        first = _report(fe)
+        server = fe.pid
+        result = fe.get_requires_for_build_wheel()
+        assert fe.pid == server
+
+    second = tuple(requirement.name for requirement in result.requires)
+    assert first[0] == second[0] == "1"  # every call starts from the state after the import
+    assert first[1] != second[1] != str(server)
+    assert "Backend: run command get_requires_for_build_wheel" in result.out
+    assert "started backend" not in result.out
+    assert fe.pid is None
+
+
+def test_fork_server_child_dies(local_builder: Callable[[str], Path]) -> None:
+    folder = local_builder(_COUNTER.format(version="v1"))
+    with ForkServerFrontend(*ForkServerFrontend.create_args_from_folder(folder)[:-1]) as fe:
+        with pytest.raises(BackendFailed) as context:
+            fe.get_requires_for_build_sdist()
+        assert (context.value.code, context.value.exc_type) == (3, "ChildProcessError")
+        assert "exited with 3" in context.value.err
+        assert _report(fe)[0] == "1"
+
+
+@pytest.mark.parametrize("transport", ["file", "pipe"])
+def test_fork_server_restarts_on_backend_change(
+    local_builder: Callable[[str], Path], transport: Literal["file", "pipe"]
+) -> None:
+    folder = local_builder(_COUNTER.format(version="v1"))
+    with ForkServerFrontend(*ForkServerFrontend.create_args_from_folder(folder)[:-1], result_transport=transport) as fe:
+        assert _report(fe)[2] == "v1"
+        server = fe.pid
+        assert _report(fe)[2] == "v1"
+        assert fe.pid == server
+
+        backend = folder / "build_tester.py"
+        backend.write_text(dedent(_COUNTER.format(version="v2")))
+        os.utime(backend, ns=(0, 0))  # differs from the previous modification time, even on coarse file systems
+        assert _report(fe)[2] == "v2"
+        assert fe.pid != server
+
+
+def test_fork_server_builds(tmp_path: Path, demo_pkg_inline: Path) -> None:
+    with ForkServerFrontend(*ForkServerFrontend.create_args_from_folder(demo_pkg_inline)[:-1]) as fe:
+        assert fe.build_wheel(tmp_path).wheel.name == "demo_pkg_inline-1.0.0-py3-none-any.whl"
+        assert fe.build_sdist(tmp_path).sdist.name == "demo_pkg_inline-1.0.0.tar.gz"
+        assert fe.backend_args[1] == "fork"
+
+
+def test_fork_server_prewarm(local_builder: Callable[[str], Path]) -> None:
+    folder = local_builder(_COUNTER.format(version="v1"))
+    with ForkServerFrontend(*ForkServerFrontend.create_args_from_folder(folder)[:-1], prewarm=True) as fe:
+        server = fe.pid
+        assert server is not None
+        assert _report(fe)[0] == "1"
+        assert fe.pid == server
+
+
+def test_fork_server_needs_linux(mocker: MockerFixture, tmp_path: Path) -> None:
+    mocker.patch.object(sys, "platform", "darwin")
+    with pytest.raises(RuntimeError, match="only available on Linux, not on darwin"):
+        ForkServerFrontend(tmp_path, (), "build_tester", None, ())
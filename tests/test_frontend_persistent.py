@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Literal
+
+import pytest
+
+from pyproject_api import PersistentSubprocessFrontend
+from pyproject_api._frontend import BackendFailed
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from pathlib import Path
+
+
+@pytest.fixture
+def frontend(demo_pkg_inline: Path) -> Iterator[PersistentSubprocessFrontend]:
+    with PersistentSubprocessFrontend(
+        *PersistentSubprocessFrontend.create_args_from_folder(demo_pkg_inline)[:-1]
+    ) as fe:
+        yield fe
+
+
+def test_persistent_reuses_backend(frontend: PersistentSubprocessFrontend, tmp_path: Path) -> None:
+    assert frontend.pid is None
+    assert frontend.optional_hooks["build_editable"] is True
+    pid = frontend.pid
+    assert pid is not None
+
+    wheel = frontend.build_wheel(tmp_path)
+    assert wheel.wheel.name == "demo_pkg_inline-1.0.0-py3-none-any.whl"
+    assert " build_wheel " in wheel.out
+    assert " build_sdist " not in wheel.out
+    assert not wheel.err
+
+    sdist = frontend.build_sdist(tmp_path)
+    assert sdist.sdist.name == "demo_pkg_inline-1.0.0.tar.gz"
+    assert " build_sdist " in sdist.out
+    assert " build_wheel " not in sdist.out
+
+    assert frontend.pid == pid
+
+
+def test_persistent_close(frontend: PersistentSubprocessFrontend) -> None:
+    frontend.close()  # no backend running yet
+    result, out, _ = frontend.send_cmd("_optional_hooks")
+    assert result["build_editable"] is True
+    assert "started backend" in out
+    frontend.close()
+    assert frontend.pid is None
+    frontend.close()
+
+
+def test_persistent_backend_failure_does_not_stop_backend(local_builder: Callable[[str], Path]) -> None:
+    tmp_path = local_builder("def get_requires_for_build_wheel(config_settings=None): raise ValueError('bad')")
+    with PersistentSubprocessFrontend(*PersistentSubprocessFrontend.create_args_from_folder(tmp_path)[:-1]) as fe:
+        with pytest.raises(BackendFailed) as context:
+            fe.get_requires_for_build_wheel()
+        assert context.value.exc_type == "ValueError"
+        assert "Traceback" in context.value.err
+        pid = fe.pid
+
+        with pytest.raises(BackendFailed) as context:
+            fe.send_cmd("missing_command")
+        assert context.value.exc_type == "MissingCommand"
+        assert "Traceback" not in context.value.err
+        assert fe.pid == pid
+
+
+def test_persistent_restarts_dead_backend(local_builder: Callable[[str], Path]) -> None:
+    tmp_path = local_builder("import os\ndef get_requires_for_build_wheel(config_settings=None): os._exit(3)")
+    with PersistentSubprocessFrontend(*PersistentSubprocessFrontend.create_args_from_folder(tmp_path)[:-1]) as fe:
+        with pytest.raises(BackendFailed, match="is missing"):
+            fe.get_requires_for_build_wheel()
+        assert fe.pid is None
+
+        result, out, _ = fe.send_cmd("_optional_hooks")
+        assert result["get_requires_for_build_wheel"] is True
+        assert "started backend" in out
+
+
+def test_persistent_missing_backend(local_builder: Callable[[str], Path]) -> None:
+    tmp_path = local_builder("")
+    (tmp_path / "pyproject.toml").write_text('[build-system]\nrequires=[]\nbuild-backend = "build_tester"')
+    fe = PersistentSubprocessFrontend(*PersistentSubprocessFrontend.create_args_from_folder(tmp_path)[:-1])
+    with fe, pytest.raises(BackendFailed) as context:
+        fe.build_wheel(tmp_path / "wheel")
+    exc = context.value
+    assert exc.exc_type == "RuntimeError"
+    assert "failed to start backend" in exc.err
+
+
+def test_persistent_prewarm(demo_pkg_inline: Path) -> None:
+    args = PersistentSubprocessFrontend.create_args_from_folder(demo_pkg_inline)[:-1]
+    with PersistentSubprocessFrontend(*args, prewarm=True) as fe:
+        pid = fe.pid
+        assert pid is not None  # started before any hook
+        fe.prewarm()
+        assert fe.pid == pid
+
+        result = fe.get_requires_for_build_wheel()
+        assert fe.pid == pid
+        assert "started backend" in result.out
+        assert fe.last_timing is not None
+        assert fe.last_timing.spawn_start is not None  # the first hook still accounts for the start of the backend
+
+
+def test_persistent_prewarm_missing_backend(local_builder: Callable[[str], Path]) -> None:
+    tmp_path = local_builder("")
+    (tmp_path / "pyproject.toml").write_text('[build-system]\nrequires=[]\nbuild-backend = "build_tester"')
+    fe = PersistentSubprocessFrontend(*PersistentSubprocessFrontend.create_args_from_folder(tmp_path)[:-1])
+    fe.prewarm()
+    with fe, pytest.raises(BackendFailed) as context:  # the failure is reported by the first hook
+        fe.build_wheel(tmp_path / "wheel")
+    assert "failed to start backend" in context.value.err
+
+
+def test_persistent_result_pipe(demo_pkg_inline: Path, tmp_path: Path) -> None:
+    args = PersistentSubprocessFrontend.create_args_from_folder(demo_pkg_inline)[:-1]
+    with PersistentSubprocessFrontend(*args, result_transport="pipe") as frontend:
+        assert frontend.build_wheel(tmp_path).wheel.name == "demo_pkg_inline-1.0.0-py3-none-any.whl"
+        assert frontend.build_sdist(tmp_path).sdist.name == "demo_pkg_inline-1.0.0.tar.gz"
+        with pytest.raises(BackendFailed) as context:
+            frontend.send_cmd("missing_command")
+        assert context.value.exc_type == "MissingCommand"
+    assert not list(tmp_path.glob("*.json"))
+
+
+def test_persistent_cmd_status_wait(local_builder: Callable[[str], Path]) -> None:
+    tmp_path = local_builder("import time\ndef build_sdist(sdist_directory, config_settings=None): time.sleep(0.5)")
+    args = PersistentSubprocessFrontend.create_args_from_folder(tmp_path)[:-1]
+    with PersistentSubprocessFrontend(*args) as frontend:
+        result_file = tmp_path / "x"
+        msg = json.dumps({
+            "cmd": "build_sdist",
+            "kwargs": {"sdist_directory": str(tmp_path)},
+            "result": str(result_file),
+        })
+        with frontend._send_msg("build_sdist", result_file, msg) as status:  # ruff:ignore[private-member-access]
+            assert status.wait(0.01) is False
+            assert not status.done
+            assert status.wait(10) is True
+            assert status.done
+        out, _ = status.out_err()
+        assert "Backend: Wrote response" in out
+
+
+def test_persistent_stderr_stays_with_its_call(local_builder: Callable[[str], Path]) -> None:
+    tmp_path = local_builder(
+        """
+        import sys
+        calls = 0
+        def get_requires_for_build_wheel(config_settings=None):
+            global calls
+            calls += 1
+            for at in range(200):
+                print(f"call {calls} line {at}", file=sys.stderr)
+            return [f"pkg{calls}"]
+        """
+    )
+    with PersistentSubprocessFrontend(*PersistentSubprocessFrontend.create_args_from_folder(tmp_path)[:-1]) as fe:
+        for call in range(1, 6):
+            result = fe.get_requires_for_build_wheel()
+            assert [str(r) for r in result.requires] == [f"pkg{call}"]
+            lines = result.err.splitlines()
+            assert lines == [f"call {call} line {at}" for at in range(200)]
+
+
+def test_persistent_fake_response_line(local_builder: Callable[[str], Path]) -> None:
+    tmp_path = local_builder(
+        """
+        import time
+        def get_requires_for_build_wheel(config_settings=None):
+            print("Backend: Wrote response {} to /tmp/x.json")
+            print("pyproject-api-done:not-the-marker")
+            time.sleep(0.2)
+            return ["a"]
+        """
+    )
+    with PersistentSubprocessFrontend(*PersistentSubprocessFrontend.create_args_from_folder(tmp_path)[:-1]) as fe:
+        result = fe.get_requires_for_build_wheel()
+    assert [str(r) for r in result.requires] == ["a"]
+    assert "Backend: Wrote response {} to /tmp/x.json" in result.out
+
+
+@pytest.mark.parametrize("transport", ["file", "pipe"])
+def test_persistent_output_without_trailing_newline(
+    local_builder: Callable[[str], Path], transport: Literal["file", "pipe"]
+) -> None:
+    tmp_path = local_builder(
+        """
+        import sys
+        def get_requires_for_build_wheel(config_settings=None):
+            sys.stdout.write("partial out")
+            sys.stderr.write("partial err")
+            return ["a"]
+        def get_requires_for_build_sdist(config_settings=None):
+            print("line out")
+            print("line err", file=sys.stderr)
+            print(file=sys.stderr)
+            print("end", file=sys.stderr)
+            return ["b"]
+        """
+    )
+    args = PersistentSubprocessFrontend.create_args_from_folder(tmp_path)[:-1]
+    lines: list[str] = []
+    with PersistentSubprocessFrontend(*args, result_transport=transport) as fe, fe.stream_output(err=lines.append):
+        first = fe.get_requires_for_build_wheel()
+        second = fe.get_requires_for_build_sdist()
+    assert [str(r) for r in first.requires] == ["a"]
+    assert first.err == "partial err"
+    assert "partial out" in first.out
+    assert second.err == "line err\n\nend\n"
+    assert lines == ["partial err\n", "line err\n", "\n", "end\n"]
+    assert "\nline out\n" in second.out
+    assert "partial" not in second.out
+
+
+@pytest.mark.parametrize("transport", ["file", "pipe"])
+def test_persistent_concurrent_hooks_take_turns(
+    local_builder: Callable[[str], Path], transport: Literal["file", "pipe"]
+) -> None:
+    tmp_path = local_builder(
+        """
+        import sys, time
+        def get_requires_for_build_wheel(config_settings=None):
+            print("wheel start", file=sys.stderr)
+            time.sleep(0.2)
+            print("wheel end", file=sys.stderr)
+            return ["a"]
+        def get_requires_for_build_sdist(config_settings=None):
+            print("sdist start", file=sys.stderr)
+            time.sleep(0.2)
+            print("sdist end", file=sys.stderr)
+            return ["b"]
+        """
+    )
+    args = PersistentSubprocessFrontend.create_args_from_folder(tmp_path)[:-1]
+    with PersistentSubprocessFrontend(*args, result_transport=transport) as fe, ThreadPoolExecutor(2) as executor:
+        wheel = executor.submit(fe.get_requires_for_build_wheel)
+        sdist = executor.submit(fe.get_requires_for_build_sdist)
+        results = wheel.result(), sdist.result()
+    for result, (requirement, name) in zip(results, [("a", "wheel"), ("b", "sdist")], strict=True):
+        assert [str(r) for r in result.requires] == [requirement]
+        assert result.err == f"{name} start\n{name} end\n"  # the hooks ran one after the other
+
+
+def test_persistent_batch(frontend: PersistentSubprocessFrontend, tmp_path: Path) -> None:
+    pid = frontend.pid
+    requires, wheel = frontend.batch([
+        ("get_requires_for_build_wheel", {}),
+        ("build_wheel", {"wheel_directory": tmp_path}),
+    ])
+    assert requires.value == []
+    assert wheel.value == "demo_pkg_inline-1.0.0-py3-none-any.whl"
+    assert " build_wheel " in wheel.out
+    assert " build_wheel " not in requires.out
+    assert frontend.build_sdist(tmp_path).sdist.name == "demo_pkg_inline-1.0.0.tar.gz"
+    assert pid is None
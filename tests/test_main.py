@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -107,3 +110,133 @@ def test_parse_args(
         subprocess_frontend.return_value.build_editable.assert_called_once_with(outdir)
         assert "editable wheel out" in captured.out
         assert "editable wheel err" in captured.err
+
+
+def test_parallel_build(capsys: pytest.CaptureFixture[str], tmp_path: Path, demo_pkg_inline: Path) -> None:
+    outdir = tmp_path / "dist"
+
+    pyproject_api.__main__.main([str(demo_pkg_inline), "-o", str(outdir), "-s", "-w", "-e", "--parallel"])
+
+    assert sorted(i.name for i in outdir.iterdir()) == [
+        "demo_pkg_inline-1.0.0-py3-none-any.whl",
+        "demo_pkg_inline-1.0.0.tar.gz",
+    ]
+    out = capsys.readouterr().out
+    for name, hook in (("sdist", "build_sdist"), ("wheel", "build_wheel"), ("editable wheel", "build_editable")):
+        block = out[out.index(f"Building {name}...") :]
+        block = block[: block.index(f"Built {name} ")]
+        assert f" {hook} " in block  # the output of the hook is printed together with its header
+        assert not any(
+            f" {other} " in block for other in ("build_sdist", "build_wheel", "build_editable") if other != hook
+        )
+    assert "Built 3 distribution(s) in " in out
+
+
+@pytest.fixture
+def monorepo(tmp_path: Path, demo_pkg_inline: Path) -> Path:
+    for name in ("a", "b"):
+        shutil.copytree(demo_pkg_inline, tmp_path / "packages" / name)
+    missing = tmp_path / "broken" / "missing"
+    missing.mkdir(parents=True)
+    (missing / "pyproject.toml").write_text(
+        '[build-system]\nrequires=[]\nbuild-backend = "missing"\nbackend-path=["."]'
+    )
+    invalid = tmp_path / "broken" / "invalid"
+    invalid.mkdir()
+    (invalid / "pyproject.toml").write_text("[build-system")
+    return tmp_path
+
+
+def test_build_many(monorepo: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    outdir, summary = monorepo / "dist", monorepo / "report" / "summary.json"
+    args = [str(monorepo / "packages" / "*"), "-w", "-o", str(outdir), "--workers", "2", "--summary", str(summary)]
+
+    assert pyproject_api.__main__.main(args) == 0
+
+    out = capsys.readouterr().out
+    assert out.count(" build_wheel ") == 2
+    assert "Built 2 distribution(s) of 2/2 project(s) in " in out
+    projects = json.loads(summary.read_text())["projects"]
+    assert [(p["srcdir"], p["status"], p["error"]) for p in projects] == [
+        (str(monorepo / "packages" / "a"), "ok", None),
+        (str(monorepo / "packages" / "b"), "ok", None),
+    ]
+    wheel = projects[0]["artifacts"]["wheel"]
+    assert wheel["path"] == str(outdir / "demo_pkg_inline-1.0.0-py3-none-any.whl")
+    assert wheel["duration"] <= projects[0]["duration"]
+    assert [i.name for i in outdir.iterdir()] == ["demo_pkg_inline-1.0.0-py3-none-any.whl"]
+
+
+def test_build_many_distributions_sequential(
+    monorepo: Path, capsys: pytest.CaptureFixture[str], mocker: pytest_mock.MockerFixture
+) -> None:
+    executor = mocker.patch("pyproject_api.__main__.ThreadPoolExecutor", wraps=ThreadPoolExecutor)
+    outdir = monorepo / "dist"
+    args = [str(monorepo / "packages" / "*"), "-s", "-w", "-o", str(outdir), "--workers", "2"]
+
+    assert pyproject_api.__main__.main(args) == 0
+
+    assert executor.call_args_list == [mocker.call(max_workers=2)]  # only the projects are spread, not -j
+    out = capsys.readouterr().out
+    for project in out.split("Project ")[1:]:
+        assert project.index(" build_sdist ") < project.index("Building wheel...") < project.index(" build_wheel ")
+    assert sorted(i.name for i in outdir.iterdir()) == [
+        "demo_pkg_inline-1.0.0-py3-none-any.whl",
+        "demo_pkg_inline-1.0.0.tar.gz",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("fail_fast", "statuses"),
+    [
+        pytest.param(False, ["failed", "failed", "ok"], id="all"),
+        pytest.param(True, ["failed", "skipped", "skipped"], id="fail-fast"),
+    ],
+)
+def test_build_many_failure(
+    monorepo: Path, capsys: pytest.CaptureFixture[str], fail_fast: bool, statuses: list[str]
+) -> None:
+    manifest = monorepo / "manifest.txt"
+    manifest.write_text("# built in order\nbroken/invalid\n\nbroken/missing\npackages/a\npackages/a\n")
+    summary = monorepo / "summary.json"
+    args = ["--manifest", str(manifest), "-w", "--summary", str(summary), *(["-x"] if fail_fast else [])]
+
+    assert pyproject_api.__main__.main(args) == 1
+
+    projects = json.loads(summary.read_text())["projects"]
+    assert [p["status"] for p in projects] == statuses
+    assert projects[0]["error"].startswith("TOMLDecodeError: ")
+    captured = capsys.readouterr()
+    assert f"Failed {monorepo / 'broken' / 'invalid'}: TOMLDecodeError: " in captured.out
+    if fail_fast:
+        assert f"Skipped {monorepo / 'packages' / 'a'}\n" in captured.out
+    else:
+        assert projects[1]["error"].startswith("RuntimeError: Backend response file ")
+        assert "failed to start backend" in captured.err
+        assert projects[2]["artifacts"]["wheel"]["path"].endswith("demo_pkg_inline-1.0.0-py3-none-any.whl")
+
+
+def test_build_failure(monorepo: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert pyproject_api.__main__.main([str(monorepo / "broken" / "missing"), "-s"]) == 1
+
+    captured = capsys.readouterr()
+    assert "Built 0 distribution(s) in " in captured.out
+    assert "packaging backend failed" in captured.err
+
+
+@pytest.mark.parametrize(
+    ("args", "message"),
+    [
+        pytest.param(["missing-*"], "no source directory matches 'missing-*'", id="no-match"),
+        pytest.param(["--manifest", "missing.txt"], "No such file or directory", id="no-manifest"),
+        pytest.param(["--workers", "0"], "--workers must be at least 1", id="workers"),
+    ],
+)
+def test_build_many_bad_arguments(
+    monorepo: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch, args: list[str], message: str
+) -> None:
+    monkeypatch.chdir(monorepo)
+    with pytest.raises(SystemExit) as context:
+        pyproject_api.__main__.main(args)
+    assert context.value.code == 2
+    assert message in capsys.readouterr().err
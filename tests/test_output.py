@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import gc
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pyproject_api import CapturedOutput, OutputLimit
+from pyproject_api._output import OutputCapture
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _capture(limit: OutputLimit | None, lines: list[str]) -> str:
+    capture = OutputCapture(limit)
+    for line in lines:
+        capture.append(line)
+    return capture.finish()
+
+
+@pytest.mark.parametrize(
+    "limit",
+    [
+        pytest.param(None, id="unlimited"),
+        pytest.param(OutputLimit(head=4, tail=4), id="within"),
+    ],
+)
+def test_output_capture_in_memory(limit: OutputLimit | None) -> None:
+    result = _capture(limit, ["a\n", "b\n", "c\n", "d\n"])
+    assert result == "a\nb\nc\nd\n"
+    assert not isinstance(result, CapturedOutput)
+
+
+def test_output_capture_spill(tmp_path: Path) -> None:
+    lines = [f"line {i}\n" for i in range(1000)]
+    result = _capture(OutputLimit(head=10, tail=12, directory=tmp_path), lines)
+    assert isinstance(result, CapturedOutput)
+    assert result.path.parent == tmp_path
+    dropped = len("".join(lines)) - 22
+    assert result == f"line 0\nlin\n[{dropped} characters not shown, see {result.path}]\n98\nline 999\n"
+    assert result.read() == "".join(lines)
+
+
+def test_output_capture_long_line(tmp_path: Path) -> None:
+    result = _capture(OutputLimit(head=2, tail=2, directory=tmp_path), ["x" * 10 + "\n", "y\n"])
+    assert isinstance(result, CapturedOutput)
+    assert result.startswith("xx\n[")
+    assert result.endswith("]\ny\n")
+    assert result.read() == "xxxxxxxxxx\ny\n"
+
+
+def test_output_capture_starts_over(tmp_path: Path) -> None:
+    capture = OutputCapture(OutputLimit(head=1, tail=1, directory=tmp_path))
+    for line in ("ab\n", "cd\n"):
+        capture.append(line)
+    assert isinstance(capture.finish(), CapturedOutput)
+    capture.append("e")
+    capture.limit = None
+    capture.append("f\n")
+    assert capture.finish() == "ef\n"
+
+
+def test_output_capture_limit_lifted(tmp_path: Path) -> None:
+    capture = OutputCapture(OutputLimit(head=1, tail=2, directory=tmp_path))
+    capture.append("abc")
+    capture.limit = None
+    capture.append("def")
+    assert capture.finish() == "abcdef"
+
+
+def test_captured_output_file_removed() -> None:
+    result = _capture(OutputLimit(head=1, tail=1), ["abc\n"])
+    assert isinstance(result, CapturedOutput)
+    derived = result.derive("other")
+    path = result.path
+    del result
+    gc.collect()
+    assert derived.read() == "abc\n"  # the file lives as long as any text of the output
+    del derived
+    gc.collect()
+    assert not path.exists()
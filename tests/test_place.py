@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import errno
+import os
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pyproject_api import Placement, place_artifact
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+_UNSUPPORTED = OSError(errno.EOPNOTSUPP, "not supported")
+
+
+@pytest.fixture
+def artifact(tmp_path: Path) -> Path:
+    path = tmp_path / "build" / "demo-1.0-py3-none-any.whl"
+    path.parent.mkdir()
+    path.write_bytes(b"wheel content")
+    path.chmod(0o640)
+    return path
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="reflinks are cloned with an ioctl")
+def test_place_reflink(mocker: MockerFixture, artifact: Path, tmp_path: Path) -> None:
+    ioctl = mocker.patch("pyproject_api._place.fcntl.ioctl")
+    placement = place_artifact(artifact, tmp_path / "target")
+    assert placement == Placement(tmp_path / "target" / artifact.name, "reflink")
+    assert ioctl.call_args.args[1] == 0x40049409
+    assert placement.path.stat().st_mode & 0o777 == 0o640
+
+
+def test_place_hardlink(mocker: MockerFixture, artifact: Path, tmp_path: Path) -> None:
+    mocker.patch("pyproject_api._place._reflink", side_effect=_UNSUPPORTED)
+    placement = place_artifact(artifact, tmp_path / "target")
+    assert placement.method == "hardlink"
+    assert placement.path.samefile(artifact)
+
+
+@pytest.mark.skipif(not hasattr(os, "copy_file_range"), reason="copy_file_range is not available")
+def test_place_copy_file_range(mocker: MockerFixture, artifact: Path, tmp_path: Path) -> None:
+    mocker.patch("pyproject_api._place._reflink", side_effect=_UNSUPPORTED)
+    placement = place_artifact(artifact, tmp_path / "target", hardlink=False)
+    assert placement.method == "copy_file_range"
+    assert not placement.path.samefile(artifact)
+    assert placement.path.read_bytes() == b"wheel content"
+    assert placement.path.stat().st_mode & 0o777 == 0o640
+
+
+def test_place_copy(mocker: MockerFixture, artifact: Path, tmp_path: Path) -> None:
+    for method in ("_reflink", "_hardlink", "_copy_file_range"):
+        mocker.patch(f"pyproject_api._place.{method}", side_effect=OSError(errno.EXDEV, "cross device"))
+    target = tmp_path / "target"
+    target.mkdir()
+    (target / artifact.name).write_bytes(b"previous build")
+
+    placement = place_artifact(artifact, target)
+
+    assert placement.method == "copy"
+    assert placement.path.read_bytes() == b"wheel content"
+    assert [i.name for i in target.iterdir()] == [artifact.name]  # replaced, no staging file left behind
+
+
+def test_place_fails(mocker: MockerFixture, artifact: Path, tmp_path: Path) -> None:
+    for method in ("_reflink", "_hardlink", "_copy_file_range"):
+        mocker.patch(f"pyproject_api._place.{method}", side_effect=OSError(errno.EXDEV, "cross device"))
+
+    def copy2(_: Path, target: Path) -> None:
+        target.write_bytes(b"partial")
+        raise OSError(errno.ENOSPC, "no space left")
+
+    mocker.patch("pyproject_api._place.shutil.copy2", side_effect=copy2)
+    with pytest.raises(OSError, match="no space left"):
+        place_artifact(artifact, tmp_path / "target")
+    assert not list((tmp_path / "target").iterdir())
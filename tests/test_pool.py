@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from threading import Event, Thread, current_thread, main_thread
+from time import monotonic, sleep
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pyproject_api import BackendPool, PersistentSubprocessFrontend, PoolStats
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from pyproject_api._via_persistent_subprocess import _BackendProcess
+
+
+def wait_for(check: Callable[[], bool], timeout: float = 10) -> None:
+    end = monotonic() + timeout
+    while not check():  # pragma: no branch
+        assert monotonic() < end, "condition not met in time"
+        sleep(0.01)  # pragma: no cover
+
+
+def make_frontend(root: Path, pool: BackendPool) -> PersistentSubprocessFrontend:
+    return PersistentSubprocessFrontend(*PersistentSubprocessFrontend.create_args_from_folder(root)[:-1], pool=pool)
+
+
+def test_pool_hit_after_miss(demo_pkg_inline: Path, tmp_path: Path) -> None:
+    with BackendPool(idle_timeout=None) as pool:
+        with make_frontend(demo_pkg_inline, pool) as first:
+            assert first.build_wheel(tmp_path).wheel.exists()
+        assert pool.stats == PoolStats(hits=0, misses=1, evictions=0)
+
+        wait_for(lambda: pool.idle == 1)
+        with make_frontend(demo_pkg_inline, pool) as second:
+            result = second.build_sdist(tmp_path)
+        assert result.sdist.exists()
+        assert "started backend" in result.out
+        assert pool.stats == PoolStats(hits=1, misses=1, evictions=0)
+        wait_for(lambda: pool.idle == 1)
+    assert pool.idle == 0
+
+
+def test_pool_lru_eviction(demo_pkg_inline: Path, tmp_path: Path) -> None:
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "pyproject.toml").write_text((demo_pkg_inline / "pyproject.toml").read_text())
+    (other / "build.py").write_text((demo_pkg_inline / "build.py").read_text())
+    with BackendPool(max_workers=2, idle_timeout=None) as pool:
+        with make_frontend(demo_pkg_inline, pool) as frontend:
+            frontend.get_requires_for_build_sdist()
+        wait_for(lambda: pool.idle == 1)
+        with make_frontend(other, pool) as frontend:
+            frontend.get_requires_for_build_sdist()
+        wait_for(lambda: pool.stats.evictions == 1)
+        assert pool.idle == 1
+        assert pool.stats == PoolStats(hits=0, misses=2, evictions=1)
+
+
+def test_pool_idle_timeout(demo_pkg_inline: Path) -> None:
+    with BackendPool(idle_timeout=0.05) as pool:
+        with make_frontend(demo_pkg_inline, pool) as frontend:
+            frontend.get_requires_for_build_sdist()
+        wait_for(lambda: pool.stats.evictions == 1)
+        assert pool.idle == 0
+
+
+def test_pool_dead_idle_backend(demo_pkg_inline: Path) -> None:
+    with BackendPool(idle_timeout=None) as pool:
+        frontend = make_frontend(demo_pkg_inline, pool)
+        with frontend:
+            frontend.get_requires_for_build_sdist()
+        wait_for(lambda: pool.idle == 1)
+        idle = pool._idle[frontend.pool_key][0].backend  # ruff:ignore[private-member-access]
+        idle.process.kill()
+        idle.process.wait(10)
+        with make_frontend(demo_pkg_inline, pool) as frontend:
+            frontend.get_requires_for_build_sdist()
+        assert pool.stats == PoolStats(hits=0, misses=2, evictions=1)
+
+
+def test_pool_close_with_pending_start(demo_pkg_inline: Path) -> None:
+    frontend = make_frontend(demo_pkg_inline, BackendPool())
+    release = Event()
+    started: list[_BackendProcess] = []
+
+    def start() -> _BackendProcess:
+        if current_thread() is not main_thread():  # hold back the background replacement
+            release.wait(10)
+        started.append(frontend._spawn_backend())  # ruff:ignore[private-member-access]
+        return started[-1]
+
+    pool = BackendPool(idle_timeout=None)
+    pool.checkout(frontend.pool_key, start).close()
+    closer = Thread(target=pool.close)
+    closer.start()
+    wait_for(lambda: pool._closed)  # ruff:ignore[private-member-access]
+    release.set()
+    closer.join()
+
+    assert pool.idle == 0
+    assert len(started) == 2
+    assert all(not backend.alive for backend in started)
+    with pytest.raises(RuntimeError, match="backend pool is closed"):
+        pool.checkout(frontend.pool_key, start)
+
+
+def test_pool_invalid_size() -> None:
+    with pytest.raises(ValueError, match="max_workers must be at least 1, got 0"):
+        BackendPool(max_workers=0)
+
+
+def test_pool_limit_counts_checked_out(demo_pkg_inline: Path) -> None:
+    with BackendPool(max_workers=1, idle_timeout=None) as pool, make_frontend(demo_pkg_inline, pool) as frontend:
+        frontend.get_requires_for_build_sdist()
+        assert not pool._pending  # ruff:ignore[private-member-access] # the backend in use takes the only slot
+        pool.prewarm(frontend.pool_key, frontend._spawn_backend)  # ruff:ignore[private-member-access]
+        assert not pool._pending  # ruff:ignore[private-member-access]
+        assert pool.idle == 0
+
+
+def test_pool_prewarm(demo_pkg_inline: Path) -> None:
+    frontend = make_frontend(demo_pkg_inline, BackendPool())
+    release = Event()
+    starts: list[_BackendProcess] = []
+
+    def start() -> _BackendProcess:
+        release.wait(10)
+        starts.append(frontend._spawn_backend())  # ruff:ignore[private-member-access]
+        return starts[-1]
+
+    with BackendPool(idle_timeout=None) as pool:
+        pool.prewarm(frontend.pool_key, start)
+        pool.prewarm(frontend.pool_key, start)  # a start is already pending for the key
+        release.set()
+        wait_for(lambda: pool.idle == 1)
+        pool.prewarm(frontend.pool_key, start)  # already idle
+        assert len(starts) == 1
+        backend = pool.checkout(frontend.pool_key, start)
+        assert backend is starts[0]
+        assert pool.stats == PoolStats(hits=1, misses=0, evictions=0)
+        backend.close()
+    with pytest.raises(RuntimeError, match="backend pool is closed"):
+        pool.prewarm(frontend.pool_key, start)
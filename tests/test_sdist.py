@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import io
+import tarfile
+from typing import TYPE_CHECKING
+from zipfile import ZipFile
+
+import pytest
+
+from pyproject_api._sdist import static_metadata
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _sdist(path: Path, members: dict[str, bytes]) -> Path:
+    with tarfile.open(path, "w:gz") as tar:
+        for name, content in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return path
+
+
+def test_static_metadata(tmp_path: Path) -> None:
+    content = b"Metadata-Version: 2.4\nName: Demo.Pkg_x\nVersion: 1.0.0a1\nSummary: demo\n\nlong description"
+    sdist = _sdist(
+        tmp_path / "demo_pkg_x-1.0.0a1.tar.gz",
+        {"demo_pkg_x-1.0.0a1/src/PKG-INFO": b"", "demo_pkg_x-1.0.0a1/PKG-INFO": content},
+    )
+    assert static_metadata(sdist) == ("demo_pkg_x-1.0.0a1.dist-info", content)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        pytest.param(b"Metadata-Version: 2.1\nName: demo\nVersion: 1.0\n", id="old"),
+        pytest.param(b"Metadata-Version: 2.2\nName: demo\nVersion: 1.0\nDynamic: Requires-Dist\n", id="dynamic"),
+        pytest.param(b"Metadata-Version: 2.2\nVersion: 1.0\n", id="no-name"),
+        pytest.param(b"Metadata-Version: 2.2\nName: demo\nVersion: one\n", id="bad-version"),
+        pytest.param(b"Name: demo\nVersion: 1.0\n", id="no-metadata-version"),
+    ],
+)
+def test_static_metadata_not_static(tmp_path: Path, content: bytes) -> None:
+    assert static_metadata(_sdist(tmp_path / "demo-1.0.tar.gz", {"demo-1.0/PKG-INFO": content})) is None
+
+
+def test_static_metadata_no_pkg_info(tmp_path: Path) -> None:
+    sdist = _sdist(tmp_path / "demo-1.0.tar.gz", {"PKG-INFO": b"Metadata-Version: 2.2", "demo-1.0/setup.py": b""})
+    assert static_metadata(sdist) is None
+
+
+def test_static_metadata_zip(tmp_path: Path) -> None:
+    sdist = tmp_path / "demo-1.0.zip"
+    with ZipFile(sdist, "w") as zip_file:
+        zip_file.writestr("demo-1.0/PKG-INFO", "Metadata-Version: 2.2\nName: demo\nVersion: 1.0\n")
+    assert static_metadata(sdist) is None
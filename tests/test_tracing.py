@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pyproject_api import ChromeTraceTracer, JsonLinesTracer, Tracer
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_tracer_ignores_spans() -> None:
+    with Tracer() as tracer, tracer.span("op", a=1) as attributes:
+        attributes["b"] = 2
+    assert attributes == {"a": 1, "b": 2}
+
+
+def test_json_lines_tracer(tmp_path: Path) -> None:
+    path = tmp_path / "trace" / "spans.jsonl"
+    with JsonLinesTracer(path) as tracer:
+        with tracer.span("outer", a=1) as attributes:
+            attributes["b"] = 2
+            with tracer.span("inner"):
+                pass
+        msg = "bad"
+        with pytest.raises(ValueError, match=msg), tracer.span("failing"):
+            raise ValueError(msg)
+    with tracer.span("closed"):  # the tracer closed, the span is lost
+        pass
+
+    inner, outer, failing = (json.loads(line) for line in path.read_text(encoding="utf-8").splitlines())
+    assert (outer["name"], outer["parent_id"], outer["attributes"]) == (
+        "outer",
+        None,
+        {"a": 1, "b": 2, "outcome": "ok"},
+    )
+    assert (inner["name"], inner["parent_id"]) == ("inner", outer["span_id"])
+    assert outer["start"] <= inner["start"]
+    assert inner["duration"] <= outer["duration"]
+    assert inner["thread_id"] == threading.get_native_id()
+    assert (failing["parent_id"], failing["attributes"]) == (None, {"outcome": "ValueError"})
+
+
+def test_json_lines_tracer_appends(tmp_path: Path) -> None:
+    path = tmp_path / "spans.jsonl"
+    for name in ("first", "second"):
+        with JsonLinesTracer(path) as tracer, tracer.span(name):
+            pass
+    assert [json.loads(line)["name"] for line in path.read_text(encoding="utf-8").splitlines()] == ["first", "second"]
+
+
+def test_chrome_trace_tracer(tmp_path: Path) -> None:
+    path = tmp_path / "trace.json"
+    tracer = ChromeTraceTracer(path)
+    with tracer.span("outer", path=tmp_path), tracer.span("inner"):
+        pass
+    content = path.read_text(encoding="utf-8")
+    assert json.loads(f"{content}]")  # viewers load it while the tracer is open
+    tracer.close()
+    tracer.close()
+
+    inner, outer = json.loads(path.read_text(encoding="utf-8"))
+    assert (outer["name"], outer["ph"], outer["cat"]) == ("outer", "X", "pyproject-api")
+    assert outer["args"] == {"path": str(tmp_path), "outcome": "ok"}
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert inner["tid"] == outer["tid"]
+
+
+def test_chrome_trace_tracer_empty(tmp_path: Path) -> None:
+    with ChromeTraceTracer(tmp_path / "trace.json"):
+        pass
+    assert json.loads((tmp_path / "trace.json").read_text(encoding="utf-8")) == []
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from zipfile import ZIP_BZIP2, ZIP_DEFLATED, ZIP_STORED, BadZipFile, ZipFile
+
+import pytest
+
+from pyproject_api._wheel import extract_dist_info
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest_mock
+
+
+def _wheel(path: Path, compression: int = ZIP_DEFLATED, members: dict[str, str] | None = None) -> Path:
+    with ZipFile(path, "w", compression) as zip_file:
+        zip_file.writestr("demo/__init__.py", "")
+        zip_file.writestr("demo-1.0.data/data/share.txt", "x")
+        zip_file.writestr("demo-1.0.dist-info/licenses/", "")
+        zip_file.writestr("demo-1.0.dist-info/licenses/LICENSE", "MIT")
+        for name, content in (members or {"demo-1.0.dist-info/METADATA": "Name: demo\nSummary: é"}).items():
+            zip_file.writestr(name, content)
+    return path
+
+
+@pytest.mark.parametrize("compression", [ZIP_DEFLATED, ZIP_STORED])
+def test_extract_dist_info(tmp_path: Path, mocker: pytest_mock.MockerFixture, compression: int) -> None:
+    zip_file = mocker.spy(ZipFile, "__init__")
+    wheel = _wheel(tmp_path / "demo-1.0-py3-none-any.whl", compression)
+    zip_file.reset_mock()
+
+    assert extract_dist_info(wheel, tmp_path / "out") == "demo-1.0.dist-info"
+    assert not zip_file.called
+    found = sorted(str(p.relative_to(tmp_path / "out").as_posix()) for p in (tmp_path / "out").rglob("*"))
+    assert found == [
+        "demo-1.0.dist-info",
+        "demo-1.0.dist-info/METADATA",
+        "demo-1.0.dist-info/licenses",
+        "demo-1.0.dist-info/licenses/LICENSE",
+    ]
+    assert (tmp_path / "out" / "demo-1.0.dist-info" / "METADATA").read_text(encoding="utf-8").endswith("é")
+
+
+def test_extract_dist_info_missing(tmp_path: Path) -> None:
+    wheel = tmp_path / "demo-1.0-py3-none-any.whl"
+    with ZipFile(wheel, "w") as zip_file:
+        zip_file.writestr("demo/__init__.py", "")
+    assert extract_dist_info(wheel, tmp_path / "out") is None
+
+
+@pytest.mark.parametrize(
+    ("compression", "members", "prefix"),
+    [
+        pytest.param(ZIP_BZIP2, None, b"", id="compression"),
+        pytest.param(ZIP_DEFLATED, None, b"#!/bin/sh\n", id="prefixed"),
+        pytest.param(ZIP_DEFLATED, {"demo-1.0.dist-info/../../evil": "x"}, b"", id="outside"),
+        pytest.param(ZIP_DEFLATED, None, None, id="zip64"),
+    ],
+)
+def test_extract_dist_info_falls_back_to_zipfile(
+    tmp_path: Path,
+    mocker: pytest_mock.MockerFixture,
+    compression: int,
+    members: dict[str, str] | None,
+    prefix: bytes | None,
+) -> None:
+    wheel = _wheel(tmp_path / "demo-1.0-py3-none-any.whl", compression, members)
+    content = wheel.read_bytes()
+    if prefix is None:  # mark the entry count as stored in the zip64 end of central directory record
+        end = content.rfind(b"PK\x05\x06")
+        content = content[: end + 8] + b"\xff" * 4 + content[end + 12 :]
+    wheel.write_bytes((prefix or b"") + content)
+    zip_file = mocker.spy(ZipFile, "__init__")
+
+    assert extract_dist_info(wheel, tmp_path / "out" / "in") == "demo-1.0.dist-info"
+    assert zip_file.called
+    assert (tmp_path / "out" / "in" / "demo-1.0.dist-info" / "licenses" / "LICENSE").read_text() == "MIT"
+    assert not (tmp_path / "evil").exists()
+
+
+@pytest.mark.parametrize("content", [b"", b"not a zip", b"PK\x05\x06"])
+def test_extract_dist_info_not_a_zip(tmp_path: Path, content: bytes) -> None:
+    wheel = tmp_path / "demo-1.0-py3-none-any.whl"
+    wheel.write_bytes(content)
+    with pytest.raises(BadZipFile):
+        extract_dist_info(wheel, tmp_path / "out")
+
+
+def test_extract_dist_info_bad_crc(tmp_path: Path) -> None:
+    wheel = _wheel(tmp_path / "demo-1.0-py3-none-any.whl", ZIP_STORED, {"demo-1.0.dist-info/METADATA": "Name: demo"})
+    wheel.write_bytes(wheel.read_bytes().replace(b"Name: demo", b"Name: oops"))
+    with pytest.raises(BadZipFile, match=r"Bad CRC-32 for file 'demo-1.0.dist-info/METADATA'"):
+        extract_dist_info(wheel, tmp_path / "out")